@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+from typing import Any, Dict, List, Optional
+import asyncio
+import re
+from app.core.profiling import collapsed_text, get_profile_store, get_stack_sampler, token_matches
+from app.core.config import settings
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None, description="Token de perfilado (PROFILING_TOKEN)")):
+    """Rechaza la solicitud si la cabecera no coincide con PROFILING_TOKEN (o no hay token configurado)."""
+    if not token_matches(x_profile_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Token de perfilado no válido")
+
+# Caracteres permitidos en el nombre del fichero descargado; el id puede venir de la cabecera X-Request-ID del cliente
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_-]")
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_profiling_token)])
+
+@router.get(
+    "/profile/sample",
+    response_class=PlainTextResponse,
+    summary="Muestrear el proceso",
+    description="Muestrea las pilas de todos los hilos durante 'seconds' segundos y las devuelve colapsadas, listas para flamegraph.pl o speedscope"
+)
+async def sample_process(
+    seconds: float = Query(5.0, gt=0, description="Duración del muestreo en segundos (como máximo PROFILING_MAX_SAMPLE_SECONDS)"),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Milisegundos entre muestras")
+):
+    """
+    Devuelve una línea por pila distinta con el formato "hilo;marco;marco... muestras".
+    
+    El muestreo corre en un hilo aparte, así que el event loop sigue
+    atendiendo solicitudes (y aparece en las pilas) mientras dura.
+    """
+    sampler = get_stack_sampler()
+    if sampler.busy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ya hay un muestreo en curso")
+    seconds = min(seconds, settings.PROFILING_MAX_SAMPLE_SECONDS)
+    try:
+        stacks = await asyncio.to_thread(sampler.sample, seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return collapsed_text(stacks)
+
+@router.get(
+    "/profiles",
+    summary="Listar perfiles de solicitudes",
+    description="Últimos perfiles guardados de solicitudes enviadas con la cabecera X-Profile"
+)
+async def list_profiles() -> List[Dict[str, Any]]:
+    return get_profile_store().list()
+
+@router.get(
+    "/profiles/{request_id}",
+    summary="Obtener el perfil de una solicitud",
+    description="Resumen de cProfile ordenado por tiempo acumulado, o el fichero pstats con format=pstats"
+)
+async def get_profile(
+    request_id: str,
+    format: str = Query("text", pattern="^(text|pstats)$", description="text (resumen) o pstats (para snakeviz o pstats.Stats)")
+):
+    record = get_profile_store().get(request_id)
+    if record is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Perfil no encontrado")
+    if format == "pstats":
+        filename = _UNSAFE_FILENAME.sub("_", request_id) or "profile"
+        return Response(
+            record.stats,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.prof"'}
+        )
+    return PlainTextResponse(record.summary)
@@ -0,0 +1,192 @@
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Pasa el texto a minúsculas y elimina los acentos ("Configuración" -> "configuracion")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class KeywordMatcher:
+    """
+    Autómata de Aho-Corasick para buscar muchas palabras clave en una sola pasada.
+
+    Se construye una vez con todas las palabras clave y cada búsqueda recorre
+    el texto carácter a carácter sin retroceder, sin importar cuántas palabras
+    clave haya. Con whole_words=True solo cuentan las coincidencias que no
+    forman parte de una palabra más larga.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str, float]], whole_words: bool = True):
+        """
+        Args:
+            keywords: Tuplas (palabra clave, etiqueta, peso)
+            whole_words: Exigir límites de palabra a ambos lados
+        """
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str, float]]] = [[]]
+
+        for keyword, label, weight in keywords:
+            keyword = normalize_text(keyword)
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((keyword, label, weight))
+
+        # Enlaces de fallo en anchura: el sufijo más largo que también es prefijo de alguna palabra
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[str, str, float]]:
+        """
+        Devuelve las coincidencias (palabra clave, etiqueta, peso) encontradas en el texto.
+
+        Args:
+            text: Texto ya normalizado con normalize_text
+        """
+        matches = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        length = len(text)
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            for match in output[state]:
+                if self.whole_words:
+                    start = index - len(match[0]) + 1
+                    if start > 0 and text[start - 1].isalnum():
+                        continue
+                    if index + 1 < length and text[index + 1].isalnum():
+                        continue
+                matches.append(match)
+        return matches
+
+    def labels(self, text: str) -> Set[str]:
+        """Etiquetas con al menos una coincidencia en el texto (sin normalizar)."""
+        return {label for _, label, _ in self.find(normalize_text(text))}
+
+
+class Classification(NamedTuple):
+    """Resultado de clasificar un prompt."""
+    category: str            # Plantilla más probable ("" si no hay ninguna)
+    confidence: float        # 0.0 - 1.0
+    scores: Dict[str, float]  # Puntuación de cada categoría con alguna coincidencia
+
+
+# Palabras clave de cada plantilla y su peso como indicio de esa plantilla
+CATEGORY_KEYWORDS: Dict[str, List[Tuple[str, float]]] = {
+    "dashboard": [
+        ("dashboard", 1.0), ("dashboards", 1.0), ("panel de control", 0.9), ("admin panel", 0.8),
+        ("control panel", 0.6), ("analytics", 0.5), ("kpi", 0.5), ("kpis", 0.5), ("metrics", 0.4),
+        ("metricas", 0.4), ("stats", 0.3), ("estadisticas", 0.3),
+    ],
+    "footer": [
+        ("footer", 1.0), ("pie de pagina", 1.0), ("copyright", 0.5), ("social links", 0.4),
+        ("social media", 0.4), ("redes sociales", 0.4),
+    ],
+    "profile": [
+        ("user profile", 1.0), ("profile", 0.9), ("perfil", 0.9), ("perfil de usuario", 1.0),
+        ("avatar", 0.5), ("bio", 0.5), ("biografia", 0.5),
+    ],
+    "settings": [
+        ("settings", 0.9), ("account settings", 1.0), ("configuracion", 0.9), ("ajustes", 0.9),
+        ("preferences", 0.7), ("preferencias", 0.7), ("notifications", 0.3), ("notification", 0.3),
+        ("notificaciones", 0.3), ("privacy", 0.3), ("privacidad", 0.3),
+    ],
+    "checkout": [
+        ("checkout", 1.0), ("check out", 0.8), ("order summary", 0.6), ("resumen del pedido", 0.6),
+        ("payment", 0.5), ("payments", 0.5), ("pago", 0.5), ("shipping", 0.4), ("envio", 0.4),
+        ("cart", 0.3), ("carrito", 0.3),
+    ],
+}
+
+# Cuánto resta de la confianza la puntuación de la segunda categoría más probable
+AMBIGUITY_PENALTY = 0.5
+
+_category_matcher = KeywordMatcher(
+    (keyword, category, weight)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+    for keyword, weight in keywords
+)
+
+
+def classify_prompt(prompt: str) -> Classification:
+    """
+    Clasifica un prompt en una de las plantillas conocidas.
+
+    La puntuación de cada categoría es la suma de los pesos de sus palabras
+    clave distintas (máximo 1.0). La confianza es la puntuación de la mejor
+    categoría menos una penalización si otra categoría también coincide.
+
+    Args:
+        prompt: Descripción del componente escrita por el usuario
+
+    Returns:
+        Classification: Categoría, confianza y puntuaciones
+    """
+    seen: Set[str] = set()
+    scores: Dict[str, float] = {}
+    for keyword, category, weight in _category_matcher.find(normalize_text(prompt)):
+        if keyword in seen:
+            continue
+        seen.add(keyword)
+        scores[category] = min(1.0, scores.get(category, 0.0) + weight)
+
+    if not scores:
+        return Classification("", 0.0, {})
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    category, best = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+    confidence = max(0.0, best - AMBIGUITY_PENALTY * runner_up)
+    return Classification(category, round(confidence, 3), scores)
+
+
+def confident_category(prompt: str, threshold: float) -> str:
+    """
+    Categoría del prompt si su confianza alcanza el umbral, o "" si no hay
+    ninguna. Evita que una sola palabra clave de poco peso ("stats",
+    "social media") sustituya la respuesta del modelo por una plantilla.
+    """
+    classification = classify_prompt(prompt)
+    if classification.confidence < threshold:
+        return ""
+    return classification.category
+
+
+# Rasgos visuales pedidos en el prompt (coincidencia por subcadena)
+_feature_matcher = KeywordMatcher(
+    [(keyword, "vertical", 1.0) for keyword in ("vertical", "column", "left", "side", "sidebar")]
+    + [(keyword, "dark", 1.0) for keyword in ("dark", "black", "night")]
+    + [("shadcn", "shadcn", 1.0)],
+    whole_words=False,
+)
+
+
+def prompt_features(prompt: str) -> Set[str]:
+    """Devuelve los rasgos pedidos en el prompt: "vertical", "dark" y/o "shadcn"."""
+    return _feature_matcher.labels(prompt)
@@ -0,0 +1,787 @@
+import re
+from typing import List, NamedTuple, Optional
+
+INDENT = "  "
+
+# Longitud máxima (en el código original) de un bloque que se mantiene en una sola línea
+INLINE_MAX_LENGTH = 80
+
+_WS = re.compile(r"\s+")
+# Strings entre comillas simples o dobles (sin saltos de línea; la comilla de cierre es opcional)
+_QUOTED_STRING = r"""'[^'\\\n]*(?:\\.[^'\\\n]*)*'?|"[^"\\\n]*(?:\\.[^"\\\n]*)*"?"""
+# Palabras, operadores, comas y strings: no afectan a la disposición del código salvo las
+# comas de los bloques multilínea, que se tratan al escribir (ver _emit_items)
+_CODE_ATOM = r"""[^\s{}()\[\];'"`/<]+|""" + _QUOTED_STRING
+# Un token de código JS precedido de su espacio en blanco. Las palabras, operadores y
+# strings contiguos forman un único token "code", así que el bucle de tokenize solo
+# recorre los tokens que deciden la disposición (llaves, ';', JSX, comentarios)
+_JS_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<punct>[{}()\[\];])"
+    r"|(?P<code>(?:" + _CODE_ATOM + r")(?:\s*(?:" + _CODE_ATOM + r"))*)"
+    r"|(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|$))"
+    r"|(?P<template>`)"
+    r"|(?P<op>[/<])"
+    r")"
+)
+# Tokens individuales de un token "code", para conocer el último cuando hace falta
+_CODE_PART = re.compile(
+    r"""
+    \s*(?:
+    (?P<string>""" + _QUOTED_STRING + r""")
+    |(?P<word>[A-Za-z_$][\w$]*|\d[\w.]*)
+    |(?P<op>=>|\.\.\.|===|!==|\*\*=|==|!=|>=|&&|\|\||\?\?|\?\.|\+\+|--|[-+*%&|^]=|[-+*%=>!?:.&|^~@\#\\])
+    |(?P<other>\S)
+    )
+    """,
+    re.X,
+)
+_CODE_STRING = re.compile("(" + _QUOTED_STRING + ")")
+# Un elemento de un token "code" hasta la siguiente coma que no está dentro de un string
+_CODE_ITEM = re.compile(r"""((?:[^,'"]+|""" + _QUOTED_STRING + r""")*)(,?)""")
+_REGEX_LITERAL = re.compile(r"/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+_TAG_NAME = re.compile(r"[A-Za-z0-9_.:\-]*")
+_STRING = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`)""")
+
+# Tokens después de los cuales '<' abre un elemento JSX y no es una comparación
+_JSX_PRECEDERS = {
+    None, "(", ",", "=", ":", "?", "[", "{", "}", ";", "=>", "&&", "||", "??",
+    "return", "!", "default", "yield", "else",
+}
+# Tokens después de los cuales '/' es una división y no abre una expresión regular
+# ('</' fuera de JSX es un tag de cierre mal colocado, no una expresión regular)
+_DIVISION_PRECEDERS = {")", "]", "}", "<", "string", "regex", "++", "--"}
+# Palabras después de las cuales '/' sí abre una expresión regular
+_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+    "case", "do", "else", "yield", "await",
+}
+_PUNCT = "{}()[];"
+# Tokens que se pegan a la línea anterior en lugar de empezar una nueva
+_ATTACH = {";", ",", ")", "]", "."}
+_ATTACH_KEYWORD = re.compile(r"(?:else|catch|finally|while)(?![\w$])")
+
+
+class Token(NamedTuple):
+    # code, punct, block, op, string, regex, comment, jsx_open, jsx_close, jsx_text, expr_open, expr_close
+    # y jsx_self (tag autocerrado o elemento corto completo, ver _INLINE_ELEMENT)
+    kind: str
+    text: str
+    start: int   # posición en el código original
+    end: int
+    space: bool  # había espacio en blanco antes del token
+    enters_jsx: bool = False  # primer tag de un elemento JSX incrustado en código JS
+    exits_jsx: bool = False   # tag que cierra ese elemento y devuelve el contexto a JS
+
+
+# Saltos sobre los caracteres que no necesitan inspección, para no recorrer el código carácter a carácter
+_QUOTED = {
+    "'": re.compile(r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'?"),
+    '"': re.compile(r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"?'),
+}
+_TEMPLATE_BODY = re.compile(r"[^`\\$]*")
+_BRACES_BODY = re.compile(r"[^'\"`{}/]*")
+_TAG_BODY = re.compile(r"[^'\"`{>]*")
+# Tag completo en una sola búsqueda para el caso habitual: strings cerrados y expresiones {...}
+# con hasta dos niveles de llaves, sin template literals ni '/'. Si no encaja, se recorre el tag
+_CLOSED_STRING = r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'" + r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_INNER_BRACES = r"""\{[^{}'"`/]*(?:(?:""" + _CLOSED_STRING + r""")[^{}'"`/]*)*\}"""
+_SIMPLE_BRACES = r"""\{[^{}'"`/]*(?:(?:""" + _CLOSED_STRING + "|" + _INNER_BRACES + r""")[^{}'"`/]*)*\}"""
+_TAG_INNER = r"""[^'"`{>]*(?:(?:""" + _CLOSED_STRING + "|" + _SIMPLE_BRACES + r""")[^'"`{>]*)*"""
+_SIMPLE_TAG = re.compile("<" + _TAG_INNER + ">")
+# Elemento JSX corto cuyos hijos son solo texto (sin ';') y expresiones simples ({a.b}, {f(x)}):
+# siempre se escribe en una línea, como un tag autocerrado. Se busca con endpos (ver _inline_element)
+_EXPR_CHAR = r"""[^{}()\[\]<>;/`'"]"""
+_SIMPLE_EXPR = r"\{(?:" + _EXPR_CHAR + r"|\(" + _EXPR_CHAR + r"*\)|\[" + _EXPR_CHAR + r"*\])*\}"
+_INLINE_ELEMENT = re.compile(
+    "(<(?!/)" + _TAG_INNER + r"(?<!/)>)((?:[^<{};]|" + _SIMPLE_EXPR + ")*)(</" + _TAG_INNER + ">)"
+)
+# Hijo de un elemento JSX: un tag (completo si encaja en _SIMPLE_TAG), una expresión o texto
+_JSX_CHILD = re.compile(
+    r"\s*(?:(?P<tag>" + _SIMPLE_TAG.pattern + r")|(?P<tag_start><)|(?P<expr>\{)|(?P<text>[^<{]+))"
+)
+
+# Bloque { } o [ ] que siempre se escribe en una línea tal cual (con el espacio en blanco
+# reducido): sin ';', comentarios, template literals, expresiones regulares ni JSX, con los
+# paréntesis equilibrados y hasta tres niveles de anidamiento. Se busca con endpos para no
+# mirar más allá de INLINE_MAX_LENGTH caracteres
+_BLOCK_BODY = r"""[^{}\[\]();/`<'"]*"""
+
+
+def _block_pattern(inner: str) -> str:
+    items = _CLOSED_STRING + (("|" + inner) if inner else "")
+    return "|".join(
+        "\\" + opener + _BLOCK_BODY + "(?:(?:" + items + ")" + _BLOCK_BODY + ")*\\" + closer
+        for opener, closer in (("{", "}"), ("[", "]"), ("(", ")"))
+    )
+
+
+_INLINE_BLOCK = re.compile(_block_pattern(_block_pattern(_block_pattern(""))))
+# Bloque sin bloques anidados: si no cabe en una línea se escribe siempre igual, un
+# elemento por línea, así que se trata como un único token "block"
+_FLAT_BLOCK = re.compile(_block_pattern(""))
+
+
+def _regex_allowed(previous: Optional[str]) -> bool:
+    """Indica si un '/' después del token previous abre una expresión regular."""
+    if previous is None:
+        return True
+    if previous in _DIVISION_PRECEDERS:
+        return False
+    if previous[0].isalnum() or previous[0] in "_$":
+        return previous in _REGEX_KEYWORDS
+    return True
+
+
+def _last_code_token(text: str) -> str:
+    """Último token de un token "code", como lo necesitan las decisiones sobre '<' y '/'."""
+    last = None
+    for last in _CODE_PART.finditer(text):
+        pass
+    kind = last.lastgroup
+    return "string" if kind == "string" else last.group(kind)
+
+
+def _token_before(code: str, pos: int) -> Optional[str]:
+    """Token anterior a pos, aproximado a partir del último carácter significativo."""
+    i = pos - 1
+    while i >= 0 and code[i].isspace():
+        i -= 1
+    if i < 0:
+        return None
+    char = code[i]
+    if char in "'\"`":
+        return "string"
+    if not (char.isalnum() or char in "_$"):
+        return char
+    start = i
+    while start > 0 and (code[start - 1].isalnum() or code[start - 1] in "_$"):
+        start -= 1
+    return code[start:i + 1]
+
+
+def _skip_slash(code: str, pos: int) -> int:
+    """Devuelve la posición siguiente al comentario, expresión regular o división que empieza en pos."""
+    if code.startswith("//", pos):
+        end = code.find("\n", pos)
+        return len(code) if end == -1 else end
+    if code.startswith("/*", pos):
+        end = code.find("*/", pos + 2)
+        return len(code) if end == -1 else end + 2
+    if _regex_allowed(_token_before(code, pos)):
+        match = _REGEX_LITERAL.match(code, pos)
+        if match:
+            return match.end()
+    return pos + 1
+
+
+def _skip_string(code: str, pos: int) -> int:
+    """Devuelve la posición siguiente al string (o template literal) que empieza en pos."""
+    quote = code[pos]
+    if quote != "`":
+        return _QUOTED[quote].match(code, pos).end()
+    i = pos + 1
+    length = len(code)
+    while i < length:
+        i = _TEMPLATE_BODY.match(code, i).end()
+        if i >= length:
+            break
+        char = code[i]
+        if char == "`":
+            return i + 1
+        if char == "\\":
+            i += 2
+        elif code.startswith("${", i):
+            i = _skip_braces(code, i + 1)
+        else:
+            i += 1
+    return length
+
+
+def _skip_braces(code: str, pos: int) -> int:
+    """Devuelve la posición siguiente a la llave que cierra la que empieza en pos."""
+    depth = 0
+    i = pos
+    length = len(code)
+    while i < length:
+        i = _BRACES_BODY.match(code, i).end()
+        if i >= length:
+            break
+        char = code[i]
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif char == "/":
+            i = _skip_slash(code, i)
+            continue
+        else:
+            i = _skip_string(code, i)
+            continue
+        i += 1
+    return length
+
+
+def _scan_tag(code: str, pos: int) -> int:
+    """Devuelve la posición siguiente al '>' que cierra el tag JSX que empieza en pos."""
+    match = _SIMPLE_TAG.match(code, pos)
+    if match:
+        return match.end()
+    i = _TAG_NAME.match(code, pos + 1 + (code.startswith("</", pos))).end()
+    length = len(code)
+    while i < length:
+        i = _TAG_BODY.match(code, i).end()
+        if i >= length:
+            break
+        char = code[i]
+        if char == ">":
+            return i + 1
+        if char == "{":
+            i = _skip_braces(code, i)
+        else:
+            i = _skip_string(code, i)
+    return length
+
+
+def _inline_element(code: str, pos: int) -> Optional["re.Match"]:
+    """Busca en pos un elemento de _INLINE_ELEMENT que quepa en INLINE_MAX_LENGTH caracteres."""
+    return _INLINE_ELEMENT.match(code, pos, pos + INLINE_MAX_LENGTH)
+
+
+def _inline_element_text(element: "re.Match") -> str:
+    """Texto del elemento tal y como quedaría escribiendo sus tokens en una línea."""
+    opening, children, closing = element.groups()
+    return _normalize_tag(opening) + _WS.sub(" ", children) + _normalize_tag(closing)
+
+
+def _collapse(strings: "re.Pattern", text: str) -> str:
+    """Reduce el espacio en blanco fuera de los strings (los grupos de `strings`) a un único espacio."""
+    parts = strings.split(text)
+    parts[::2] = [_WS.sub(" ", part) for part in parts[::2]]
+    return "".join(parts)
+
+
+def _collapse_ws(text: str) -> str:
+    """Reduce el espacio en blanco a un único espacio sin tocar el interior de los strings."""
+    return _collapse(_STRING, text).strip()
+
+
+_NEEDS_COLLAPSE = re.compile(r"\s\s|[\t\n\r]")
+
+
+def _needs_collapse(text: str) -> bool:
+    """Indica si _NEEDS_COLLAPSE encuentra algo en el texto."""
+    # En un texto imprimible el único espacio en blanco posible es ' ': basta buscar dos
+    # seguidos, mucho más rápido que la expresión regular carácter a carácter
+    if text.isprintable():
+        return "  " in text
+    return _NEEDS_COLLAPSE.search(text) is not None
+
+
+def _normalize_tag(text: str) -> str:
+    tag = _collapse_ws(text) if _needs_collapse(text) else text
+    if tag[-2:-1].isspace() or tag[-3:-2].isspace():
+        # Sin espacio en blanco antes de '>' o '/>'
+        end = "/>" if tag.endswith("/>") else ">"
+        body = tag[:-len(end)]
+        if body[-1:].isspace():
+            tag = body.rstrip() + end
+    if tag.endswith("/>") and not tag.endswith(" />") and len(tag) > 3:
+        tag = tag[:-2] + " />"
+    return tag
+
+
+def _split_code_items(code: str, pos: int, end: int, space: bool, tokens: List[Token]) -> None:
+    """
+    Añade a tokens los elementos y comas de un token "code" que necesita reducir su
+    espacio en blanco, como tokens separados.
+    """
+    for match in _CODE_ITEM.finditer(code, pos, end):
+        item_start, item_end = match.span(1)
+        raw = code[item_start:item_end]
+        stripped = raw.lstrip()
+        if stripped:
+            item_start += len(raw) - len(stripped)
+            stripped = stripped.rstrip()
+            tokens.append(Token("code", _collapse(_CODE_STRING, stripped), item_start, item_start + len(stripped),
+                                item_start > pos and code[item_start - 1].isspace() or item_start == pos and space))
+        if match.group(2):
+            comma = match.start(2)
+            tokens.append(Token("punct", ",", comma, comma + 1, code[comma - 1].isspace()))
+
+
+def tokenize(code: str) -> List[Token]:
+    """
+    Divide código JS/JSX en tokens en una sola pasada.
+
+    Distingue el contexto JS del contexto de hijos JSX con una pila de modos,
+    de modo que el texto de los elementos, los tags y las expresiones {...}
+    se reconocen sin expresiones regulares sobre el código completo.
+    """
+    tokens: List[Token] = []
+    append = tokens.append
+    # Los Token se crean con tuple.__new__: el __new__ de NamedTuple es varias veces más lento
+    new = tuple.__new__
+    # Cada marco es [modo, profundidad]: llaves abiertas en "js", tags abiertos en "jsx"
+    modes = [["js", 0]]
+    prev_text: Optional[str] = None
+    # prev_text es un token "code" completo (ver _last_code_token)
+    prev_code = False
+    pos = 0
+    length = len(code)
+
+    while pos < length:
+        mode = modes[-1]
+
+        if mode[0] == "jsx":
+            match = _JSX_CHILD.match(code, pos)
+            if match is None:
+                break
+            kind = match.lastgroup
+            pos = match.start(kind)
+            space = pos > 0 and code[pos - 1].isspace()
+            if kind == "tag" or kind == "tag_start":
+                end = match.end() if kind == "tag" else _scan_tag(code, pos)
+                raw = code[pos:end]
+                element = raw[1:2] != "/" and raw[-2:-1] != "/" and _inline_element(code, pos)
+                if element:
+                    # Elemento corto completo: un único token, igual que un tag autocerrado
+                    end = element.end()
+                    append(new(Token, ("jsx_self", _inline_element_text(element), pos, end, space, False, False)))
+                elif raw.startswith("</"):
+                    mode[1] -= 1
+                    exits = mode[1] <= 0
+                    if exits:
+                        modes.pop()
+                    append(new(Token, ("jsx_close", _normalize_tag(raw), pos, end, space,
+                                       False, exits and modes[-1][0] != "jsx")))
+                elif raw.endswith("/>"):
+                    append(new(Token, ("jsx_self", _normalize_tag(raw), pos, end, space, False, False)))
+                else:
+                    mode[1] += 1
+                    append(new(Token, ("jsx_open", _normalize_tag(raw), pos, end, space, False, False)))
+                prev_text = ">"
+                prev_code = False
+                pos = end
+            elif kind == "expr":
+                modes.append(["expr", 0])
+                append(new(Token, ("expr_open", "{", pos, pos + 1, space, False, False)))
+                prev_text = "{"
+                prev_code = False
+                pos += 1
+            else:
+                end = match.end()
+                text = _WS.sub(" ", code[pos:end]).rstrip()
+                if text:
+                    append(new(Token, ("jsx_text", text, pos, end, space, False, False)))
+                pos = end
+            continue
+
+        # Contexto JS (código normal o expresión {...} dentro de JSX)
+        text = code[pos]
+        if text in _PUNCT:
+            # Puntuación pegada al token anterior, el caso más frecuente: sin expresión regular
+            kind = "punct"
+            end = pos + 1
+        else:
+            match = _JS_TOKEN.match(code, pos)
+            if match is None:
+                # Solo queda espacio en blanco
+                break
+            kind = match.lastgroup
+            pos = match.start(kind)
+            end = match.end()
+            text = code[pos] if kind == "punct" else None
+        space = pos > 0 and code[pos - 1].isspace()
+
+        if kind == "punct" and text in "{[":
+            closer = "}" if text == "{" else "]"
+            # Sin el cierre a la vista el bloque no cabe en una línea: se evita la expresión regular
+            block = code.find(closer, end, pos + INLINE_MAX_LENGTH) > 0 and \
+                _INLINE_BLOCK.match(code, pos, pos + INLINE_MAX_LENGTH)
+            if block:
+                # Bloque corto: un único token con el mismo texto que tendría en una línea
+                kind = "code"
+                end = block.end()
+            else:
+                block = _FLAT_BLOCK.match(code, pos)
+                if block and not code[end:block.end() - 1].isspace():
+                    end = block.end()
+                    inner = code[pos + 1:end - 1].strip()
+                    if _needs_collapse(inner):
+                        inner = _collapse(_CODE_STRING, inner)
+                    append(new(Token, ("block", text + inner + closer, pos, end, space, False, False)))
+                    prev_text = closer
+                    prev_code = False
+                    pos = end
+                    continue
+
+        if kind == "code":
+            # El último token del bloque solo se calcula si lo necesita un '<' o '/' posterior, y
+            # sobre el texto original: al reducir el espacio, un string sin cerrar seguido de un
+            # salto de línea se extendería hasta el final
+            prev_text = text = code[pos:end]
+            prev_code = True
+            if _needs_collapse(text):
+                if "," in text and text[0] not in "{[":
+                    # Por lo mismo, las comas se separan aquí y no en _emit_items
+                    _split_code_items(code, pos, end, space, tokens)
+                    pos = end
+                    continue
+                text = _collapse(_CODE_STRING, text)
+            append(new(Token, ("code", text, pos, end, space, False, False)))
+            pos = end
+            continue
+
+        if kind == "op":
+            previous = _last_code_token(prev_text) if prev_code else prev_text
+            if code[pos] == "<":
+                if previous in _JSX_PRECEDERS and end < length and (code[end].isalpha() or code[end] == ">"):
+                    end = _scan_tag(code, pos)
+                    raw = code[pos:end]
+                    element = not raw.endswith("/>") and _inline_element(code, pos)
+                    if element:
+                        end = element.end()
+                        append(new(Token, ("jsx_self", _inline_element_text(element), pos, end, space, True, True)))
+                    elif raw.endswith("/>"):
+                        append(new(Token, ("jsx_self", _normalize_tag(raw), pos, end, space, True, True)))
+                    else:
+                        modes.append(["jsx", 1])
+                        append(new(Token, ("jsx_open", _normalize_tag(raw), pos, end, space, True, False)))
+                    prev_text = ">"
+                    prev_code = False
+                    pos = end
+                    continue
+            elif _regex_allowed(previous):
+                regex = _REGEX_LITERAL.match(code, pos)
+                if regex:
+                    end = regex.end()
+                    kind = "regex"
+        elif kind == "template":
+            end = _skip_string(code, pos)
+            kind = "string"
+        if text is None or kind != "punct":
+            text = code[pos:end]
+
+        if text == "{":
+            mode[1] += 1
+        elif text == "}":
+            if mode[0] == "expr" and mode[1] == 0:
+                modes.pop()
+                append(new(Token, ("expr_close", "}", pos, end, space, False, False)))
+                prev_text = "}"
+                prev_code = False
+                pos = end
+                continue
+            mode[1] -= 1
+
+        if kind == "string" or kind == "regex":
+            prev_text = kind
+            prev_code = False
+        elif kind != "comment":
+            prev_text = text
+            prev_code = False
+        append(new(Token, (kind, text, pos, end, space, False, False)))
+        pos = end
+
+    return tokens
+
+
+_JSX_KINDS = {"jsx_open", "jsx_close", "jsx_self", "jsx_text", "expr_open", "expr_close"}
+
+
+class _Layout:
+    """Información precalculada sobre qué bloques pueden quedarse en una línea."""
+
+    def __init__(self, tokens: List[Token]):
+        count = len(tokens)
+        self.match = match = [-1] * count
+        self.inline = inline = [False] * count
+        self.jsx_paren = [False] * count
+        # Índice del token que abre el bloque más interno que contiene a cada token
+        self.enclosing = enclosing = [-1] * count
+        complex_flags: List[bool] = []
+        stack: List[int] = []
+
+        for index, (kind, text, _, end, _, enters_jsx, _) in enumerate(tokens):
+            if stack:
+                enclosing[index] = stack[-1]
+            if kind == "punct":
+                opens = text in "{(["
+                closes = text in "})]"
+            else:
+                opens = kind == "jsx_open" or kind == "expr_open"
+                closes = kind == "jsx_close" or kind == "expr_close"
+
+            if opens:
+                stack.append(index)
+                complex_flags.append(False)
+                if text == "(" and kind == "punct" and index + 1 < count and tokens[index + 1].enters_jsx:
+                    self.jsx_paren[index] = True
+                continue
+
+            if closes and stack:
+                opener = stack.pop()
+                is_complex = complex_flags.pop()
+                match[opener] = index
+                match[index] = opener
+                opening = tokens[opener]
+                inline[opener] = inline[index] = not is_complex and end - opening.start <= INLINE_MAX_LENGTH
+                # Un bloque que contiene otro bloque multilínea también es multilínea
+                if stack and (is_complex or opening.kind == "jsx_open" or (
+                    opening.text in "{[" and not inline[opener]
+                )):
+                    complex_flags[-1] = True
+                continue
+
+            if stack and (text == ";" or kind in ("block", "comment", "jsx_self") or enters_jsx):
+                complex_flags[-1] = True
+
+
+class _Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+        self.current: List[str] = []
+        self.level = 0
+        self.pending_break = False
+
+    def flush(self) -> None:
+        if self.current:
+            self.lines.append("".join(self.current).rstrip())
+            self.current = []
+        self.pending_break = False
+
+    def emit(self, text: str, space: bool = False) -> None:
+        if self.pending_break:
+            self.pending_break = False
+            if text in _ATTACH or text[0] == "," or text[0] == "." and not text.startswith("..."):
+                self.current.append(text)
+                return
+            if text[0] in "cefw" and _ATTACH_KEYWORD.match(text):
+                self.current.append(" " + text)
+                return
+            self.flush()
+        if not self.current:
+            self.current.append(INDENT * self.level + text)
+        else:
+            self.current.append((" " if space else "") + text)
+
+    def line(self, text: str) -> None:
+        """Escribe el texto en su propia línea."""
+        self.flush()
+        self.emit(text)
+        self.pending_break = True
+
+    def result(self) -> str:
+        self.flush()
+        return "\n".join(self.lines)
+
+
+def format_source(code: str) -> str:
+    """
+    Formatea código React/JSX en una sola pasada lineal sobre sus tokens.
+
+    Los bloques { } y [ ] multilínea y los elementos JSX con hijos se indentan
+    un nivel; los objetos, arrays y elementos cortos se mantienen en una línea.
+    El texto y las expresiones contiguas dentro de JSX se conservan en la misma
+    línea para no alterar los espacios que React renderiza. El interior de los
+    strings no se modifica.
+
+    Args:
+        code: Código fuente, posiblemente en una sola línea
+
+    Returns:
+        str: Código con saltos de línea e indentación consistentes
+    """
+    tokens = tokenize(code)
+    layout = _Layout(tokens)
+    writer = _Writer()
+    # Índice del token que cierra el bloque que se está escribiendo en una sola línea
+    inline_until = -1
+    inline_child = False
+    # Elementos JSX incrustados en JS a los que se añadieron paréntesis
+    wrapped: List[bool] = []
+    # El último hijo JSX escrito fue texto o una expresión corta
+    content_run = False
+
+    for index, (kind, text, _, _, space, enters_jsx, exits_jsx) in enumerate(tokens):
+
+        if index <= inline_until:
+            writer.emit(text, space)
+            if index == inline_until and inline_child:
+                # Hijo JSX completo en una línea: lo siguiente empieza en otra
+                writer.pending_break = True
+                content_run = kind == "expr_close"
+            continue
+
+        if kind in _JSX_KINDS:
+            if enters_jsx:
+                if kind == "jsx_self" or layout.inline[index]:
+                    # Elemento corto incrustado en JS: se queda en la misma línea
+                    writer.emit(text, space)
+                    if kind == "jsx_open":
+                        inline_until = layout.match[index]
+                        inline_child = False
+                    continue
+                needs_parens = bool(writer.current) and not writer.pending_break and not (
+                    index > 0 and layout.jsx_paren[index - 1]
+                )
+                if needs_parens:
+                    # Paréntesis para que un salto de línea tras 'return' no cambie la semántica
+                    writer.emit("(", True)
+                    writer.flush()
+                    writer.level += 1
+                wrapped.append(needs_parens)
+
+            if kind == "jsx_open":
+                content_run = False
+                if layout.inline[index]:
+                    writer.flush()
+                    writer.emit(text)
+                    inline_until = layout.match[index]
+                    inline_child = True
+                    continue
+                writer.line(text)
+                writer.level += 1
+            elif kind == "jsx_close":
+                content_run = False
+                writer.flush()
+                writer.level = max(0, writer.level - 1)
+                writer.line(text)
+                if exits_jsx and wrapped and wrapped.pop():
+                    writer.flush()
+                    writer.level = max(0, writer.level - 1)
+                    writer.emit(")")
+            elif kind == "jsx_self":
+                content_run = False
+                writer.line(text)
+            elif kind == "jsx_text":
+                if content_run:
+                    writer.pending_break = False
+                    writer.emit(text, space)
+                    writer.pending_break = True
+                else:
+                    writer.line(text)
+                content_run = True
+            elif kind == "expr_open":
+                if layout.inline[index]:
+                    if content_run:
+                        writer.pending_break = False
+                        writer.emit("{", space)
+                    else:
+                        writer.flush()
+                        writer.emit("{")
+                    inline_until = layout.match[index]
+                    inline_child = True
+                else:
+                    content_run = False
+                    writer.flush()
+                    writer.emit("{")
+            else:
+                writer.emit("}")
+                writer.pending_break = True
+            continue
+
+        if kind == "comment":
+            writer.emit(text, space)
+            if text.startswith("//"):
+                writer.flush()
+            continue
+
+        if kind == "block":
+            _emit_block(writer, text, space)
+            continue
+
+        if kind != "punct":
+            # Un token "code" que empieza por '{' o '[' es un bloque corto y se escribe tal cual
+            if kind == "code" and "," in text and text[0] not in "{[":
+                breaks = _inside(tokens, layout, index, "{") or _inside(tokens, layout, index, "[")
+                _emit_items(writer, text, space, breaks)
+            else:
+                writer.emit(text, space)
+            continue
+
+        if text in "{[":
+            writer.emit(text, space)
+            closing = layout.match[index]
+            if closing == index + 1 or layout.inline[index]:
+                inline_until = closing
+                inline_child = False
+                continue
+            writer.flush()
+            writer.level += 1
+        elif text in "}]" and layout.match[index] >= 0:
+            writer.flush()
+            writer.level = max(0, writer.level - 1)
+            writer.emit(text)
+            if text == "}":
+                writer.pending_break = True
+        elif text == "(" and layout.jsx_paren[index]:
+            writer.emit("(", space)
+            writer.flush()
+            writer.level += 1
+        elif text == ")" and layout.match[index] >= 0 and layout.jsx_paren[layout.match[index]]:
+            writer.flush()
+            writer.level = max(0, writer.level - 1)
+            writer.emit(")")
+        elif text == ";":
+            writer.emit(";")
+            if not _inside(tokens, layout, index, "("):
+                writer.pending_break = True
+        elif text == ",":
+            writer.emit(",")
+            if _inside(tokens, layout, index, "{") or _inside(tokens, layout, index, "["):
+                writer.pending_break = True
+        else:
+            writer.emit(text, space)
+
+    return writer.result()
+
+
+def _emit_items(writer: _Writer, text: str, space: bool, breaks: bool) -> None:
+    """
+    Escribe un token "code" elemento a elemento, con las comas pegadas al elemento
+    anterior. Con breaks (bloque multilínea) cada elemento va en su propia línea.
+    """
+    for item, comma in _CODE_ITEM.findall(text):
+        stripped = item.strip()
+        if stripped:
+            writer.emit(stripped + comma, space or item[0].isspace())
+        elif comma:
+            writer.emit(comma)
+        if comma and breaks:
+            writer.pending_break = True
+        space = False
+
+
+def _emit_block(writer: _Writer, text: str, space: bool) -> None:
+    """Escribe un token "block" que no cabe en una línea, con sus elementos indentados."""
+    writer.emit(text[0], space)
+    writer.flush()
+    # Las líneas se añaden directamente: equivale a _emit_items con el nivel aumentado
+    indent = INDENT * (writer.level + 1)
+    items = [item.strip() + comma for item, comma in _CODE_ITEM.findall(text, 1, len(text) - 1)]
+    if "," not in items:
+        writer.lines.extend([indent + item for item in items if item])
+    else:
+        # Hay elementos vacíos (",,"): su coma se pega a la línea anterior
+        line = None
+        for item in items:
+            if item == ",":
+                line = (indent if line is None else line) + ","
+            elif item:
+                if line is not None:
+                    writer.lines.append(line)
+                line = indent + item
+        if line is not None:
+            writer.lines.append(line)
+    writer.current.append(INDENT * writer.level + text[-1])
+    writer.pending_break = text[-1] == "}"
+
+
+def _inside(tokens: List[Token], layout: _Layout, index: int, bracket: str) -> bool:
+    """Indica si el bloque más interno que contiene al token se abre con el carácter dado."""
+    opener = layout.enclosing[index]
+    return opener >= 0 and tokens[opener].kind == "punct" and tokens[opener].text == bracket
@@ -0,0 +1,278 @@
+import json
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Avanza de una vez sobre el contenido de un string JSON que no necesita inspección
+_STRING_BODY = re.compile(r'[^"\\]*')
+_WHITESPACE = " \t\r\n"
+
+# Fases del análisis de los miembros de primer nivel del objeto
+_SEEK = 0          # Buscando la llave de apertura del objeto
+_KEY = 1           # Esperando la clave de un miembro (o el cierre del objeto)
+_COLON = 2         # Esperando ':' tras la clave
+_VALUE_START = 3   # Esperando el inicio del valor
+_VALUE = 4         # Dentro del valor (string, número, literal, objeto o array)
+_AFTER_VALUE = 5   # Valor completo; esperando ',' o '}'
+_DONE = 6          # Objeto completo
+
+
+class JSONEvent(NamedTuple):
+    """
+    Evento producido por el extractor.
+
+    kind es "field" cuando un miembro de primer nivel está completo
+    (key y value contienen la clave y el valor ya parseado) u "object"
+    cuando el objeto entero está completo (value contiene el diccionario).
+    """
+    kind: str
+    key: Optional[str]
+    value: Any
+
+
+class IncrementalJSONExtractor:
+    """
+    Extrae el primer objeto JSON de primer nivel de un texto que llega por partes.
+
+    Ignora el texto que rodea al objeto (explicaciones del modelo, bloques
+    markdown ```json ... ```), respeta las llaves y los bloques de código que
+    aparecen dentro de strings y emite un evento por cada campo de primer nivel
+    en cuanto está completo. Cada carácter se examina una sola vez salvo que un
+    candidato resulte no ser JSON válido, en cuyo caso se reintenta desde la
+    siguiente llave.
+
+    Los fragmentos se guardan en una lista (no se concatenan) y solo se unen
+    los trozos que se parsean, así que el coste total es lineal en el tamaño
+    del texto sea cual sea el tamaño de los fragmentos. Las posiciones son
+    absolutas, contadas desde el inicio del texto recibido.
+
+    Example:
+        >>> extractor = IncrementalJSONExtractor()
+        >>> for chunk in chunks:
+        ...     for event in extractor.feed(chunk):
+        ...         print(event.kind, event.key)
+    """
+
+    def __init__(self):
+        # Fragmentos desde el inicio del candidato actual y su posición absoluta
+        self._parts: List[str] = []
+        self._part_starts: List[int] = []
+        self._received = 0
+        self._pos = 0
+        self._reset_candidate(0)
+        self.result: Optional[Dict[str, Any]] = None
+        self.raw: Optional[str] = None
+
+    def _reset_candidate(self, seek_from: int) -> None:
+        self._pos = seek_from
+        self._phase = _SEEK
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._key: Optional[str] = None
+        self._token_start = -1
+        self.fields: Dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        return self._phase == _DONE
+
+    def _slice(self, start: int, end: int) -> str:
+        """Texto recibido entre dos posiciones absolutas, uniendo solo los fragmentos necesarios."""
+        first = bisect_right(self._part_starts, start) - 1
+        last = bisect_left(self._part_starts, end)
+        text = self._parts[first] if last - first == 1 else "".join(self._parts[first:last])
+        offset = self._part_starts[first]
+        return text[start - offset:end - offset]
+
+    def _discard_before(self, position: int) -> None:
+        """Olvida los fragmentos que terminan antes de position (ya no se volverán a leer)."""
+        index = bisect_right(self._part_starts, position) - 1
+        if index > 0:
+            del self._parts[:index]
+            del self._part_starts[:index]
+
+    def feed(self, chunk: str) -> List[JSONEvent]:
+        """
+        Procesa un nuevo fragmento de texto.
+
+        Args:
+            chunk: Texto recibido
+
+        Returns:
+            List[JSONEvent]: Eventos completados con este fragmento
+        """
+        events: List[JSONEvent] = []
+        if self._phase == _DONE or not chunk:
+            return events
+
+        self._parts.append(chunk)
+        self._part_starts.append(self._received)
+        # Se recorre solo el fragmento nuevo (text empieza en la posición absoluta base)
+        text = chunk
+        base = self._received
+        self._received += len(chunk)
+        received = self._received
+
+        while self._pos < received and self._phase != _DONE:
+            pos = self._pos
+            if pos < base:
+                # Reintento de un candidato o escape partido: volver a texto ya recibido
+                text = self._slice(pos, received)
+                base = pos
+            char = text[pos - base]
+
+            if self._phase == _SEEK:
+                start = text.find("{", pos - base)
+                if start == -1:
+                    # Nada que conservar hasta la próxima llave
+                    self._parts.clear()
+                    self._part_starts.clear()
+                    self._pos = received
+                    return events
+                start += base
+                self._discard_before(start)
+                self._start = start
+                self._depth = 1
+                self._phase = _KEY
+                self._pos = start + 1
+                continue
+
+            if self._in_string:
+                end = _STRING_BODY.match(text, pos - base).end() + base
+                if end >= received:
+                    self._pos = end
+                    break
+                if text[end - base] == "\\":
+                    if end + 1 >= received:
+                        # Escape partido entre fragmentos: esperar más texto
+                        self._pos = end
+                        break
+                    self._pos = end + 2
+                    continue
+                # Comilla de cierre
+                self._in_string = False
+                self._pos = end + 1
+                if self._depth == 1:
+                    if not self._on_string_closed(end + 1, events):
+                        continue
+                continue
+
+            if char in _WHITESPACE:
+                self._pos = pos + 1
+                continue
+
+            phase = self._phase
+
+            if phase == _KEY:
+                if char == '"':
+                    self._token_start = pos
+                    self._in_string = True
+                elif char == "}" and not self.fields and self._key is None:
+                    self._complete_object(pos + 1, events)
+                else:
+                    self._invalidate()
+                    continue
+            elif phase == _COLON:
+                if char != ":":
+                    self._invalidate()
+                    continue
+                self._phase = _VALUE_START
+            elif phase == _VALUE_START:
+                self._token_start = pos
+                self._phase = _VALUE
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}],:":
+                    self._invalidate()
+                    continue
+            elif phase == _VALUE:
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    if self._depth > 1:
+                        self._depth -= 1
+                        if self._depth == 1:
+                            # Objeto o array anidado completo
+                            if not self._emit_value(pos + 1, events):
+                                continue
+                    elif char == "}":
+                        # Cierre del objeto justo después de un literal
+                        if not self._emit_value(pos, events):
+                            continue
+                        self._complete_object(pos + 1, events)
+                    else:
+                        self._invalidate()
+                        continue
+                elif char == "," and self._depth == 1:
+                    if not self._emit_value(pos, events):
+                        continue
+                    self._phase = _KEY
+            elif phase == _AFTER_VALUE:
+                if char == ",":
+                    self._phase = _KEY
+                elif char == "}":
+                    self._complete_object(pos + 1, events)
+                else:
+                    self._invalidate()
+                    continue
+
+            self._pos = pos + 1
+
+        return events
+
+    def _on_string_closed(self, end: int, events: List[JSONEvent]) -> bool:
+        if self._phase == _KEY:
+            try:
+                self._key = json.loads(self._slice(self._token_start, end))
+            except ValueError:
+                self._invalidate()
+                return False
+            self._phase = _COLON
+            return True
+        if self._phase == _VALUE and self._slice(self._token_start, self._token_start + 1) == '"':
+            return self._emit_value(end, events)
+        return True
+
+    def _emit_value(self, end: int, events: List[JSONEvent]) -> bool:
+        raw_value = self._slice(self._token_start, end).strip()
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            self._invalidate()
+            return False
+        self.fields[self._key] = value
+        events.append(JSONEvent("field", self._key, value))
+        self._key = None
+        self._phase = _AFTER_VALUE
+        return True
+
+    def _complete_object(self, end: int, events: List[JSONEvent]) -> None:
+        self.raw = self._slice(self._start, end)
+        self.result = dict(self.fields)
+        self._phase = _DONE
+        self._pos = end
+        events.append(JSONEvent("object", None, self.result))
+
+    def _invalidate(self) -> None:
+        # El candidato no era un objeto JSON: buscar desde la siguiente llave
+        self._reset_candidate(self._start + 1)
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Devuelve el primer objeto JSON completo de primer nivel contenido en el texto.
+
+    Args:
+        text: Texto completo, posiblemente con el JSON dentro de un bloque markdown
+
+    Returns:
+        Optional[Dict[str, Any]]: Objeto parseado o None si no hay ninguno completo
+    """
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(text)
+    return extractor.result
@@ -0,0 +1,404 @@
+# Plantillas de página completas (perfil, configuración y checkout). Se piden pocas
+# veces, así que templates.page_templates() importa este módulo la primera vez que se usan.
+from app.api.chat.templates import Template
+
+# Perfil de usuario: previsualización HTML
+PROFILE_HTML = Template("""
+<div style="display: inline-flex; flex-direction: column; gap: 16px; width: 360px; padding: 24px; border-radius: 12px; background-color: [[bg_color]]; color: [[text_color]]; font-family: Arial, sans-serif; border: 1px solid [[card_color]];">
+  <div style="display: flex; align-items: center; gap: 16px;">
+    <img src="https://placehold.co/72x72/3b82f6/ffffff?text=JD" alt="Avatar" style="width: 72px; height: 72px; border-radius: 50%;" />
+    <div>
+      <div style="font-size: 20px; font-weight: bold;">Jane Doe</div>
+      <div style="font-size: 14px; color: [[icon_color]];">@janedoe · Product Designer</div>
+    </div>
+  </div>
+  <p style="margin: 0; font-size: 14px; line-height: 1.5;">Diseñadora de producto. Me encanta crear interfaces simples y accesibles.</p>
+  <div style="display: flex; justify-content: space-between; padding: 12px 16px; border-radius: 8px; background-color: [[card_color]];">
+    <div style="text-align: center;"><div style="font-weight: bold;">128</div><div style="font-size: 12px; color: [[icon_color]];">Proyectos</div></div>
+    <div style="text-align: center;"><div style="font-weight: bold;">4.2k</div><div style="font-size: 12px; color: [[icon_color]];">Seguidores</div></div>
+    <div style="text-align: center;"><div style="font-weight: bold;">312</div><div style="font-size: 12px; color: [[icon_color]];">Siguiendo</div></div>
+  </div>
+  <div>
+    <div style="font-size: 14px; font-weight: bold; margin-bottom: 8px;">Actividad reciente</div>
+    <div style="font-size: 13px; color: [[icon_color]]; margin-bottom: 4px;">Publicó un nuevo proyecto · hace 2 h</div>
+    <div style="font-size: 13px; color: [[icon_color]];">Comentó en "Dashboard UI" · hace 1 día</div>
+  </div>
+  <button style="background-color: [[accent_color]]; color: white; border: none; padding: 10px 16px; border-radius: 8px; cursor: pointer;">Seguir</button>
+</div>
+""")
+
+# Perfil de usuario: código React
+PROFILE_CODE = Template("""import React from 'react';
+
+const UserProfile = () => {
+  const containerStyle = {
+    display: 'inline-flex',
+    flexDirection: 'column',
+    gap: '16px',
+    width: '360px',
+    padding: '24px',
+    borderRadius: '12px',
+    backgroundColor: '[[bg_color]]',
+    color: '[[text_color]]',
+    fontFamily: 'Arial, sans-serif',
+    border: '1px solid [[card_color]]'
+  };
+
+  const headerStyle = {
+    display: 'flex',
+    alignItems: 'center',
+    gap: '16px'
+  };
+
+  const avatarStyle = {
+    width: '72px',
+    height: '72px',
+    borderRadius: '50%'
+  };
+
+  const mutedStyle = {
+    fontSize: '14px',
+    color: '[[icon_color]]'
+  };
+
+  const statsStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    padding: '12px 16px',
+    borderRadius: '8px',
+    backgroundColor: '[[card_color]]'
+  };
+
+  const buttonStyle = {
+    backgroundColor: '[[accent_color]]',
+    color: 'white',
+    border: 'none',
+    padding: '10px 16px',
+    borderRadius: '8px',
+    cursor: 'pointer'
+  };
+
+  const stats = [
+    { label: 'Proyectos', value: '128' },
+    { label: 'Seguidores', value: '4.2k' },
+    { label: 'Siguiendo', value: '312' }
+  ];
+
+  const activity = [
+    'Publicó un nuevo proyecto · hace 2 h',
+    'Comentó en "Dashboard UI" · hace 1 día'
+  ];
+
+  return (
+    <div style={containerStyle}>
+      <div style={headerStyle}>
+        <img src="https://placehold.co/72x72/3b82f6/ffffff?text=JD" alt="Avatar" style={avatarStyle} />
+        <div>
+          <div style={{ fontSize: '20px', fontWeight: 'bold' }}>Jane Doe</div>
+          <div style={mutedStyle}>@janedoe · Product Designer</div>
+        </div>
+      </div>
+      <p style={{ margin: 0, fontSize: '14px', lineHeight: 1.5 }}>
+        Diseñadora de producto. Me encanta crear interfaces simples y accesibles.
+      </p>
+      <div style={statsStyle}>
+        {stats.map((stat) => (
+          <div key={stat.label} style={{ textAlign: 'center' }}>
+            <div style={{ fontWeight: 'bold' }}>{stat.value}</div>
+            <div style={{ ...mutedStyle, fontSize: '12px' }}>{stat.label}</div>
+          </div>
+        ))}
+      </div>
+      <div>
+        <div style={{ fontSize: '14px', fontWeight: 'bold', marginBottom: '8px' }}>Actividad reciente</div>
+        {activity.map((item) => (
+          <div key={item} style={{ ...mutedStyle, fontSize: '13px', marginBottom: '4px' }}>{item}</div>
+        ))}
+      </div>
+      <button style={buttonStyle}>Seguir</button>
+    </div>
+  );
+};
+
+export default UserProfile;
+""")
+
+# Página de configuración: previsualización HTML
+SETTINGS_HTML = Template("""
+<div style="display: inline-flex; flex-direction: column; gap: 16px; width: 420px; padding: 24px; border-radius: 12px; background-color: [[bg_color]]; color: [[text_color]]; font-family: Arial, sans-serif; border: 1px solid [[card_color]];">
+  <div style="font-size: 22px; font-weight: bold;">Configuración</div>
+  <div style="padding: 16px; border-radius: 8px; background-color: [[sidebar_color]];">
+    <div style="font-size: 14px; font-weight: bold; margin-bottom: 12px;">Cuenta</div>
+    <label style="display: block; font-size: 13px; color: [[icon_color]]; margin-bottom: 4px;">Correo electrónico</label>
+    <input type="email" value="jane@example.com" style="width: 100%; box-sizing: border-box; padding: 8px 12px; border-radius: 6px; border: 1px solid [[card_color]]; background-color: [[bg_color]]; color: [[text_color]];" />
+  </div>
+  <div style="padding: 16px; border-radius: 8px; background-color: [[sidebar_color]];">
+    <div style="font-size: 14px; font-weight: bold; margin-bottom: 12px;">Notificaciones</div>
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px;"><span style="font-size: 14px;">Correo</span><span style="width: 36px; height: 20px; border-radius: 10px; background-color: [[accent_color]];"></span></div>
+    <div style="display: flex; justify-content: space-between; align-items: center;"><span style="font-size: 14px;">Push</span><span style="width: 36px; height: 20px; border-radius: 10px; background-color: [[card_color]];"></span></div>
+  </div>
+  <div style="padding: 16px; border-radius: 8px; background-color: [[sidebar_color]];">
+    <div style="font-size: 14px; font-weight: bold; margin-bottom: 12px;">Privacidad</div>
+    <div style="display: flex; justify-content: space-between; align-items: center;"><span style="font-size: 14px;">Perfil público</span><span style="width: 36px; height: 20px; border-radius: 10px; background-color: [[accent_color]];"></span></div>
+  </div>
+  <button style="background-color: [[accent_color]]; color: white; border: none; padding: 10px 16px; border-radius: 8px; cursor: pointer;">Guardar cambios</button>
+</div>
+""")
+
+# Página de configuración: código React
+SETTINGS_CODE = Template("""import React, { useState } from 'react';
+
+const SettingsPage = () => {
+  const [email, setEmail] = useState('jane@example.com');
+  const [preferences, setPreferences] = useState({
+    emailNotifications: true,
+    pushNotifications: false,
+    publicProfile: true
+  });
+
+  const containerStyle = {
+    display: 'inline-flex',
+    flexDirection: 'column',
+    gap: '16px',
+    width: '420px',
+    padding: '24px',
+    borderRadius: '12px',
+    backgroundColor: '[[bg_color]]',
+    color: '[[text_color]]',
+    fontFamily: 'Arial, sans-serif',
+    border: '1px solid [[card_color]]'
+  };
+
+  const sectionStyle = {
+    padding: '16px',
+    borderRadius: '8px',
+    backgroundColor: '[[sidebar_color]]'
+  };
+
+  const sectionTitleStyle = {
+    fontSize: '14px',
+    fontWeight: 'bold',
+    marginBottom: '12px'
+  };
+
+  const inputStyle = {
+    width: '100%',
+    boxSizing: 'border-box',
+    padding: '8px 12px',
+    borderRadius: '6px',
+    border: '1px solid [[card_color]]',
+    backgroundColor: '[[bg_color]]',
+    color: '[[text_color]]'
+  };
+
+  const rowStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    alignItems: 'center',
+    marginBottom: '8px',
+    fontSize: '14px'
+  };
+
+  const toggleStyle = (enabled) => ({
+    width: '36px',
+    height: '20px',
+    borderRadius: '10px',
+    border: 'none',
+    cursor: 'pointer',
+    backgroundColor: enabled ? '[[accent_color]]' : '[[card_color]]'
+  });
+
+  const buttonStyle = {
+    backgroundColor: '[[accent_color]]',
+    color: 'white',
+    border: 'none',
+    padding: '10px 16px',
+    borderRadius: '8px',
+    cursor: 'pointer'
+  };
+
+  const toggle = (key) => setPreferences({ ...preferences, [key]: !preferences[key] });
+
+  return (
+    <div style={containerStyle}>
+      <div style={{ fontSize: '22px', fontWeight: 'bold' }}>Configuración</div>
+      <div style={sectionStyle}>
+        <div style={sectionTitleStyle}>Cuenta</div>
+        <label style={{ display: 'block', fontSize: '13px', color: '[[icon_color]]', marginBottom: '4px' }}>Correo electrónico</label>
+        <input type="email" value={email} onChange={(e) => setEmail(e.target.value)} style={inputStyle} />
+      </div>
+      <div style={sectionStyle}>
+        <div style={sectionTitleStyle}>Notificaciones</div>
+        <div style={rowStyle}>
+          <span>Correo</span>
+          <button aria-label="Notificaciones por correo" style={toggleStyle(preferences.emailNotifications)} onClick={() => toggle('emailNotifications')} />
+        </div>
+        <div style={rowStyle}>
+          <span>Push</span>
+          <button aria-label="Notificaciones push" style={toggleStyle(preferences.pushNotifications)} onClick={() => toggle('pushNotifications')} />
+        </div>
+      </div>
+      <div style={sectionStyle}>
+        <div style={sectionTitleStyle}>Privacidad</div>
+        <div style={rowStyle}>
+          <span>Perfil público</span>
+          <button aria-label="Perfil público" style={toggleStyle(preferences.publicProfile)} onClick={() => toggle('publicProfile')} />
+        </div>
+      </div>
+      <button style={buttonStyle}>Guardar cambios</button>
+    </div>
+  );
+};
+
+export default SettingsPage;
+""")
+
+# Formulario de checkout: previsualización HTML
+CHECKOUT_HTML = Template("""
+<div style="display: inline-flex; gap: 24px; padding: 24px; border-radius: 12px; background-color: [[bg_color]]; color: [[text_color]]; font-family: Arial, sans-serif; border: 1px solid [[card_color]];">
+  <div style="display: flex; flex-direction: column; gap: 12px; width: 320px;">
+    <div style="font-size: 18px; font-weight: bold;">Datos de envío</div>
+    <input placeholder="Nombre completo" style="padding: 8px 12px; border-radius: 6px; border: 1px solid [[card_color]]; background-color: [[bg_color]]; color: [[text_color]];" />
+    <input placeholder="Dirección" style="padding: 8px 12px; border-radius: 6px; border: 1px solid [[card_color]]; background-color: [[bg_color]]; color: [[text_color]];" />
+    <div style="font-size: 18px; font-weight: bold; margin-top: 8px;">Método de pago</div>
+    <label style="display: flex; gap: 8px; align-items: center; font-size: 14px;"><input type="radio" name="payment" checked /> Tarjeta de crédito</label>
+    <label style="display: flex; gap: 8px; align-items: center; font-size: 14px;"><input type="radio" name="payment" /> PayPal</label>
+    <input placeholder="Número de tarjeta" style="padding: 8px 12px; border-radius: 6px; border: 1px solid [[card_color]]; background-color: [[bg_color]]; color: [[text_color]];" />
+  </div>
+  <div style="display: flex; flex-direction: column; gap: 8px; width: 240px; padding: 16px; border-radius: 8px; background-color: [[sidebar_color]];">
+    <div style="font-size: 18px; font-weight: bold; margin-bottom: 8px;">Resumen del pedido</div>
+    <div style="display: flex; justify-content: space-between; font-size: 14px;"><span>Auriculares</span><span>$79.00</span></div>
+    <div style="display: flex; justify-content: space-between; font-size: 14px;"><span>Funda</span><span>$19.00</span></div>
+    <div style="display: flex; justify-content: space-between; font-size: 14px; color: [[icon_color]];"><span>Envío</span><span>$5.00</span></div>
+    <div style="display: flex; justify-content: space-between; font-weight: bold; border-top: 1px solid [[card_color]]; padding-top: 8px;"><span>Total</span><span>$103.00</span></div>
+    <button style="margin-top: 8px; background-color: [[accent_color]]; color: white; border: none; padding: 10px 16px; border-radius: 8px; cursor: pointer;">Pagar ahora</button>
+  </div>
+</div>
+""")
+
+# Formulario de checkout: código React
+CHECKOUT_CODE = Template("""import React, { useState } from 'react';
+
+const CheckoutForm = () => {
+  const [paymentMethod, setPaymentMethod] = useState('card');
+
+  const items = [
+    { name: 'Auriculares', price: 79 },
+    { name: 'Funda', price: 19 }
+  ];
+  const shipping = 5;
+  const total = items.reduce((sum, item) => sum + item.price, 0) + shipping;
+
+  const containerStyle = {
+    display: 'inline-flex',
+    gap: '24px',
+    padding: '24px',
+    borderRadius: '12px',
+    backgroundColor: '[[bg_color]]',
+    color: '[[text_color]]',
+    fontFamily: 'Arial, sans-serif',
+    border: '1px solid [[card_color]]'
+  };
+
+  const formStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '12px',
+    width: '320px'
+  };
+
+  const titleStyle = {
+    fontSize: '18px',
+    fontWeight: 'bold'
+  };
+
+  const inputStyle = {
+    padding: '8px 12px',
+    borderRadius: '6px',
+    border: '1px solid [[card_color]]',
+    backgroundColor: '[[bg_color]]',
+    color: '[[text_color]]'
+  };
+
+  const optionStyle = {
+    display: 'flex',
+    gap: '8px',
+    alignItems: 'center',
+    fontSize: '14px'
+  };
+
+  const summaryStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '8px',
+    width: '240px',
+    padding: '16px',
+    borderRadius: '8px',
+    backgroundColor: '[[sidebar_color]]'
+  };
+
+  const lineStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    fontSize: '14px'
+  };
+
+  const buttonStyle = {
+    marginTop: '8px',
+    backgroundColor: '[[accent_color]]',
+    color: 'white',
+    border: 'none',
+    padding: '10px 16px',
+    borderRadius: '8px',
+    cursor: 'pointer'
+  };
+
+  return (
+    <div style={containerStyle}>
+      <form style={formStyle} onSubmit={(e) => e.preventDefault()}>
+        <div style={titleStyle}>Datos de envío</div>
+        <input placeholder="Nombre completo" style={inputStyle} />
+        <input placeholder="Dirección" style={inputStyle} />
+        <div style={{ ...titleStyle, marginTop: '8px' }}>Método de pago</div>
+        <label style={optionStyle}>
+          <input type="radio" name="payment" checked={paymentMethod === 'card'} onChange={() => setPaymentMethod('card')} />
+          Tarjeta de crédito
+        </label>
+        <label style={optionStyle}>
+          <input type="radio" name="payment" checked={paymentMethod === 'paypal'} onChange={() => setPaymentMethod('paypal')} />
+          PayPal
+        </label>
+        {paymentMethod === 'card' && <input placeholder="Número de tarjeta" style={inputStyle} />}
+      </form>
+      <div style={summaryStyle}>
+        <div style={{ ...titleStyle, marginBottom: '8px' }}>Resumen del pedido</div>
+        {items.map((item) => (
+          <div key={item.name} style={lineStyle}>
+            <span>{item.name}</span>
+            <span>${item.price.toFixed(2)}</span>
+          </div>
+        ))}
+        <div style={{ ...lineStyle, color: '[[icon_color]]' }}>
+          <span>Envío</span>
+          <span>${shipping.toFixed(2)}</span>
+        </div>
+        <div style={{ ...lineStyle, fontWeight: 'bold', borderTop: '1px solid [[card_color]]', paddingTop: '8px' }}>
+          <span>Total</span>
+          <span>${total.toFixed(2)}</span>
+        </div>
+        <button style={buttonStyle}>Pagar ahora</button>
+      </div>
+    </div>
+  );
+};
+
+export default CheckoutForm;
+""")
+
+
+# Plantillas por categoría: (preview_html, component_code, descripción)
+PAGE_TEMPLATES = {
+    "profile": (PROFILE_HTML, PROFILE_CODE, Template("A user profile card with avatar, bio, stats and recent activity: [[prompt_content]]")),
+    "settings": (SETTINGS_HTML, SETTINGS_CODE, Template("A settings page with account, notification and privacy sections: [[prompt_content]]")),
+    "checkout": (CHECKOUT_HTML, CHECKOUT_CODE, Template("A checkout form with shipping details, payment options and order summary: [[prompt_content]]")),
+}
@@ -0,0 +1,354 @@
+import re
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from app.api.chat.classifier import confident_category
+from app.core.config import settings
+from app.core.deadline import expired
+from app.core.metrics import STAGE_DURATION
+from app.api.chat.service import (
+    clean_preview_html,
+    create_dashboard_component,
+    create_default_component_code,
+    create_fallback_footer,
+    fix_jsx_code,
+    format_code,
+    handle_component_by_type,
+    simplify_large_component,
+)
+
+REQUIRED_FIELDS = ("visual_description", "preview_html", "component_code")
+
+# Tamaño a partir del cual el pipeline completo reemplaza el componente por uno simplificado
+MAX_COMPONENT_SIZE = 10000
+
+_COMPONENT_NAME = re.compile(r'(?:function|const)\s+([A-Za-z0-9_]+)')
+_EMBEDDED_PREVIEW = re.compile(r'"preview_html":\s*"([^"]+)"')
+_ANY_HTML_ELEMENT = re.compile(r'<([a-z]+).*?>[\s\S]*?<\/\1>', re.I)
+_FLEX_WRAPPER = re.compile(r'<div[^>]*style="[^"]*display:\s*flex[^"]*"[^>]*>\s*(<div)')
+
+
+class StageContext(NamedTuple):
+    """Datos de la solicitud disponibles para todas las etapas."""
+    prompt: str
+    platform: str
+
+
+class Stage(NamedTuple):
+    """
+    Etapa del post-procesado de un componente.
+
+    needs_work es una comprobación barata que indica si la etapa tiene algo
+    que corregir; si devuelve False, run no se ejecuta. run devuelve el
+    componente corregido (puede ser el mismo diccionario o uno nuevo).
+    Las etapas no esenciales se omiten si ya venció el plazo de la solicitud.
+    """
+    name: str
+    needs_work: Callable[[Dict[str, Any], StageContext], bool]
+    run: Callable[[Dict[str, Any], StageContext], Dict[str, Any]]
+    essential: bool = False
+
+
+def _code(component: Dict[str, Any]) -> str:
+    return component.get("component_code") or ""
+
+
+def _preview(component: Dict[str, Any]) -> str:
+    return component.get("preview_html") or ""
+
+
+# --- Campos requeridos ---
+
+def _missing_fields(component, context):
+    return any(
+        not isinstance(component.get(field), str) or not component[field].strip()
+        for field in REQUIRED_FIELDS
+    )
+
+def _fill_missing_fields(component, context):
+    defaults = {
+        "visual_description": lambda: f"{context.platform.capitalize()} component: {context.prompt}",
+        "preview_html": lambda: f"<div style='padding: 16px; border: 1px solid #ccc; border-radius: 8px;'>{context.prompt}</div>",
+        "component_code": lambda: create_default_component_code(context.prompt),
+    }
+    for field, default in defaults.items():
+        value = component.get(field)
+        if not isinstance(value, str) or not value.strip():
+            component[field] = default()
+    return component
+
+
+# --- HTML de previsualización ---
+
+def _preview_is_json(component, context):
+    preview = _preview(component)
+    return '"preview_html"' in preview or '```json' in preview
+
+def _unwrap_preview(component, context):
+    # El modelo a veces devuelve el JSON completo dentro de preview_html
+    preview = _preview(component)
+    match = _EMBEDDED_PREVIEW.search(preview)
+    if match:
+        preview = match.group(1).replace('\\\"', '"').replace('\\n', '\n')
+    else:
+        html_match = _ANY_HTML_ELEMENT.search(preview)
+        if html_match:
+            preview = html_match.group(0)
+    component["preview_html"] = preview
+    return component
+
+def _preview_needs_display(component, context):
+    preview = _preview(component)
+    lower = preview.lower()
+    return (
+        'display:' not in lower
+        or ('flex' not in lower and 'inline-block' not in lower)
+        or ('flex' in lower and lower.count('<div') > 1)
+        or preview != preview.strip()
+    )
+
+def _fix_preview_display(component, context):
+    # Usar display: inline-flex para evitar espacios innecesarios alrededor del componente
+    preview = _preview(component)
+    lower = preview.lower()
+    if 'display:' not in lower:
+        preview = preview.replace('<div', '<div style="display: inline-flex;"')
+    elif not any(display in lower for display in ['inline-flex', 'inline-block', 'flex']):
+        preview = preview.replace('display:', 'display: inline-flex;')
+
+    # Eliminar divs contenedores adicionales que puedan causar espacios
+    preview = _FLEX_WRAPPER.sub(r'\1', preview)
+    component["preview_html"] = preview.strip()
+    return component
+
+def _preview_has_wrappers(component, context):
+    preview = _preview(component)
+    return '<div' in preview or '<' not in preview
+
+def _clean_preview(component, context):
+    component["preview_html"] = clean_preview_html(_preview(component))
+    return component
+
+
+# --- Código del componente ---
+
+def _code_has_escapes(component, context):
+    code = _code(component)
+    return '\\' in code or '///' in code
+
+def _unescape_code(component, context):
+    code = _code(component)
+    code = code.replace('\\n', '\n')
+    code = code.replace('\\\"', '"')
+    code = code.replace('\\\'', "'")
+    code = code.replace('\\/', '/')
+
+    # Eliminar comentarios en línea problemáticos
+    code = code.replace('///', '//')
+    code = code.replace('\\/\\/', '//')
+    component["component_code"] = code
+    return component
+
+def _code_is_single_line(component, context):
+    code = _code(component)
+    return '\n' not in code and '{' in code and '}' in code
+
+def _format_code(component, context):
+    formatted_code = format_code(_code(component))
+    if formatted_code:
+        component["component_code"] = formatted_code
+    return component
+
+def _missing_react_import(component, context):
+    return 'import React' not in _code(component)
+
+def _add_react_import(component, context):
+    component["component_code"] = "import React from 'react';\n\n" + _code(component)
+    return component
+
+def _missing_export(component, context):
+    return 'export default' not in _code(component)
+
+def _add_export(component, context):
+    code = _code(component)
+    component_name = "Component"
+    component_name_match = _COMPONENT_NAME.search(code)
+    if component_name_match:
+        component_name = component_name_match.group(1)
+    component["component_code"] = code + f"\n\nexport default {component_name};"
+    return component
+
+def _code_looks_truncated(component, context):
+    # El código completo termina en ';' o '}' y tiene las llaves equilibradas
+    code = _code(component)
+    return not code.rstrip().endswith((';', '}')) or code.count('{') > code.count('}')
+
+def _fix_jsx(component, context):
+    component["component_code"] = fix_jsx_code(_code(component))
+    return component
+
+def _code_too_large(component, context):
+    return len(_code(component)) > MAX_COMPONENT_SIZE
+
+def _simplify_code(component, context):
+    component["component_code"] = simplify_large_component(_code(component), context.prompt)
+    return component
+
+
+# --- Correcciones por tipo de componente ---
+
+def _template_category(prompt):
+    # Solo cuenta la categoría si la confianza alcanza el umbral de las plantillas
+    return confident_category(prompt, settings.TEMPLATE_MATCH_THRESHOLD)
+
+def _has_known_type(component, context):
+    return _template_category(context.prompt) in ('dashboard', 'footer')
+
+def _apply_component_type(component, context):
+    prompt_content = context.prompt
+    preview = _preview(component)
+    # Si el preview muestra el texto del prompt en lugar de un componente, usar el componente específico
+    if preview == prompt_content or prompt_content in preview:
+        category = _template_category(prompt_content)
+        if category == 'dashboard':
+            return create_dashboard_component(prompt_content)
+        if category == 'footer':
+            return create_fallback_footer(prompt_content)
+    return handle_component_by_type(prompt_content, component)
+
+
+STAGES: Dict[str, Stage] = {
+    stage.name: stage
+    for stage in (
+        Stage("required_fields", _missing_fields, _fill_missing_fields, essential=True),
+        Stage("unwrap_preview", _preview_is_json, _unwrap_preview),
+        Stage("preview_display", _preview_needs_display, _fix_preview_display),
+        Stage("clean_preview", _preview_has_wrappers, _clean_preview),
+        Stage("unescape_code", _code_has_escapes, _unescape_code),
+        Stage("format_code", _code_is_single_line, _format_code),
+        Stage("react_import", _missing_react_import, _add_react_import, essential=True),
+        Stage("export_default", _missing_export, _add_export, essential=True),
+        Stage("fix_jsx", _code_looks_truncated, _fix_jsx),
+        Stage("simplify_large", _code_too_large, _simplify_code),
+        Stage("component_type", _has_known_type, _apply_component_type),
+    )
+}
+
+
+class Pipeline:
+    """
+    Secuencia de etapas de post-procesado que mide el tiempo de cada una.
+
+    Las etapas cuya comprobación needs_work devuelve False se omiten, así que
+    una respuesta ya bien formada apenas paga el coste de esas comprobaciones.
+    """
+
+    def __init__(self, name: str, stage_names: Sequence[str]):
+        self.name = name
+        self.stages: List[Stage] = [STAGES[stage_name] for stage_name in stage_names]
+        self._totals = {stage.name: {"runs": 0, "skipped": 0, "deadline_skipped": 0, "total_ms": 0.0} for stage in self.stages}
+
+    def run(self, component: Dict[str, Any], prompt: str, platform: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Aplica las etapas al componente.
+
+        Args:
+            component: Datos del componente devueltos por el modelo
+            prompt: Descripción original del usuario
+            platform: Plataforma objetivo
+
+        Returns:
+            tuple: (componente corregido, informe con el tiempo de cada etapa)
+        """
+        context = StageContext(prompt=prompt, platform=platform or "web")
+        report = []
+        pipeline_start = time.perf_counter()
+
+        for stage in self.stages:
+            if not stage.essential and expired():
+                # Sin plazo restante solo se aplican las correcciones imprescindibles
+                self._totals[stage.name]["deadline_skipped"] += 1
+                report.append({"stage": stage.name, "ran": False, "ms": 0.0, "deadline": True})
+                continue
+            start = time.perf_counter()
+            ran = stage.needs_work(component, context)
+            if ran:
+                component = stage.run(component, context)
+            elapsed = time.perf_counter() - start
+            elapsed_ms = elapsed * 1000
+            STAGE_DURATION.observe(elapsed, pipeline=self.name, stage=stage.name)
+
+            totals = self._totals[stage.name]
+            totals["runs" if ran else "skipped"] += 1
+            totals["total_ms"] += elapsed_ms
+            report.append({"stage": stage.name, "ran": ran, "ms": round(elapsed_ms, 3)})
+
+        return component, {
+            "pipeline": self.name,
+            "total_ms": round((time.perf_counter() - pipeline_start) * 1000, 3),
+            "stages": report,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Ejecuciones, omisiones y tiempo acumulado de cada etapa."""
+        return {
+            stage_name: {
+                "runs": totals["runs"],
+                "skipped": totals["skipped"],
+                "deadline_skipped": totals["deadline_skipped"],
+                "total_ms": round(totals["total_ms"], 3),
+            }
+            for stage_name, totals in self._totals.items()
+        }
+
+
+# Correcciones mínimas que se aplican a las respuestas del modelo servidas por
+# la API; el formateo y la reparación de JSX solo se usan en FULL_STAGES
+STANDARD_STAGES = (
+    "required_fields",
+    "clean_preview",
+    "react_import",
+    "export_default",
+)
+
+# Secuencia completa de process_component_data, que además reescribe el
+# preview, simplifica los componentes grandes y aplica los componentes por tipo
+FULL_STAGES = (
+    "required_fields",
+    "unwrap_preview",
+    "preview_display",
+    "unescape_code",
+    "format_code",
+    "react_import",
+    "export_default",
+    "fix_jsx",
+    "simplify_large",
+    "component_type",
+)
+
+# Etapas por plataforma; las plataformas no listadas usan la de "web"
+PLATFORM_PIPELINES: Dict[str, Pipeline] = {
+    "web": Pipeline("web", STANDARD_STAGES),
+    "mobile": Pipeline("mobile", STANDARD_STAGES),
+}
+
+full_pipeline = Pipeline("full", FULL_STAGES)
+
+
+def get_pipeline(platform: str) -> Pipeline:
+    return PLATFORM_PIPELINES.get((platform or "").lower(), PLATFORM_PIPELINES["web"])
+
+
+def postprocess_component(component: Dict[str, Any], prompt: str, platform: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Corrige el componente devuelto por el modelo con el pipeline de su plataforma.
+
+    Returns:
+        tuple: (componente corregido, informe de tiempos por etapa)
+    """
+    return get_pipeline(platform).run(component, prompt, platform)
+
+
+def pipeline_stats() -> Dict[str, Any]:
+    pipelines = dict(PLATFORM_PIPELINES, full=full_pipeline)
+    return {name: pipeline.stats() for name, pipeline in pipelines.items()}
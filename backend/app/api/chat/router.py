@@ -1,10 +1,42 @@
-from fastapi import APIRouter, HTTPException, status, Body
+from fastapi import APIRouter, HTTPException, status, Body, Header, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
+import asyncio
 import json
-from app.api.chat.service import generate_chat_response, generate_qwen_response
+import logging
+import orjson
+from app.api.chat.service import (
+    generate_chat_response,
+    generate_qwen_response,
+    stream_qwen_response,
+    component_cache_key,
+    clean_preview_html,
+    create_fallback_component,
+    create_template_component
+)
+from app.api.chat.classifier import classify_prompt
+from app.api.chat.json_extractor import IncrementalJSONExtractor
+from app.api.chat.pipeline import postprocess_component, pipeline_stats
+from app.core.http_client import get_upstream_client
+from app.core.cache import get_result_cache
+from app.core.singleflight import get_component_flights
+from app.core.limiter import LimiterRejected, get_upstream_limiter
+from app.core.resilience import get_upstream_resilience
+from app.core.circuit_breaker import get_upstream_breaker
+from app.core.deadline import (
+    ClientDisconnected,
+    DeadlineExceeded,
+    cancel_on_disconnect,
+    deadline_scope,
+    request_timeout
+)
+from app.core.similarity import SimilarMatch, get_similarity_index
+from app.core.metrics import TrackedRequest, track_request
+from app.core.config import settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = logging.getLogger(__name__)
 
 class Message(BaseModel):
     role: str = Field(..., description="Rol del mensaje: 'system', 'user', o 'assistant'")
@@ -21,12 +53,16 @@ class Message(BaseModel):
 class ComponentRequest(BaseModel):
     prompt: str = Field(..., description="Descripción textual del componente a generar")
     platform: str = Field(..., description="Plataforma objetivo (web o mobile)")
+    allow_template: bool = Field(False, description="Permitir responder con una plantilla predefinida (sin llamar al modelo) si el prompt coincide claramente con una")
+    timeout_seconds: Optional[float] = Field(None, gt=0, description="Plazo máximo en segundos para obtener la respuesta (también con la cabecera X-Request-Timeout)")
+    include_debug: bool = Field(False, description="Incluir api_debug (respuesta original del modelo y etapas del post-procesado); solo con API_DEBUG_ENABLED=true")
     
     class Config:
         schema_extra = {
             "example": {
                 "prompt": "Botón de login moderno con estilo neumórfico",
-                "platform": "web"
+                "platform": "web",
+                "allow_template": False
             }
         }
 
@@ -47,11 +83,17 @@ class ComponentData(BaseModel):
 class ComponentResponse(BaseModel):
     status: str = Field(..., description="Estado de la respuesta (success o error)")
     component: Optional[ComponentData] = Field(None, description="Datos del componente generado")
+    cached: bool = Field(False, description="Indica si el componente se sirvió desde el caché")
+    source: str = Field("model", description="Origen del componente: model, template o fallback")
+    similarity: Optional[Dict[str, Any]] = Field(None, description="Si el componente se sirvió desde un prompt parecido: similitud estimada y prompt original")
+    api_debug: Optional[Dict[str, Any]] = Field(None, description="Información de depuración, solo si se pidió con include_debug y API_DEBUG_ENABLED=true")
     
     class Config:
         schema_extra = {
             "example": {
                 "status": "success",
+                "cached": False,
+                "source": "model",
                 "component": {
                     "visual_description": "Botón de login moderno con estilo neumórfico",
                     "preview_html": "<button class='login-btn'>Login</button>",
@@ -60,15 +102,33 @@ class ComponentResponse(BaseModel):
             }
         }
 
+# Campos de ComponentData, los únicos del componente que se envían al cliente
+COMPONENT_FIELDS = tuple(ComponentData.model_fields)
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Estado del servidor")
     message: str = Field(..., description="Mensaje descriptivo")
+    upstream_pool: Optional[Dict[str, Any]] = Field(None, description="Estadísticas del pool de conexiones hacia QWEN")
+    result_cache: Optional[Dict[str, Any]] = Field(None, description="Estadísticas del caché de componentes")
+    in_flight_generations: Optional[Dict[str, Any]] = Field(None, description="Generaciones en curso y solicitudes deduplicadas")
+    postprocess_pipeline: Optional[Dict[str, Any]] = Field(None, description="Ejecuciones, omisiones y tiempo acumulado de cada etapa de post-procesado")
+    similarity_index: Optional[Dict[str, Any]] = Field(None, description="Estadísticas del índice de prompts casi duplicados")
+    upstream_limiter: Optional[Dict[str, Any]] = Field(None, description="Límite de concurrencia actual, llamadas en curso y en cola hacia QWEN")
+    upstream_resilience: Optional[Dict[str, Any]] = Field(None, description="Reintentos, peticiones duplicadas, latencia p95 y presupuesto de reintentos")
+    circuit_breaker: Optional[Dict[str, Any]] = Field(None, description="Estado del circuito hacia QWEN (closed, open o half_open)")
     
     class Config:
         schema_extra = {
             "example": {
                 "status": "ok",
-                "message": "Server is running"
+                "message": "Server is running",
+                "upstream_pool": {
+                    "started": True,
+                    "pool_size": 100,
+                    "connections_idle": 2,
+                    "connections_in_use": 1,
+                    "transport": {"mode": "passthrough"}
+                }
             }
         }
 
@@ -81,7 +141,15 @@ class HealthResponse(BaseModel):
 async def health_check():
     return {
         "status": "ok",
-        "message": "Server is running"
+        "message": "Server is running",
+        "upstream_pool": get_upstream_client().stats(),
+        "result_cache": get_result_cache().stats(),
+        "in_flight_generations": get_component_flights().stats(),
+        "postprocess_pipeline": pipeline_stats(),
+        "similarity_index": get_similarity_index().stats(),
+        "upstream_limiter": get_upstream_limiter().stats(),
+        "upstream_resilience": get_upstream_resilience().stats(),
+        "circuit_breaker": get_upstream_breaker().stats()
     }
 
 @router.post(
@@ -91,51 +159,243 @@ async def health_check():
     summary="Generar componente UI",
     description="Genera un componente UI basado en una descripción textual usando la API de QWEN"
 )
-async def generate_ui_component(request: ComponentRequest):
+async def generate_ui_component(
+    request: ComponentRequest,
+    http_request: Request,
+    x_request_timeout: Optional[float] = Header(None, description="Plazo máximo en segundos para obtener la respuesta")
+):
     """
     Endpoint para generar componentes UI usando la API de QWEN.
     
+    Las solicitudes idénticas (mismo prompt normalizado y plataforma) se
+    sirven desde el caché de resultados sin volver a llamar al modelo, y las
+    que llegan mientras otra igual está en curso esperan su resultado. Con
+    SIMILARITY_MODE=serve, un prompt casi idéntico a uno ya generado se sirve
+    con el resultado de aquel.
+    
+    Con un plazo (cabecera X-Request-Timeout o campo timeout_seconds), la
+    llamada al modelo no lo supera: al vencer se responde con el mejor
+    componente disponible en local. Si el cliente se desconecta, la llamada
+    al modelo se cancela.
+    
     Args:
         request: Objeto con prompt y plataforma objetivo
+        http_request: Solicitud HTTP, para detectar la desconexión del cliente
+        x_request_timeout: Plazo indicado en la cabecera X-Request-Timeout
         
     Returns:
-        dict: Componente UI generado con su código y previsualización
+        ORJSONResponse: Componente UI generado con su código y previsualización
+    """
+    with deadline_scope(request_timeout(x_request_timeout, request.timeout_seconds)), \
+            track_request("generate", request.platform) as tracked:
+        try:
+            result = await cancel_on_disconnect(http_request, _resolve_component(request))
+        except ClientDisconnected:
+            # Nadie leerá la respuesta (499: el cliente cerró la conexión)
+            tracked.outcome = "disconnected"
+            return Response(status_code=499)
+        except LimiterRejected:
+            tracked.outcome = "rejected"
+            raise
+        tracked.outcome = _outcome(result)
+        # El resultado ya tiene la forma de ComponentResponse: se serializa sin volver a validarlo
+        return ORJSONResponse(_response_body(result, request))
+
+def _response_body(result: Dict[str, Any], request: ComponentRequest) -> Dict[str, Any]:
+    """
+    Cuerpo de la respuesta con los campos de ComponentResponse. api_debug
+    (que repite la respuesta completa del modelo) solo se incluye si el
+    cliente lo pide y API_DEBUG_ENABLED lo permite.
+    """
+    component = result.get("component")
+    body = {
+        "status": result["status"],
+        "component": {field: component.get(field) for field in COMPONENT_FIELDS} if component is not None else None,
+        "cached": result.get("cached", False),
+        "source": result.get("source", "model"),
+        "similarity": result.get("similarity"),
+    }
+    if request.include_debug and settings.API_DEBUG_ENABLED and "api_debug" in result:
+        body["api_debug"] = result["api_debug"]
+    return body
+
+async def _resolve_component(request: ComponentRequest) -> Dict[str, Any]:
+    """
+    Obtiene el componente de una solicitud: plantilla, caché exacto, prompt
+    parecido o, si nada de eso aplica, una generación con QWEN compartida
+    entre las solicitudes idénticas en curso.
     """
+    # Los prompts que coinciden claramente con una plantilla no necesitan el modelo
+    template_response = _template_response(request)
+    if template_response is not None:
+        return template_response
+    
+    cache = get_result_cache()
+    cache_key = component_cache_key(request.prompt, request.platform)
+    
+    cached_component = await cache.get(cache_key)
+    if cached_component is not None:
+        return {
+            "status": "success",
+            "component": cached_component,
+            "cached": True
+        }
+    
+    similar = _similar_component(request)
+    if similar is not None and settings.SIMILARITY_MODE == "serve":
+        return {
+            "status": "success",
+            "component": similar.value,
+            "cached": True,
+            "similarity": _similarity_info(similar)
+        }
+    
+    # Con el circuito abierto no se espera al proveedor caído
+    if get_upstream_breaker().is_open():
+        return _degraded_response(request, similar, reason="circuit_open")
+    
+    async def generate_and_cache():
+        result, cacheable = await _generate_component(request)
+        if cacheable:
+            await cache.set(cache_key, result["component"])
+            get_similarity_index().add(cache_key, request.prompt, request.platform, result["component"])
+        return result
+    
+    # Las solicitudes idénticas concurrentes comparten una única llamada a QWEN
     try:
-        # Crear mensaje del usuario con la solicitud de componente
-        prompt = f"{request.platform.capitalize()} component: {request.prompt}"
-        
-        # Mensaje adicional para formato del código
-        formatting_instructions = """
+        result, _ = await get_component_flights().do(cache_key, generate_and_cache)
+    except DeadlineExceeded:
+        return _degraded_response(request, similar, reason="deadline")
+    return result
+
+def _template_response(request: ComponentRequest) -> Optional[Dict[str, Any]]:
+    """
+    Respuesta desde plantilla si el cliente lo permite y el prompt coincide
+    con una plantilla conocida con suficiente confianza; None en otro caso.
+    """
+    if not request.allow_template:
+        return None
+    
+    classification = classify_prompt(request.prompt)
+    if not classification.category or classification.confidence < settings.TEMPLATE_MATCH_THRESHOLD:
+        return None
+    
+    return {
+        "status": "success",
+        "component": create_template_component(classification.category, request.prompt),
+        "source": "template",
+        "api_debug": {"classification": classification._asdict()}
+    }
+
+def _similar_component(request: ComponentRequest) -> Optional[SimilarMatch]:
+    """
+    Componente ya generado para un prompt casi idéntico (misma plataforma), o
+    None si no hay ninguno por encima de SIMILARITY_THRESHOLD o el índice está desactivado.
+    """
+    if settings.SIMILARITY_MODE not in ("serve", "preview"):
+        return None
+    return get_similarity_index().query(request.prompt, request.platform)
+
+def _outcome(result: Dict[str, Any]) -> str:
+    """Resultado de una respuesta para las métricas: model, cache, similar, template o fallback."""
+    if result.get("similarity"):
+        return "similar"
+    if result.get("cached"):
+        return "cache"
+    return result.get("source", "model")
+
+def _similarity_info(match: SimilarMatch) -> Dict[str, Any]:
+    return {"score": match.score, "matched_prompt": match.prompt}
+
+def _degraded_response(request: ComponentRequest, similar: Optional[SimilarMatch], reason: str) -> Dict[str, Any]:
+    """
+    Respuesta local cuando no se puede esperar al modelo (circuito abierto o
+    plazo vencido): el componente de un prompt parecido si lo hay, si no la
+    plantilla de la categoría más probable si alcanza TEMPLATE_MATCH_THRESHOLD
+    y, en último caso, el componente de respaldo.
+    """
+    debug = {"degraded": reason}
+    if similar is not None:
+        return {
+            "status": "success",
+            "component": similar.value,
+            "cached": True,
+            "similarity": _similarity_info(similar),
+            "api_debug": debug
+        }
+    
+    classification = classify_prompt(request.prompt)
+    if classification.category and classification.confidence >= settings.TEMPLATE_MATCH_THRESHOLD:
+        return {
+            "status": "success",
+            "component": create_template_component(classification.category, request.prompt),
+            "source": "template",
+            "api_debug": dict(debug, classification=classification._asdict())
+        }
+    
+    return {
+        "status": "success",
+        "component": json.loads(create_fallback_component(request.prompt)["message"]),
+        "source": "fallback",
+        "api_debug": debug
+    }
+
+def _build_component_messages(request: ComponentRequest) -> List[Dict[str, str]]:
+    """
+    Construye los mensajes de sistema y de usuario enviados a QWEN para una solicitud.
+    """
+    # Crear mensaje del usuario con la solicitud de componente
+    prompt = f"{request.platform.capitalize()} component: {request.prompt}"
+    
+    # Mensaje adicional para formato del código
+    formatting_instructions = """
 IMPORTANT: Ensure the component code is properly formatted with clear indentation and line breaks.
 Do NOT put all code in a single line. Use proper JSX syntax and React patterns.
 MAKE SURE all JSX tags are properly closed and all functions have proper return statements.
 Format all styles and JSX with proper indentation.
 """
-        
-        # Enviar solo el mensaje esencial para el usuario con instrucciones de formato
-        user_message = {
-            "role": "user",
-            "content": f"{prompt}\n\n{formatting_instructions}"
-        }
-        
-        # Mensaje del sistema mejorado
-        system_message = {
-            "role": "system", 
-            "content": f"""You are a UI component generator for {request.platform}.
+    
+    # Enviar solo el mensaje esencial para el usuario con instrucciones de formato
+    user_message = {
+        "role": "user",
+        "content": f"{prompt}\n\n{formatting_instructions}"
+    }
+    
+    # Mensaje del sistema mejorado
+    system_message = {
+        "role": "system", 
+        "content": f"""You are a UI component generator for {request.platform}.
 Always return well-formatted, properly indented code with necessary line breaks.
 Use proper syntax highlighting conventions and follow React best practices.
 Return complete components with no truncated code and proper JSX closing tags.
 When using images, always use full URLs to placeholder images, not relative paths.
 Generate components that EXACTLY match the user's description and requirements.
 """
-        }
-        
-        # Combinar mensajes para la solicitud a la API
-        messages = [system_message, user_message]
-        
+    }
+    
+    # Combinar mensajes para la solicitud a la API
+    return [system_message, user_message]
+
+def _basic_fallback_component(request: ComponentRequest) -> Dict[str, str]:
+    """
+    Componente genérico mínimo usado cuando no se puede obtener uno del modelo.
+    """
+    return {
+        "visual_description": f"{request.platform.capitalize()} component: {request.prompt}",
+        "preview_html": f"<div style='padding: 16px; border: 1px solid #ccc; border-radius: 8px;'>{request.prompt}</div>",
+        "component_code": f"import React from 'react';\n\nconst Component = () => {{ return <div>{request.prompt}</div>; }};\n\nexport default Component;"
+    }
+
+async def _generate_component(request: ComponentRequest):
+    """
+    Genera un componente llamando a QWEN y aplicando las correcciones mínimas.
+    
+    Returns:
+        tuple: (respuesta del endpoint, si el resultado puede guardarse en caché)
+    """
+    try:
         # Llamar a QWEN API para generar el componente
-        response = await generate_qwen_response(messages)
+        response = await generate_qwen_response(_build_component_messages(request))
         
         # Agregar respuesta original de la API para debugging
         api_debug_info = {
@@ -146,13 +406,10 @@ Generate components that EXACTLY match the user's description and requirements.
             # Si hay error, crear un componente por defecto muy básico
             return {
                 "status": "success",
-                "component": {
-                    "visual_description": f"{request.platform.capitalize()} component: {request.prompt}",
-                    "preview_html": f"<div style='padding: 16px; border: 1px solid #ccc; border-radius: 8px;'>{request.prompt}</div>",
-                    "component_code": f"import React from 'react';\n\nconst Component = () => {{ return <div>{request.prompt}</div>; }};\n\nexport default Component;"
-                },
+                "component": _basic_fallback_component(request),
+                "source": "fallback",
                 "api_debug": api_debug_info  # Agregar la info de debug
-            }
+            }, False
         
         # Parsear la respuesta como JSON
         try:
@@ -163,58 +420,35 @@ Generate components that EXACTLY match the user's description and requirements.
                 component_data = json.loads(message_content)
             else:
                 component_data = message_content
-                
-            # Solo hacer formateo mínimo para evitar problemas de visualización
-            if "component_code" in component_data:
-                code = component_data["component_code"]
-                
-                # Verificación mínima: asegurar que hay algunas líneas y es un componente React válido
-                if not code.strip():
-                    code = f"import React from 'react';\n\nconst Component = () => {{ return <div>{request.prompt}</div>; }};\n\nexport default Component;"
-                elif 'import React' not in code:
-                    code = "import React from 'react';\n\n" + code
-                elif 'export default' not in code:
-                    # Solo extraer nombre del componente si no hay export default
-                    import re
-                    component_name = "Component"
-                    component_name_match = re.search(r'(?:function|const)\s+([A-Za-z0-9_]+)', code)
-                    if component_name_match:
-                        component_name = component_name_match.group(1)
-                    
-                    code += f"\n\nexport default {component_name};"
-                
-                component_data["component_code"] = code
-            
-            # Para preview_html: verificar si está vacío o no es HTML
-            if "preview_html" not in component_data or not component_data.get("preview_html", "").strip():
-                component_data["preview_html"] = f"<div style='padding: 16px; border: 1px solid #ccc; border-radius: 8px;'>{request.prompt}</div>"
             
-            # Para visual_description: asegurar que existe
-            if "visual_description" not in component_data:
-                component_data["visual_description"] = f"{request.platform.capitalize()} component: {request.prompt}"
+            # Corregir el componente con el pipeline de post-procesado de la plataforma
+            component_data, api_debug_info["pipeline"] = postprocess_component(
+                component_data, request.prompt, request.platform
+            )
             
+            # Los componentes de respaldo no se cachean para reintentar con el modelo
+            is_fallback = response.get("fallback", False)
             return {
                 "status": "success",
                 "component": component_data,
+                "source": "fallback" if is_fallback else "model",
                 "api_debug": api_debug_info  # Agregar la info de debug
-            }
+            }, not is_fallback
         except Exception as e:
-            print(f"Error en el router: {str(e)}")
+            logger.warning("Respuesta del modelo no utilizable: %s", e)
             
             # Fallback genérico simple
-            fallback_component = {
-                "visual_description": f"{request.platform.capitalize()} component: {request.prompt}",
-                "preview_html": f"<div style='padding: 16px; border: 1px solid #ccc; border-radius: 8px;'>{request.prompt}</div>",
-                "component_code": f"import React from 'react';\n\nconst Component = () => {{ return <div>{request.prompt}</div>; }};\n\nexport default Component;"
-            }
-            
             return {
                 "status": "success",
-                "component": fallback_component,
+                "component": _basic_fallback_component(request),
+                "source": "fallback",
                 "api_debug": api_debug_info  # Agregar la info de debug
-            }
+            }, False
+    except (LimiterRejected, DeadlineExceeded):
+        # 503 con Retry-After (ver app.main) o respuesta local al vencer el plazo
+        raise
     except Exception as e:
-        print(f"Excepción no capturada en generate_ui_component: {str(e)}")
+        logger.exception("Excepción no capturada en generate_ui_component")
         
         # Incluso en caso de excepción, devolver un componente simple en lugar de un error
         return {
@@ -224,5 +458,207 @@ Generate components that EXACTLY match the user's description and requirements.
                 "preview_html": f"<div>{request.prompt}</div>",
                 "component_code": f"import React from 'react';\n\nconst Component = () => {{ return <div>{request.prompt}</div>; }};\n\nexport default Component;"
             },
+            "source": "fallback",
             "api_debug": {"error": str(e)}  # Incluir información de error
-        } 
\ No newline at end of file
+        }, False
+
+# Campos del componente en el orden en que el cliente los necesita
+STREAMED_FIELDS = ("visual_description", "preview_html", "component_code")
+
+def _sse_event(event: str, data: Any) -> str:
+    """Serializa un evento en formato Server-Sent Events."""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+def _done_event(tracked: TrackedRequest, data: Dict[str, Any]) -> str:
+    """Evento 'done' final del flujo; anota su resultado en las métricas de la solicitud."""
+    tracked.outcome = _outcome(data)
+    return _sse_event("done", data)
+
+@router.post(
+    "/generate-component/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Generar componente UI (streaming)",
+    description="Genera un componente UI y envía cada campo por Server-Sent Events en cuanto está completo",
+    response_class=StreamingResponse
+)
+async def stream_ui_component(
+    request: ComponentRequest,
+    x_request_timeout: Optional[float] = Header(None, description="Plazo máximo en segundos para obtener la respuesta")
+):
+    """
+    Variante en streaming de /generate-component.
+    
+    Eventos emitidos:
+        visual_description, preview_html, component_code: valor del campo en cuanto
+            el modelo termina de generarlo
+        preview: componente de un prompt casi idéntico ya generado, enviado antes
+            de llamar al modelo (SIMILARITY_MODE=preview)
+        done: componente final ya corregido, con los indicadores 'cached' y 'source'
+        error: mensaje de error (seguido de 'done' con un componente de respaldo,
+            salvo si el limitador rechazó la llamada: entonces incluye 'retry_after'
+            y el flujo termina; si venció el plazo incluye 'deadline')
+    
+    Al desconectarse el cliente se cancela el flujo y con él la llamada al modelo.
+    """
+    return StreamingResponse(
+        _component_event_stream(request, request_timeout(x_request_timeout, request.timeout_seconds)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _component_event_stream(request: ComponentRequest, timeout: Optional[float]) -> AsyncIterator[str]:
+    # El plazo cuenta desde que empieza el flujo y se aplica a todas las llamadas que haga
+    with deadline_scope(timeout), track_request("stream", request.platform) as tracked:
+        async for event in _component_events(request, tracked):
+            yield event
+
+async def _component_events(request: ComponentRequest, tracked: TrackedRequest) -> AsyncIterator[str]:
+    template_response = _template_response(request)
+    if template_response is not None:
+        template_component = template_response["component"]
+        for field in STREAMED_FIELDS:
+            yield _sse_event(field, template_component.get(field, ""))
+        yield _done_event(tracked, {"status": "success", "component": template_component, "cached": False, "source": "template"})
+        return
+    
+    cache = get_result_cache()
+    cache_key = component_cache_key(request.prompt, request.platform)
+    
+    cached_component = await cache.get(cache_key)
+    if cached_component is not None:
+        for field in STREAMED_FIELDS:
+            yield _sse_event(field, cached_component.get(field, ""))
+        yield _done_event(tracked, {"status": "success", "component": cached_component, "cached": True, "source": "model"})
+        return
+    
+    similar = _similar_component(request)
+    if similar is not None:
+        if settings.SIMILARITY_MODE == "serve":
+            for field in STREAMED_FIELDS:
+                yield _sse_event(field, similar.value.get(field, ""))
+            yield _done_event(tracked, {
+                "status": "success",
+                "component": similar.value,
+                "cached": True,
+                "source": "model",
+                "similarity": _similarity_info(similar)
+            })
+            return
+        # En modo preview el cliente puede mostrarlo mientras se genera el componente real
+        yield _sse_event("preview", dict(_similarity_info(similar), component=similar.value))
+    
+    if get_upstream_breaker().is_open():
+        degraded = _degraded_response(request, similar, reason="circuit_open")
+        for field in STREAMED_FIELDS:
+            yield _sse_event(field, degraded["component"].get(field, ""))
+        yield _done_event(tracked, {
+            "status": "success",
+            "component": degraded["component"],
+            "cached": degraded.get("cached", False),
+            "source": degraded.get("source", "model")
+        })
+        return
+    
+    extractor = IncrementalJSONExtractor()
+    try:
+        async for chunk in stream_qwen_response(_build_component_messages(request)):
+            # Emitir cada campo en cuanto su valor está completo
+            for event in extractor.feed(chunk):
+                if event.kind != "field" or event.key not in STREAMED_FIELDS:
+                    continue
+                value = event.value
+                if event.key == "preview_html" and isinstance(value, str):
+                    value = clean_preview_html(value)
+                yield _sse_event(event.key, value)
+        
+        component_data = extractor.result
+        if component_data is None:
+            raise ValueError("No se encontró JSON válido en la respuesta")
+        component_data, _ = postprocess_component(component_data, request.prompt, request.platform)
+        await cache.set(cache_key, component_data)
+        get_similarity_index().add(cache_key, request.prompt, request.platform, component_data)
+        yield _done_event(tracked, {"status": "success", "component": component_data, "cached": False, "source": "model"})
+    except LimiterRejected as e:
+        tracked.outcome = "rejected"
+        yield _sse_event("error", {"message": str(e), "retry_after": e.retry_after})
+    except DeadlineExceeded as e:
+        yield _sse_event("error", {"message": str(e), "deadline": True})
+        degraded = _degraded_response(request, similar, reason="deadline")
+        yield _done_event(tracked, {
+            "status": "success",
+            "component": degraded["component"],
+            "cached": degraded.get("cached", False),
+            "source": degraded.get("source", "model")
+        })
+    except Exception as e:
+        logger.warning("Error en el streaming del componente: %s", e)
+        yield _sse_event("error", {"message": str(e)})
+        fallback_response = create_fallback_component(request.prompt)
+        yield _done_event(tracked, {
+            "status": "success",
+            "component": json.loads(fallback_response["message"]),
+            "cached": False,
+            "source": "fallback"
+        })
+
+@router.post(
+    "/generate-components",
+    status_code=status.HTTP_200_OK,
+    summary="Generar varios componentes UI",
+    description="Genera una lista de componentes en paralelo (hasta BATCH_MAX_CONCURRENCY a la vez) y envía cada resultado como una línea NDJSON en cuanto termina",
+    response_class=StreamingResponse
+)
+async def generate_ui_components(
+    requests: List[ComponentRequest] = Body(..., description="Solicitudes de componentes a generar"),
+    x_request_timeout: Optional[float] = Header(None, description="Plazo máximo en segundos para todo el lote")
+):
+    """
+    Variante por lotes de /generate-component.
+    
+    Cada línea de la respuesta es un objeto JSON con el índice de la solicitud
+    en el lote y su resultado, en el orden en que terminan (no en el de la lista).
+    Un error en un elemento no interrumpe el resto del lote. La cabecera
+    X-Request-Timeout limita todo el lote y timeout_seconds cada elemento.
+    """
+    if not requests:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="El lote no contiene solicitudes")
+    if len(requests) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"El lote admite como máximo {settings.BATCH_MAX_ITEMS} solicitudes"
+        )
+    return StreamingResponse(
+        _batch_result_stream(requests, request_timeout(x_request_timeout)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _batch_result_stream(requests: List[ComponentRequest], timeout: Optional[float]) -> AsyncIterator[str]:
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    
+    async def resolve(index: int, request: ComponentRequest) -> Dict[str, Any]:
+        async with semaphore:
+            with track_request("batch", request.platform) as tracked:
+                try:
+                    with deadline_scope(request.timeout_seconds):
+                        resolved = await _resolve_component(request)
+                    tracked.outcome = _outcome(resolved)
+                    result = _response_body(resolved, request)
+                except LimiterRejected as e:
+                    tracked.outcome = "rejected"
+                    result = {"status": "error", "error": str(e), "retry_after": e.retry_after}
+                except Exception as e:
+                    logger.exception("Error en el elemento %d del lote", index)
+                    result = {"status": "error", "error": str(e)}
+        return dict(result, index=index, prompt=request.prompt)
+    
+    # Las tareas heredan el plazo del lote al crearse
+    with deadline_scope(timeout):
+        tasks = [asyncio.ensure_future(resolve(index, request)) for index, request in enumerate(requests)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield orjson.dumps(await next_result) + b"\n"
+    finally:
+        # Si el cliente se desconecta, no seguir generando los componentes pendientes
+        for task in tasks:
+            task.cancel()
@@ -1,18 +1,48 @@
 import os
 import json
-import requests
-import aiohttp
 import asyncio
-from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional
-
-# Cargar variables de entorno
-load_dotenv()
-
-# Configuración de la API de QWEN
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from app.core.http_client import get_upstream_client
+from app.core.limiter import LimiterRejected, get_upstream_limiter
+from app.core.circuit_breaker import CircuitOpenError, get_upstream_breaker
+from app.core.deadline import DeadlineExceeded
+from app.core.log import lazy_json, payload_sampled
+from app.core.metrics import timed
+from app.core.resilience import get_upstream_resilience, is_retryable_error
+from app.core.cache import build_cache_key
+from app.core.config import settings
+from app.api.chat.json_extractor import IncrementalJSONExtractor, extract_json_object
+from app.api.chat.formatter import format_source
+from app.api.chat.templates import (
+    DEFAULT_COMPONENT_CODE,
+    FALLBACK_PREVIEW_HTML,
+    SHADCN_IMPORTS,
+    SHADCN_STYLES,
+    regular_styles,
+    render_dashboard,
+    render_page
+)
+from app.api.chat.classifier import confident_category, prompt_features
+
+logger = logging.getLogger(__name__)
+
+# Configuración de la API de QWEN (app.core.config ya ha cargado el .env)
 QWEN_API_KEY = os.getenv("QWEN_API_KEY")
 QWEN_API_BASE_URL = os.getenv("QWEN_API_BASE_URL", "https://api.qwen.ai/v1")
 
+# Modelo y parámetros enviados a QWEN (forman parte de la clave de caché)
+QWEN_MODEL = "qwen-max"
+QWEN_PARAMETERS = {
+    "result_format": "message",
+    "temperature": 0.7,
+    "max_tokens": 4000
+}
+
+# Versión de las plantillas de prompt; incrementarla invalida los resultados cacheados
+PROMPT_TEMPLATE_VERSION = "1"
+
 async def generate_chat_response(messages: List[Dict[str, str]], model: str = "qwen") -> Dict[str, Any]:
     """
     Genera una respuesta utilizando la API de QWEN o OpenAI según el modelo solicitado.
@@ -36,53 +66,48 @@ async def generate_chat_response(messages: List[Dict[str, str]], model: str = "q
             "message": "Solo se admite el modelo QWEN en esta configuración."
         }
 
-async def generate_qwen_response(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+def _prepare_qwen_request(messages: List[Dict[str, str]], stream: bool = False) -> Tuple[Optional[Dict[str, Any]], str]:
     """
-    Genera una respuesta de la API de QWEN basada en los mensajes proporcionados.
-    Devuelve directamente la respuesta de la API sin utilizar plantillas predefinidas.
+    Construye la URL, las cabeceras y el payload de una llamada a QWEN.
     
     Args:
         messages: Lista de mensajes en formato de chat para enviar a la API
+        stream: Si es True, solicita la salida incremental por Server-Sent Events
         
     Returns:
-        Dict[str, Any]: Respuesta de la API de QWEN o mensaje de error
+        Tuple: (petición con 'url', 'headers' y 'payload' o None si no hay API key, prompt del usuario)
     """
-    try:
-        # Cargar API Key desde variables de entorno
-        api_key = os.getenv("QWEN_API_KEY")
-        api_base_url = os.getenv("QWEN_API_BASE_URL") or "https://dashscope-intl.aliyuncs.com/api/v1"
-        
-        print(f"[DEBUG] Usando API key (primeros 5 chars): {api_key[:5] if api_key else 'None'}")
-        print(f"[DEBUG] URL base: {api_base_url}")
-        
-        if not api_key or api_key == "your_api_key_here":
-            print("[DEBUG] Error: API key no configurada")
-            return {
-                "status": "error",
-                "message": "API key de QWEN no configurada. Actualice el archivo .env con su clave."
-            }
-            
-        # URL para API de QWEN (asegurarnos de usar el endpoint correcto)
-        url = f"{api_base_url}/services/aigc/text-generation/generation"
-        
-        # Cabeceras para la solicitud - asegurarnos de que estén correctas
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-
-        # Extraer el prompt del usuario para el formateo específico
-        prompt_content = ""
-        for message in messages:
-            if message["role"] == "user":
-                prompt_content = message["content"]
-                break
-        
-        print(f"[DEBUG] Prompt original: {prompt_content[:100]}...")
+    # Extraer el prompt del usuario para el formateo específico
+    prompt_content = ""
+    for message in messages:
+        if message["role"] == "user":
+            prompt_content = message["content"]
+            break
+    
+    # Cargar API Key desde variables de entorno
+    api_key = os.getenv("QWEN_API_KEY")
+    api_base_url = os.getenv("QWEN_API_BASE_URL") or "https://dashscope-intl.aliyuncs.com/api/v1"
+    
+    logger.debug("URL base: %s", api_base_url)
+    
+    if not api_key or api_key == "your_api_key_here":
+        logger.warning("API key de QWEN no configurada")
+        return None, prompt_content
         
-        # Crear un prompt específico para generar componentes UI (simplificado)
-        formatted_prompt = f"""
+    # URL para API de QWEN (asegurarnos de usar el endpoint correcto)
+    url = f"{api_base_url}/services/aigc/text-generation/generation"
+    
+    # Cabeceras para la solicitud - asegurarnos de que estén correctas
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    
+    logger.debug("Prompt original: %.100s", prompt_content)
+    
+    # Crear un prompt específico para generar componentes UI (simplificado)
+    formatted_prompt = f"""
 Create a React component based on this description: "{prompt_content}".
 Return a JSON with:
 - visual_description: brief description
@@ -92,111 +117,223 @@ Return a JSON with:
 IMPORTANT: For the preview_html, ensure all styles are inline and DO NOT wrap the component in additional divs.
 The preview_html should ONLY contain the actual component HTML with NO extra container divs.
 """
+    
+    # Sistema message que enfatiza la generación de JSON
+    system_message = {
+        "role": "system", 
+        "content": "You are a UI component generator. Return a JSON with visual_description, preview_html, and component_code fields. Make sure the preview_html has all styles inline and is properly formatted. DO NOT wrap the component in extra divs."
+    }
+    
+    # Mensaje del usuario con el prompt formateado
+    user_message = {
+        "role": "user",
+        "content": formatted_prompt
+    }
+    
+    # Construir el JSON de la solicitud con los mensajes formateados
+    payload = {
+        "model": QWEN_MODEL,
+        "input": {
+            "messages": [system_message, user_message]
+        },
+        "parameters": dict(QWEN_PARAMETERS)
+    }
+    
+    if stream:
+        # Salida incremental: cada evento SSE trae solo el texto nuevo
+        headers["Accept"] = "text/event-stream"
+        headers["X-DashScope-SSE"] = "enable"
+        payload["parameters"]["incremental_output"] = True
+    
+    if payload_sampled(logger):
+        logger.debug("Payload: %s", lazy_json(payload, limit=200))
+    
+    return {"url": url, "headers": headers, "payload": payload}, prompt_content
+
+async def generate_qwen_response(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Genera una respuesta de la API de QWEN basada en los mensajes proporcionados.
+    Devuelve directamente la respuesta de la API sin utilizar plantillas predefinidas.
+    
+    Args:
+        messages: Lista de mensajes en formato de chat para enviar a la API
         
-        # Sistema message que enfatiza la generación de JSON
-        system_message = {
-            "role": "system", 
-            "content": "You are a UI component generator. Return a JSON with visual_description, preview_html, and component_code fields. Make sure the preview_html has all styles inline and is properly formatted. DO NOT wrap the component in extra divs."
-        }
-        
-        # Mensaje del usuario con el prompt formateado
-        user_message = {
-            "role": "user",
-            "content": formatted_prompt
-        }
-        
-        print("[DEBUG] Enviando mensaje a la API...")
+    Returns:
+        Dict[str, Any]: Respuesta de la API de QWEN o mensaje de error
         
-        # Construir el JSON de la solicitud con los mensajes formateados
-        payload = {
-            "model": "qwen-max",
-            "input": {
-                "messages": [system_message, user_message]
-            },
-            "parameters": {
-                "result_format": "message",
-                "temperature": 0.7,
-                "max_tokens": 4000
+    Raises:
+        LimiterRejected: Si el limitador de llamadas al proveedor está saturado
+        DeadlineExceeded: Si vence el plazo de la solicitud en curso
+    """
+    prompt_content = ""
+    try:
+        qwen_request, prompt_content = _prepare_qwen_request(messages)
+        if qwen_request is None:
+            return {
+                "status": "error",
+                "message": "API key de QWEN no configurada. Actualice el archivo .env con su clave."
             }
-        }
         
-        print(f"[DEBUG] Payload: {json.dumps(payload)[:200]}...")
+        logger.debug("Enviando mensaje a la API")
         
-        # Enviar la solicitud a la API de QWEN
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=headers, json=payload, timeout=120) as response:
-                    print(f"[DEBUG] Código de respuesta de API: {response.status}")
-                    
-                    response_text = await response.text()
-                    print(f"[DEBUG] Respuesta completa: {response_text[:500]}...")
+        # Enviar la solicitud a la API de QWEN usando el pool de conexiones compartido
+        async def send_request():
+            # El limitador acota las llamadas simultáneas. El circuito solo envuelve la
+            # llamada al proveedor, para que la espera en la cola del limitador no cuente
+            # como latencia del proveedor; con el circuito abierto se falla al instante
+            async with get_upstream_limiter().slot(ignore=(CircuitOpenError,)) as slot:
+                async with get_upstream_breaker().guard() as call:
+                    response = await get_upstream_client().post_json(
+                        qwen_request["url"], qwen_request["headers"], qwen_request["payload"]
+                    )
+                    if response["status"] == 429 or response["status"] >= 500:
+                        slot.mark_overloaded()
+                        call.mark_failed()
+                    return response
+        
+        try:
+            # Los fallos transitorios se reintentan y las llamadas lentas pueden duplicarse
+            response = await get_upstream_resilience().call(send_request)
+            logger.debug("Código de respuesta de API: %s", response["status"])
+            
+            response_text = response["text"]
+            if payload_sampled(logger):
+                logger.debug("Respuesta completa: %.500s", response_text)
+            
+            if response["status"] == 200:
+                try:
+                    response_json = json.loads(response_text)
                     
-                    if response.status == 200:
+                    # Intentar extraer el mensaje
+                    if "output" in response_json:
+                        output = response_json.get("output", {})
+                        if "message" in output:
+                            assistant_message = output.get("message", {}).get("content", "")
+                        elif "choices" in output and len(output["choices"]) > 0:
+                            assistant_message = output["choices"][0]["message"]["content"]
+                        else:
+                            logger.warning("No se encontró el mensaje en los formatos esperados")
+                            assistant_message = str(output)
+                        
+                        if payload_sampled(logger):
+                            logger.debug("Mensaje extraído: %.200s", assistant_message)
+                        
+                        # Intentar extraer el JSON del mensaje
                         try:
-                            response_json = json.loads(response_text)
-                            print(f"[DEBUG] Respuesta parseada: {str(response_json)[:200]}...")
-                            
-                            # Intentar extraer el mensaje
-                            if "output" in response_json:
-                                output = response_json.get("output", {})
-                                print(f"[DEBUG] Output: {str(output)[:200]}...")
-                                
-                                if "message" in output:
-                                    assistant_message = output.get("message", {}).get("content", "")
-                                elif "choices" in output and len(output["choices"]) > 0:
-                                    assistant_message = output["choices"][0]["message"]["content"]
-                                else:
-                                    print("[DEBUG] No se encontró el mensaje en los formatos esperados")
-                                    assistant_message = str(output)
-                                
-                                print(f"[DEBUG] Mensaje extraído: {assistant_message[:200]}...")
-                                
-                                # Intentar extraer el JSON del mensaje
-                                try:
-                                    # Buscar el contenido JSON dentro de los backticks
-                                    import re
-                                    json_match = re.search(r'```json\s*(.*?)\s*```', assistant_message, re.DOTALL)
-                                    if json_match:
-                                        json_content = json_match.group(1)
-                                        component_data = json.loads(json_content)
-                                        
-                                        # Asegurarse de que el HTML no tenga divs contenedores adicionales
-                                        if "preview_html" in component_data:
-                                            preview_html = component_data["preview_html"]
-                                            
-                                            # Eliminar cualquier div wrapper que solo contenga otro elemento
-                                            preview_html = re.sub(r'<div[^>]*>\s*(<[^>]+>[^<]*</[^>]+>)\s*</div>', r'\1', preview_html)
-                                            
-                                            # Si el HTML es solo texto, envolverlo en un elemento span
-                                            if not re.search(r'<[^>]+>', preview_html):
-                                                preview_html = f'<span style="display: inline-block; padding: 8px 16px; background-color: #f0f0f0; border-radius: 4px;">{preview_html}</span>'
-                                            
-                                            component_data["preview_html"] = preview_html
-                                        
-                                        return {
-                                            "status": "success",
-                                            "message": component_data
-                                        }
-                                    else:
-                                        raise ValueError("No se encontró JSON válido en la respuesta")
-                                except Exception as e:
-                                    print(f"[DEBUG] Error procesando JSON: {str(e)}")
-                                    return create_fallback_component(prompt_content)
+                            # Primer objeto JSON completo, dentro o fuera de un bloque ```json
+                            component_data = extract_json_object(assistant_message)
+                            if component_data is not None:
+                                return {
+                                    "status": "success",
+                                    "message": component_data
+                                }
                             else:
-                                return create_fallback_component(prompt_content)
+                                raise ValueError("No se encontró JSON válido en la respuesta")
                         except Exception as e:
-                            print(f"[DEBUG] Error procesando respuesta: {str(e)}")
+                            logger.warning("Error procesando JSON: %s", e)
                             return create_fallback_component(prompt_content)
                     else:
-                        print(f"[DEBUG] Error status: {response.status}")
                         return create_fallback_component(prompt_content)
-            except Exception as e:
-                print(f"[DEBUG] Excepción general: {str(e)}")
+                except Exception as e:
+                    logger.warning("Error procesando respuesta: %s", e)
+                    return create_fallback_component(prompt_content)
+            else:
+                logger.warning("QWEN respondió con estado %s", response["status"])
                 return create_fallback_component(prompt_content)
-    except Exception as e:
-        print(f"[DEBUG] Excepción general: {str(e)}")
+        except (LimiterRejected, DeadlineExceeded):
+            raise
+        except Exception as e:
+            logger.warning("Error en la llamada a QWEN: %r", e)
+            return create_fallback_component(prompt_content)
+    except (LimiterRejected, DeadlineExceeded):
+        # El rechazo por sobrecarga se responde con 503 y el fin del plazo lo resuelve
+        # el router; ninguno de los dos es un fallo del modelo
+        raise
+    except Exception:
+        logger.exception("Excepción no controlada al llamar a QWEN")
         return create_fallback_component(prompt_content)
 
+async def stream_qwen_response(messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+    """
+    Genera una respuesta de QWEN en modo incremental.
+    
+    Usa la salida incremental de DashScope (Server-Sent Events) y produce cada
+    fragmento de texto del modelo a medida que llega.
+    Los fallos transitorios se reintentan mientras no se haya recibido ningún
+    fragmento; después ya no, porque el cliente recibiría texto duplicado.
+    
+    Args:
+        messages: Lista de mensajes en formato de chat para enviar a la API
+        
+    Yields:
+        str: Fragmentos de texto generados por el modelo
+        
+    Raises:
+        ValueError: Si la API key de QWEN no está configurada
+        UpstreamStatusError: Si la API responde con un código distinto de 200
+        LimiterRejected: Si el limitador de llamadas al proveedor está saturado
+        CircuitOpenError: Si el circuito hacia el proveedor está abierto
+        DeadlineExceeded: Si vence el plazo de la solicitud en curso
+    """
+    qwen_request, _ = _prepare_qwen_request(messages, stream=True)
+    if qwen_request is None:
+        raise ValueError("API key de QWEN no configurada. Actualice el archivo .env con su clave.")
+    
+    resilience = get_upstream_resilience()
+    resilience.start_call()
+    attempt = 1
+    while True:
+        received = False
+        try:
+            # Las excepciones (incluidos los estados distintos de 200) cuentan como fallo
+            # para el circuito y el limitador; el circuito no cuenta la espera en la cola
+            async with get_upstream_limiter().slot(ignore=(CircuitOpenError,)), get_upstream_breaker().guard():
+                async for line in get_upstream_client().stream_lines(
+                    qwen_request["url"], qwen_request["headers"], qwen_request["payload"]
+                ):
+                    # Solo las líneas "data:" contienen la carga útil del evento
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        event = json.loads(line[5:])
+                    except ValueError:
+                        continue
+                    
+                    output = event.get("output") or {}
+                    if output.get("choices"):
+                        content = output["choices"][0].get("message", {}).get("content", "")
+                    else:
+                        content = output.get("text", "")
+                    
+                    if content:
+                        received = True
+                        yield content
+            return
+        except Exception as e:
+            # Solo se reintenta si el cliente aún no ha recibido ningún fragmento
+            delay = resilience.backoff(attempt)
+            if (received or not is_retryable_error(e) or attempt >= resilience.max_attempts
+                    or not resilience.fits_deadline(delay) or not resilience.allow_retry()):
+                raise
+        await asyncio.sleep(delay)
+        attempt += 1
+
+def clean_preview_html(preview_html: str) -> str:
+    """
+    Elimina los divs contenedores innecesarios del HTML de previsualización
+    y envuelve en un span el contenido que sea solo texto.
+    """
+    import re
+    
+    # Eliminar cualquier div wrapper que solo contenga otro elemento
+    preview_html = re.sub(r'<div[^>]*>\s*(<[^>]+>[^<]*</[^>]+>)\s*</div>', r'\1', preview_html)
+    
+    # Si el HTML es solo texto, envolverlo en un elemento span
+    if not re.search(r'<[^>]+>', preview_html):
+        preview_html = f'<span style="display: inline-block; padding: 8px 16px; background-color: #f0f0f0; border-radius: 4px;">{preview_html}</span>'
+    
+    return preview_html
+
 def extract_json_content(text: str) -> str:
     """
     Extrae el contenido JSON de un texto, buscando dentro de bloques de código markdown.
@@ -207,131 +344,34 @@ def extract_json_content(text: str) -> str:
     Returns:
         str: Contenido JSON extraído o cadena vacía si no se encuentra
     """
-    import re
-    
-    # Buscar JSON dentro de backticks (```json ... ```)
-    json_match = re.search(r'```(?:json)?\s*(\{[\s\S]+?\})\s*```', text)
-    if json_match:
-        return json_match.group(1)
-    
-    # Buscar cualquier objeto JSON que comienza con { y termina con }
-    json_match = re.search(r'(\{[\s\S]+?\})', text)
-    if json_match:
-        return json_match.group(1)
-    
-    return ""
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(text)
+    return extractor.raw or ""
 
-def process_component_data(json_content, prompt_content):
+@timed("process_component_data")
+def process_component_data(json_content, prompt_content, platform="web"):
     """
     Procesa y corrige los datos del componente para asegurar que tiene
     todos los campos necesarios y el formato correcto.
-    """
-    # Verificar campos requeridos
-    required_fields = ['visual_description', 'preview_html', 'component_code']
-    for field in required_fields:
-        if field not in json_content:
-            if field == 'visual_description':
-                json_content[field] = f"UI component based on: {prompt_content}"
-            elif field == 'preview_html':
-                json_content[field] = f'<div style="display: inline-flex; padding: 16px; border-radius: 8px;">{prompt_content}</div>'
-            elif field == 'component_code':
-                json_content[field] = create_default_component_code(prompt_content)
-    
-    # Procesar y mejorar el HTML de previsualización
-    if 'preview_html' in json_content:
-        preview_html = json_content['preview_html']
-        
-        # Si el preview_html es un string JSON, intentar extraer solo el HTML
-        if isinstance(preview_html, str) and ('"preview_html"' in preview_html or '```json' in preview_html):
-            try:
-                import re
-                # Intentar extraer el HTML del JSON
-                match = re.search(r'"preview_html":\s*"([^"]+)"', preview_html)
-                if match:
-                    preview_html = match.group(1).replace('\\\"', '"').replace('\\n', '\n')
-                else:
-                    # Si no se encuentra el patrón, buscar cualquier HTML válido
-                    html_match = re.search(r'<([a-z]+).*?>[\s\S]*?<\/\1>', preview_html, re.I)
-                    if html_match:
-                        preview_html = html_match.group(0)
-            except Exception as e:
-                print(f"Error processing preview_html: {str(e)}")
-                preview_html = f'<div style="display: inline-flex; padding: 16px; border-radius: 8px;">{prompt_content}</div>'
-        
-        # Asegurarse de que el componente use display: inline-flex para evitar espacios innecesarios
-        if not any(style in preview_html.lower() for style in ['display:', 'display: ']):
-            preview_html = preview_html.replace('<div', '<div style="display: inline-flex;"')
-        elif not any(display in preview_html.lower() for display in ['inline-flex', 'inline-block', 'flex']):
-            preview_html = preview_html.replace('display:', 'display: inline-flex;')
-        
-        # Eliminar cualquier div contenedor adicional que pueda causar espacios
-        preview_html = re.sub(r'<div[^>]*style="[^"]*display:\s*flex[^"]*"[^>]*>\s*(<div)', r'\1', preview_html)
-        
-        # Asegurarse de que no hay espacios en blanco innecesarios
-        preview_html = preview_html.strip()
-        
-        json_content['preview_html'] = preview_html
     
-    # Asegurarse de que el código del componente es completo y válido
-    if 'component_code' in json_content:
-        component_code = json_content['component_code']
-        
-        # Limpiar caracteres de escape
-        component_code = component_code.replace('\\n', '\n')
-        component_code = component_code.replace('\\\"', '"')
-        component_code = component_code.replace('\\\'', "'")
-        component_code = component_code.replace('\\/', '/')
-        
-        # Eliminar comentarios en línea problemáticos
-        component_code = component_code.replace('///', '//')
-        component_code = component_code.replace('\\/\\/', '//')
-        
-        # Si el código parece estar todo en una línea, intentar formatearlo
-        if '\n' not in component_code and '{' in component_code and '}' in component_code:
-            # Formatear el código utilizando reglas básicas
-            formatted_code = format_code(component_code)
-            if formatted_code:
-                component_code = formatted_code
-        
-        # Verificar y añadir importación de React
-        if 'import React' not in component_code:
-            component_code = "import React from 'react';\n\n" + component_code
-        
-        # Verificar y añadir export default
-        if 'export default' not in component_code:
-            # Extraer nombre del componente
-            import re
-            component_name = "Component"
-            component_name_match = re.search(r'(?:function|const)\s+([A-Za-z0-9_]+)', component_code)
-            if component_name_match:
-                component_name = component_name_match.group(1)
-            
-            component_code += f"\n\nexport default {component_name};"
-        
-        # Corregir problemas con JSX truncado
-        component_code = fix_jsx_code(component_code)
-        
-        # Limitar tamaño del código para evitar problemas de renderizado
-        if len(component_code) > 10000:
-            component_code = simplify_large_component(component_code, prompt_content)
-        
-        json_content['component_code'] = component_code
-    
-    # Verificar si el contenido es similar al prompt, lo que indica un error de renderización
-    if json_content.get('preview_html', '') == prompt_content or prompt_content in json_content.get('preview_html', ''):
-        # Si el preview muestra el texto del prompt en lugar de un componente, usar fallbacks específicos
-        if 'dashboard' in prompt_content.lower():
-            return create_dashboard_component(prompt_content)
-        elif 'footer' in prompt_content.lower():
-            return create_fallback_footer(prompt_content)
+    Ejecuta la secuencia completa de etapas de app.api.chat.pipeline,
+    incluidas las correcciones específicas por tipo de componente.
+    """
+    from app.api.chat.pipeline import full_pipeline
     
-    # Procesamiento específico según el tipo de componente
-    return handle_component_by_type(prompt_content, json_content)
+    component_data, _ = full_pipeline.run(json_content, prompt_content, platform)
+    return component_data
 
+@timed("format_code")
 def format_code(code):
     """
     Función avanzada para formatear código React/JSX que está mal estructurado o en una sola línea
+    
+    Con CODE_FORMATTER=tokenizer se usa el formateador de app/api/chat/formatter.py
+    (ver format_code_with_tokenizer)
     """
+    if settings.CODE_FORMATTER == "tokenizer":
+        return format_code_with_tokenizer(code)
     try:
         import re
         
@@ -403,10 +443,34 @@ def format_code(code):
         return general_format_code(code)
             
     except Exception as e:
-        print(f"Error en format_code avanzado: {str(e)}")
+        logger.warning("Error en format_code avanzado: %s", e)
         # Si falla el formateo avanzado, intentar con el básico
         return general_format_code(code)
 
+def format_code_with_tokenizer(code):
+    """
+    Formatea código React/JSX con el tokenizador de app/api/chat/formatter.py
+    
+    Indenta correctamente todo el componente (también las declaraciones antes del
+    return), pero tarda más que la cascada de expresiones regulares de format_code
+    """
+    try:
+        import re
+        
+        code = code.replace('\\n', '\n').replace('\\t', '    ')
+        formatted = format_source(code)
+        
+        # Añadir export default si es un componente React sin exportar
+        if 'import React' in formatted and 'export default' not in formatted:
+            component_match = re.search(r'(?:const|function)\s+([A-Z][A-Za-z0-9_]*)', formatted)
+            if component_match:
+                formatted += f"\n\nexport default {component_match.group(1)};"
+        
+        return formatted
+    except Exception as e:
+        logger.warning("Error en format_code_with_tokenizer: %s", e)
+        return code
+
 def general_format_code(code):
     """
     Función de formateo de código general, más simple pero robusta
@@ -419,13 +483,13 @@ def general_format_code(code):
         
         # Añadir saltos de línea después de ciertas estructuras
         code = re.sub(r'(import [^;]+;)', r'\1\n', code)  # Imports
-        code = re.sub(r'(const|let|var)\s+([^=]+)=', r'\n$1 $2 = ', code)  # Variables
+        code = re.sub(r'(const|let|var)\s+([^=]+)=', r'\n\1 \2 = ', code)  # Variables
         code = re.sub(r'({)', r'\1\n  ', code)  # Abrir llaves
         code = re.sub(r'(})', r'\n\1', code)  # Cerrar llaves
-        code = re.sub(r'(return\s*\()', r'\n$1\n  ', code)  # Return statements
-        code = re.sub(r'(;)', r'$1\n', code)  # Semicolons
-        code = re.sub(r'(<[a-zA-Z][^>]*>)([^<])', r'\1\n  $2', code)  # Opening JSX tags
-        code = re.sub(r'(</[a-zA-Z][^>]*>)', r'\n$1', code)  # Closing JSX tags
+        code = re.sub(r'(return\s*\()', r'\n\1\n  ', code)  # Return statements
+        code = re.sub(r'(;)', r'\1\n', code)  # Semicolons
+        code = re.sub(r'(<[a-zA-Z][^>]*>)([^<])', r'\1\n  \2', code)  # Opening JSX tags
+        code = re.sub(r'(</[a-zA-Z][^>]*>)', r'\n\1', code)  # Closing JSX tags
         
         # Arreglar anidamiento
         lines = code.split('\n')
@@ -450,7 +514,7 @@ def general_format_code(code):
         
         return '\n'.join(formatted_lines)
     except Exception as e:
-        print(f"Error en general_format_code: {str(e)}")
+        logger.warning("Error en general_format_code: %s", e)
         return code  # Devolver el código original si hay error
 
 def extract_jsx_content(return_statement):
@@ -517,7 +581,7 @@ def format_variables(vars_text):
     import re
     
     # Separar declaraciones
-    vars_text = re.sub(r'(const|let|var|useEffect|useState|useRef|useContext|useMemo|useCallback)(\s+[^;]+;)', r'\n  $1$2\n', vars_text)
+    vars_text = re.sub(r'(const|let|var|useEffect|useState|useRef|useContext|useMemo|useCallback)(\s+[^;]+;)', r'\n  \1\2\n', vars_text)
     
     # Formatear cada declaración
     lines = vars_text.split('\n')
@@ -585,10 +649,20 @@ const {component_name} = () => {{
 export default {component_name};
 """
 
+@timed("create_fallback_component")
 def create_fallback_component(prompt_content):
     """
     Crea un componente de respaldo cuando la API falla o tarda demasiado.
     """
+    return {
+        "status": "success",
+        "message": _fallback_component_message(prompt_content),
+        "fallback": True
+    }
+
+@lru_cache(maxsize=256)
+def _fallback_component_message(prompt_content):
+    # El mismo prompt suele repetirse mientras QWEN está lento: se serializa una sola vez
     component_name = "".join(word.capitalize() for word in prompt_content.split()[:2])
     if not component_name or not component_name[0].isalpha():
         component_name = "UIComponent"
@@ -611,7 +685,7 @@ def create_fallback_component(prompt_content):
         text_color = "#000000"
     
     # Generar HTML simple sin divs contenedores adicionales
-    preview_html = f'<span style="display: inline-block; padding: 12px 24px; background-color: {bg_color}; color: {text_color}; border-radius: 8px; font-family: Arial, sans-serif;">This is a {prompt_content}</span>'
+    preview_html = FALLBACK_PREVIEW_HTML.render(bg_color=bg_color, text_color=text_color, prompt_content=prompt_content)
     
     component = {
         "visual_description": f"A UI component for: {prompt_content}",
@@ -619,10 +693,28 @@ def create_fallback_component(prompt_content):
         "component_code": create_default_component_code(prompt_content, component_name)
     }
     
-    return {
-        "status": "success",
-        "message": json.dumps(component)
-    }
+    return json.dumps(component)
+
+def component_cache_key(prompt: str, platform: str) -> str:
+    """
+    Calcula la clave de caché de un componente a partir del prompt normalizado,
+    la plataforma, los parámetros del modelo y la versión de las plantillas.
+    
+    Args:
+        prompt: Descripción del componente tal como la envió el cliente
+        platform: Plataforma objetivo (web o mobile)
+        
+    Returns:
+        str: Hash hexadecimal que identifica el resultado
+    """
+    normalized_prompt = " ".join(prompt.split()).casefold()
+    return build_cache_key(
+        normalized_prompt,
+        platform.strip().lower(),
+        QWEN_MODEL,
+        QWEN_PARAMETERS,
+        PROMPT_TEMPLATE_VERSION
+    )
 
 def create_default_component_code(prompt_content, component_name=None):
     """
@@ -633,66 +725,7 @@ def create_default_component_code(prompt_content, component_name=None):
         if not component_name or not component_name[0].isalpha():
             component_name = "UIComponent"
     
-    return f"""import React from 'react';
-
-const {component_name} = () => {{
-  // Styles for the component
-  const containerStyle = {{
-    border: '1px solid #e0e0e0',
-    borderRadius: '8px',
-    padding: '16px',
-    maxWidth: '100%',
-    boxShadow: '0 2px 4px rgba(0,0,0,0.1)',
-    fontFamily: 'Arial, sans-serif'
-  }};
-
-  const headerStyle = {{
-    fontSize: '18px',
-    fontWeight: 'bold',
-    marginBottom: '8px',
-    color: '#333'
-  }};
-
-  const actionAreaStyle = {{
-    backgroundColor: '#f5f5f5',
-    padding: '12px',
-    borderRadius: '4px',
-    marginTop: '12px'
-  }};
-
-  const buttonStyle = {{
-    backgroundColor: '#4f46e5',
-    color: 'white',
-    border: 'none',
-    padding: '8px 16px',
-    borderRadius: '4px',
-    cursor: 'pointer',
-    transition: 'background-color 0.3s'
-  }};
-
-  return (
-    <div style={{containerStyle}}>
-      <div style={{headerStyle}}>{prompt_content}</div>
-      <p>Generated component based on your description</p>
-      <div style={{actionAreaStyle}}>
-        <button 
-          style={{buttonStyle}}
-          onMouseOver={{(e) => {{
-            e.currentTarget.style.backgroundColor = '#3c35b5';
-          }}}}
-          onMouseOut={{(e) => {{
-            e.currentTarget.style.backgroundColor = '#4f46e5';
-          }}}}
-        >
-          Send
-        </button>
-      </div>
-    </div>
-  );
-}};
-
-export default {component_name};
-"""
+    return DEFAULT_COMPONENT_CODE.render(component_name=component_name, prompt_content=prompt_content)
 
 def fix_preview_images(html, prompt_content):
     """
@@ -744,6 +777,7 @@ def fix_preview_images(html, prompt_content):
     
     return html
 
+@timed("fix_jsx_code")
 def fix_jsx_code(code):
     """
     Corrige problemas comunes en el código JSX que podrían causar truncamiento
@@ -769,6 +803,7 @@ def fix_jsx_code(code):
     
     return code 
 
+@timed("create_fallback_footer")
 def create_fallback_footer(prompt_content):
     """
     Crea un componente de footer de respaldo que contiene iconos de redes sociales
@@ -961,849 +996,75 @@ export default {component_name};
     
     return footer_code 
 
+def format_dashboard_component(code, prompt_content):
+    """
+    Formateo específico para componentes de tipo dashboard. Solo se reformatea
+    el código que llega en una sola línea; el resto se deja como está.
+    """
+    if '\n' not in code.strip():
+        return format_code(code)
+    return code
+
+@timed("create_dashboard_component")
 def create_dashboard_component(prompt_content):
     """
     Crea un componente de dashboard específico basado en el prompt del usuario.
     Analiza el prompt para identificar requisitos específicos como orientación,
     colores, y frameworks UI.
     """
-    # Analizar el prompt para personalizar el dashboard
-    prompt_lower = prompt_content.lower()
-    
-    # Determinar la orientación (vertical/horizontal)
-    is_vertical = any(keyword in prompt_lower for keyword in ['vertical', 'column', 'left', 'side', 'sidebar'])
-    
-    # Determinar el esquema de color
-    is_dark = any(keyword in prompt_lower for keyword in ['dark', 'black', 'night'])
-    
-    # Verificar si se solicita un framework específico
-    uses_shadcn = 'shadcn' in prompt_lower
+    # Analizar el prompt para personalizar el dashboard: orientación, colores y framework
+    features = prompt_features(prompt_content)
+    is_dark = 'dark' in features
+    uses_shadcn = 'shadcn' in features
     
     # Crear el HTML y código adecuados según las especificaciones
-    if is_vertical:
+    if 'vertical' in features:
         return create_vertical_dashboard(prompt_content, is_dark, uses_shadcn)
     else:
         return create_horizontal_dashboard(prompt_content, is_dark, uses_shadcn)
 
+@timed("create_template_component")
+def create_template_component(category, prompt_content):
+    """
+    Crea un componente completo a partir de la plantilla de una categoría
+    (dashboard, footer, profile, settings o checkout) sin llamar al modelo.
+    """
+    if category == 'dashboard':
+        return create_dashboard_component(prompt_content)
+    if category == 'footer':
+        return create_fallback_footer(prompt_content)
+    return render_page(category, prompt_content, 'dark' in prompt_features(prompt_content))
+
 def create_vertical_dashboard(prompt_content, is_dark=True, uses_shadcn=False):
     """
     Crea un dashboard con diseño vertical (sidebar) según las especificaciones
     """
-    # Colores según el tema
-    if is_dark:
-        bg_color = "#0f172a"        # Negro azulado oscuro para el fondo
-        sidebar_color = "#1e293b"   # Azul oscuro para la barra lateral
-        text_color = "#f8fafc"      # Blanco para texto
-        accent_color = "#3b82f6"    # Azul para acentos
-        card_color = "#334155"      # Gris azulado para tarjetas
-        icon_color = "#94a3b8"      # Gris claro para iconos
-    else:
-        bg_color = "#f8fafc"        # Blanco para el fondo
-        sidebar_color = "#f1f5f9"   # Gris muy claro para la barra lateral
-        text_color = "#0f172a"      # Negro para texto
-        accent_color = "#3b82f6"    # Azul para acentos
-        card_color = "#e2e8f0"      # Gris claro para tarjetas
-        icon_color = "#64748b"      # Gris para iconos
-    
-    # Estilo general según el framework
-    if uses_shadcn:
-        border_radius = "0.75rem"   # Más redondeado para Shadcn
-        button_style = "border-radius: 0.5rem; font-weight: 500; transition: all 0.2s;"
-        font_family = "'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif"
-    else:
-        border_radius = "0.5rem"    # Estándar
-        button_style = "border-radius: 0.375rem; font-weight: 400;"
-        font_family = "Arial, sans-serif"
-
-    dashboard_html = f"""
-<div style="display: flex; width: 100%; height: 100vh; font-family: {font_family}; background-color: {bg_color}; color: {text_color};">
-  <!-- Sidebar -->
-  <div style="width: 280px; background-color: {sidebar_color}; padding: 24px 16px; display: flex; flex-direction: column; border-right: 1px solid {card_color};">
-    <!-- Logo / Title -->
-    <div style="font-size: 24px; font-weight: bold; margin-bottom: 32px; padding-left: 12px;">Dashboard</div>
-    
-    <!-- Navigation -->
-    <nav style="display: flex; flex-direction: column; gap: 8px; margin-bottom: 32px;">
-      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; background-color: {accent_color}; border-radius: {border_radius}; color: white; text-decoration: none; {button_style}">
-        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">📊</span>
-        <span>Overview</span>
-      </a>
-      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: {text_color}; text-decoration: none; border-radius: {border_radius}; {button_style}">
-        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">👥</span>
-        <span>Usuarios</span>
-      </a>
-      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: {text_color}; text-decoration: none; border-radius: {border_radius}; {button_style}">
-        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">💰</span>
-        <span>Ingresos</span>
-      </a>
-      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: {text_color}; text-decoration: none; border-radius: {border_radius}; {button_style}">
-        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">📈</span>
-        <span>Análisis</span>
-      </a>
-      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: {text_color}; text-decoration: none; border-radius: {border_radius}; {button_style}">
-        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">⚙️</span>
-        <span>Configuración</span>
-      </a>
-    </nav>
-    
-    <!-- Recent Items Section -->
-    <div style="margin-top: auto; padding-top: 24px; border-top: 1px solid {card_color};">
-      <div style="font-size: 14px; font-weight: bold; margin-bottom: 12px; padding-left: 12px; color: {icon_color};">RECIENTES</div>
-      <div style="display: flex; flex-direction: column; gap: 8px;">
-        <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 8px 12px; color: {text_color}; text-decoration: none; font-size: 14px;">
-          <span>Botón de Login</span>
-        </a>
-        <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 8px 12px; color: {text_color}; text-decoration: none; font-size: 14px;">
-          <span>Formulario de contacto</span>
-        </a>
-        <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 8px 12px; color: {text_color}; text-decoration: none; font-size: 14px;">
-          <span>Galería de imágenes</span>
-        </a>
-      </div>
-    </div>
-  </div>
-
-  <!-- Main Content (placeholder) -->
-  <div style="flex: 1; padding: 24px; overflow-y: auto;">
-    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 24px;">
-      <h1 style="font-size: 24px; font-weight: bold;">Overview</h1>
-      <div style="display: flex; gap: 12px;">
-        <button style="background-color: {accent_color}; color: white; border: none; padding: 8px 16px; border-radius: {border_radius}; cursor: pointer; {button_style}">Nuevo</button>
-        <button style="background-color: transparent; border: 1px solid {card_color}; color: {text_color}; padding: 8px 16px; border-radius: {border_radius}; cursor: pointer; {button_style}">Filtrar</button>
-      </div>
-    </div>
-    
-    <!-- Stats cards -->
-    <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(240px, 1fr)); gap: 24px; margin-bottom: 24px;">
-      <div style="background-color: {card_color}; border-radius: {border_radius}; padding: 20px;">
-        <div style="font-size: 14px; color: {icon_color};">Usuarios</div>
-        <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">1,248</div>
-        <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 12% este mes</div>
-      </div>
-      
-      <div style="background-color: {card_color}; border-radius: {border_radius}; padding: 20px;">
-        <div style="font-size: 14px; color: {icon_color};">Ingresos</div>
-        <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">$48.5k</div>
-        <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 8% este mes</div>
-      </div>
-      
-      <div style="background-color: {card_color}; border-radius: {border_radius}; padding: 20px;">
-        <div style="font-size: 14px; color: {icon_color};">Tráfico</div>
-        <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">12.4k</div>
-        <div style="font-size: 12px; color: #ef4444; margin-top: 8px;">↓ 3% este mes</div>
-      </div>
-    </div>
-  </div>
-</div>
-"""
-
-    # Código React correspondiente
-    dashboard_code = f"""import React from 'react';
-{generate_shadcn_imports() if uses_shadcn else ''}
-
-const Dashboard = () => {{
-  {generate_shadcn_shadcn_styles() if uses_shadcn else generate_regular_styles(is_dark)}
-
-  return (
-    <div style={{containerStyle}}>
-      {{/* Sidebar */}}
-      <div style={{sidebarStyle}}>
-        {{/* Logo / Title */}}
-        <div style={{titleStyle}}>Dashboard</div>
-        
-        {{/* Navigation */}}
-        <nav style={{navStyle}}>
-          <a href="#" style={{{{...navItemStyle, ...activeNavItemStyle}}}}>
-            <span style={{iconStyle}}>📊</span>
-            <span>Overview</span>
-          </a>
-          <a href="#" style={{navItemStyle}}>
-            <span style={{iconStyle}}>👥</span>
-            <span>Usuarios</span>
-          </a>
-          <a href="#" style={{navItemStyle}}>
-            <span style={{iconStyle}}>💰</span>
-            <span>Ingresos</span>
-          </a>
-          <a href="#" style={{navItemStyle}}>
-            <span style={{iconStyle}}>📈</span>
-            <span>Análisis</span>
-          </a>
-          <a href="#" style={{navItemStyle}}>
-            <span style={{iconStyle}}>⚙️</span>
-            <span>Configuración</span>
-          </a>
-        </nav>
-        
-        {{/* Recent Items Section */}}
-        <div style={{recentSectionStyle}}>
-          <div style={{recentHeaderStyle}}>RECIENTES</div>
-          <div style={{recentListStyle}}>
-            <a href="#" style={{recentItemStyle}}>
-              <span>Botón de Login</span>
-            </a>
-            <a href="#" style={{recentItemStyle}}>
-              <span>Formulario de contacto</span>
-            </a>
-            <a href="#" style={{recentItemStyle}}>
-              <span>Galería de imágenes</span>
-            </a>
-          </div>
-        </div>
-      </div>
-
-      {{/* Main Content */}}
-      <div style={{mainContentStyle}}>
-        <div style={{headerStyle}}>
-          <h1 style={{headerTitleStyle}}>Overview</h1>
-          <div style={{buttonContainerStyle}}>
-            <button style={{primaryButtonStyle}}>Nuevo</button>
-            <button style={{secondaryButtonStyle}}>Filtrar</button>
-          </div>
-        </div>
-        
-        {{/* Stats cards */}}
-        <div style={{cardsContainerStyle}}>
-          <div style={{cardStyle}}>
-            <div style={{cardLabelStyle}}>Usuarios</div>
-            <div style={{cardValueStyle}}>1,248</div>
-            <div style={{positiveChangeStyle}}>↑ 12% este mes</div>
-          </div>
-          
-          <div style={{cardStyle}}>
-            <div style={{cardLabelStyle}}>Ingresos</div>
-            <div style={{cardValueStyle}}>$48.5k</div>
-            <div style={{positiveChangeStyle}}>↑ 8% este mes</div>
-          </div>
-          
-          <div style={{cardStyle}}>
-            <div style={{cardLabelStyle}}>Tráfico</div>
-            <div style={{cardValueStyle}}>12.4k</div>
-            <div style={{negativeChangeStyle}}>↓ 3% este mes</div>
-          </div>
-        </div>
-      </div>
-    </div>
-  );
-}};
-
-export default Dashboard;
-"""
-
-    return {
-        "visual_description": f"A vertical sidebar dashboard with dark theme: {prompt_content}",
-        "preview_html": dashboard_html,
-        "component_code": dashboard_code
-    }
+    return render_dashboard("vertical", prompt_content, is_dark, uses_shadcn)
 
 def create_horizontal_dashboard(prompt_content, is_dark=True, uses_shadcn=False):
     """
     Crea un dashboard con diseño horizontal según las especificaciones
     """
-    # Usar el componente actual por defecto
-    dashboard_html = f"""
-<div style="background-color: #1e293b; border-radius: 8px; padding: 20px; color: white; width: 100%; font-family: Arial, sans-serif;">
-  <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
-    <div style="font-size: 24px; font-weight: bold;">Dashboard</div>
-    <div style="display: flex; gap: 10px;">
-      <button style="background-color: #3b82f6; border: none; color: white; padding: 8px 16px; border-radius: 4px; cursor: pointer;">Nuevo</button>
-      <button style="background-color: transparent; border: 1px solid #64748b; color: white; padding: 8px 16px; border-radius: 4px; cursor: pointer;">Filtrar</button>
-    </div>
-  </div>
-  
-  <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); gap: 16px; margin-bottom: 24px;">
-    <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px;">
-      <div style="font-size: 14px; color: #94a3b8;">Usuarios</div>
-      <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">1,248</div>
-      <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 12% este mes</div>
-    </div>
-    
-    <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px;">
-      <div style="font-size: 14px; color: #94a3b8;">Ingresos</div>
-      <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">$48.5k</div>
-      <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 8% este mes</div>
-    </div>
-    
-    <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px;">
-      <div style="font-size: 14px; color: #94a3b8;">Tráfico</div>
-      <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">12.4k</div>
-      <div style="font-size: 12px; color: #ef4444; margin-top: 8px;">↓ 3% este mes</div>
-    </div>
-  </div>
-  
-  <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px; margin-bottom: 20px;">
-    <div style="font-size: 16px; font-weight: bold; margin-bottom: 16px;">Componentes recientes</div>
-    <div style="display: flex; flex-direction: column; gap: 8px;">
-      <a href="#" style="display: flex; justify-content: space-between; padding: 12px; background-color: #374151; border-radius: 4px; text-decoration: none; color: white;">
-        <span>Botón de Login</span>
-        <span style="color: #94a3b8;">→</span>
-      </a>
-      <a href="#" style="display: flex; justify-content: space-between; padding: 12px; background-color: #374151; border-radius: 4px; text-decoration: none; color: white;">
-        <span>Formulario de contacto</span>
-        <span style="color: #94a3b8;">→</span>
-      </a>
-      <a href="#" style="display: flex; justify-content: space-between; padding: 12px; background-color: #374151; border-radius: 4px; text-decoration: none; color: white;">
-        <span>Galería de imágenes</span>
-        <span style="color: #94a3b8;">→</span>
-      </a>
-    </div>
-  </div>
-</div>
-"""
-
-    # Código React correspondiente
-    dashboard_code = """import React from 'react';
-import { IconUsers, IconCurrencyDollar, IconChartBar, IconArrowUp, IconArrowDown } from './icons';
-
-const Dashboard = () => {
-  // Estilos para el dashboard
-  const dashboardStyle = {
-    backgroundColor: '#1e293b',
-    borderRadius: '8px',
-    padding: '20px',
-    color: 'white',
-    width: '100%',
-    fontFamily: 'Arial, sans-serif'
-  };
-
-  const headerStyle = {
-    display: 'flex',
-    justifyContent: 'space-between',
-    alignItems: 'center',
-    marginBottom: '20px'
-  };
-
-  const titleStyle = {
-    fontSize: '24px',
-    fontWeight: 'bold'
-  };
-
-  const buttonContainerStyle = {
-    display: 'flex',
-    gap: '10px'
-  };
-
-  const primaryButtonStyle = {
-    backgroundColor: '#3b82f6',
-    border: 'none',
-    color: 'white',
-    padding: '8px 16px',
-    borderRadius: '4px',
-    cursor: 'pointer'
-  };
-
-  const secondaryButtonStyle = {
-    backgroundColor: 'transparent',
-    border: '1px solid #64748b',
-    color: 'white',
-    padding: '8px 16px',
-    borderRadius: '4px',
-    cursor: 'pointer'
-  };
-
-  const cardsContainerStyle = {
-    display: 'grid',
-    gridTemplateColumns: 'repeat(auto-fill, minmax(200px, 1fr))',
-    gap: '16px',
-    marginBottom: '24px'
-  };
-
-  const cardStyle = {
-    backgroundColor: '#2c3e50',
-    borderRadius: '8px',
-    padding: '16px'
-  };
-
-  const cardLabelStyle = {
-    fontSize: '14px',
-    color: '#94a3b8'
-  };
-
-  const cardValueStyle = {
-    fontSize: '28px',
-    fontWeight: 'bold',
-    marginTop: '8px'
-  };
-
-  const positiveChangeStyle = {
-    fontSize: '12px',
-    color: '#4ade80',
-    marginTop: '8px',
-    display: 'flex',
-    alignItems: 'center'
-  };
-
-  const negativeChangeStyle = {
-    fontSize: '12px',
-    color: '#ef4444',
-    marginTop: '8px',
-    display: 'flex',
-    alignItems: 'center'
-  };
-
-  const contentBoxStyle = {
-    backgroundColor: '#2c3e50',
-    borderRadius: '8px',
-    padding: '16px',
-    marginBottom: '20px'
-  };
-
-  const contentTitleStyle = {
-    fontSize: '16px',
-    fontWeight: 'bold',
-    marginBottom: '16px'
-  };
-
-  const itemListStyle = {
-    display: 'flex',
-    flexDirection: 'column',
-    gap: '8px'
-  };
-
-  const itemStyle = {
-    display: 'flex',
-    justifyContent: 'space-between',
-    padding: '12px',
-    backgroundColor: '#374151',
-    borderRadius: '4px',
-    textDecoration: 'none',
-    color: 'white'
-  };
-
-  const itemIconStyle = {
-    color: '#94a3b8'
-  };
-
-  // Datos para las tarjetas
-  const cardData = [
-    { label: 'Usuarios', value: '1,248', change: '+12%', positive: true, icon: <IconUsers /> },
-    { label: 'Ingresos', value: '$48.5k', change: '+8%', positive: true, icon: <IconCurrencyDollar /> },
-    { label: 'Tráfico', value: '12.4k', change: '-3%', positive: false, icon: <IconChartBar /> }
-  ];
-
-  // Datos para los componentes recientes
-  const recentComponents = [
-    { name: 'Botón de Login', url: '#' },
-    { name: 'Formulario de contacto', url: '#' },
-    { name: 'Galería de imágenes', url: '#' }
-  ];
-
-  return (
-    <div style={dashboardStyle}>
-      {/* Header */}
-      <div style={headerStyle}>
-        <div style={titleStyle}>Dashboard</div>
-        <div style={buttonContainerStyle}>
-          <button style={primaryButtonStyle}>Nuevo</button>
-          <button style={secondaryButtonStyle}>Filtrar</button>
-        </div>
-      </div>
-      
-      {/* Tarjetas de estadísticas */}
-      <div style={cardsContainerStyle}>
-        {cardData.map((card, index) => (
-          <div key={index} style={cardStyle}>
-            <div style={cardLabelStyle}>{card.label}</div>
-            <div style={cardValueStyle}>{card.value}</div>
-            <div style={card.positive ? positiveChangeStyle : negativeChangeStyle}>
-              {card.positive ? <IconArrowUp /> : <IconArrowDown />} {card.change} este mes
-            </div>
-          </div>
-        ))}
-      </div>
-      
-      {/* Lista de componentes recientes */}
-      <div style={contentBoxStyle}>
-        <div style={contentTitleStyle}>Componentes recientes</div>
-        <div style={itemListStyle}>
-          {recentComponents.map((component, index) => (
-            <a key={index} href={component.url} style={itemStyle}>
-              <span>{component.name}</span>
-              <span style={itemIconStyle}>→</span>
-            </a>
-          ))}
-        </div>
-      </div>
-    </div>
-  );
-};
-
-export default Dashboard;
-"""
-
-    return {
-        "visual_description": f"A horizontal dashboard with stats cards and components list: {prompt_content}",
-        "preview_html": dashboard_html,
-        "component_code": dashboard_code
-    }
+    return render_dashboard("horizontal", prompt_content, is_dark, uses_shadcn)
 
 def generate_shadcn_imports():
-    return """import {
-  Card,
-  CardContent,
-  CardDescription,
-  CardHeader,
-  CardTitle,
-} from "./ui/card";
-import { Button } from "./ui/button";
-import { BarChart, Clock, Home, Settings, Users } from "lucide-react";
-"""
+    return SHADCN_IMPORTS
 
 def generate_shadcn_shadcn_styles():
-    return """
-  // Estilos para el dashboard con Shadcn UI
-  const containerStyle = {
-    display: 'flex',
-    width: '100%',
-    height: '100vh',
-    fontFamily: "'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif",
-    backgroundColor: '#0f172a',
-    color: '#f8fafc'
-  };
-
-  const sidebarStyle = {
-    width: '280px',
-    backgroundColor: '#1e293b',
-    padding: '24px 16px',
-    display: 'flex',
-    flexDirection: 'column',
-    borderRight: '1px solid #334155'
-  };
-
-  const titleStyle = {
-    fontSize: '24px',
-    fontWeight: 'bold',
-    marginBottom: '32px',
-    paddingLeft: '12px'
-  };
-
-  const navStyle = {
-    display: 'flex',
-    flexDirection: 'column',
-    gap: '8px',
-    marginBottom: '32px'
-  };
-
-  const navItemStyle = {
-    display: 'flex',
-    alignItems: 'center',
-    gap: '12px',
-    padding: '10px 12px',
-    color: '#f8fafc',
-    textDecoration: 'none',
-    borderRadius: '0.75rem',
-    fontWeight: '500',
-    transition: 'all 0.2s'
-  };
-
-  const activeNavItemStyle = {
-    backgroundColor: '#3b82f6',
-    color: 'white'
-  };
-
-  const iconStyle = {
-    width: '20px',
-    height: '20px',
-    display: 'inline-flex',
-    alignItems: 'center',
-    justifyContent: 'center'
-  };
-
-  const recentSectionStyle = {
-    marginTop: 'auto',
-    paddingTop: '24px',
-    borderTop: '1px solid #334155'
-  };
-
-  const recentHeaderStyle = {
-    fontSize: '14px',
-    fontWeight: 'bold',
-    marginBottom: '12px',
-    paddingLeft: '12px',
-    color: '#94a3b8'
-  };
-
-  const recentListStyle = {
-    display: 'flex',
-    flexDirection: 'column',
-    gap: '8px'
-  };
-
-  const recentItemStyle = {
-    display: 'flex',
-    alignItems: 'center',
-    gap: '12px',
-    padding: '8px 12px',
-    color: '#f8fafc',
-    textDecoration: 'none',
-    fontSize: '14px'
-  };
-
-  const mainContentStyle = {
-    flex: 1,
-    padding: '24px',
-    overflowY: 'auto'
-  };
-
-  const headerStyle = {
-    display: 'flex',
-    justifyContent: 'space-between',
-    alignItems: 'center',
-    marginBottom: '24px'
-  };
-
-  const headerTitleStyle = {
-    fontSize: '24px',
-    fontWeight: 'bold'
-  };
-
-  const buttonContainerStyle = {
-    display: 'flex',
-    gap: '12px'
-  };
-
-  const primaryButtonStyle = {
-    backgroundColor: '#3b82f6',
-    color: 'white',
-    border: 'none',
-    padding: '8px 16px',
-    borderRadius: '0.75rem',
-    cursor: 'pointer',
-    fontWeight: '500',
-    transition: 'all 0.2s'
-  };
-
-  const secondaryButtonStyle = {
-    backgroundColor: 'transparent',
-    border: '1px solid #334155',
-    color: '#f8fafc',
-    padding: '8px 16px',
-    borderRadius: '0.75rem',
-    cursor: 'pointer',
-    fontWeight: '500',
-    transition: 'all 0.2s'
-  };
-
-  const cardsContainerStyle = {
-    display: 'grid',
-    gridTemplateColumns: 'repeat(auto-fill, minmax(240px, 1fr))',
-    gap: '24px',
-    marginBottom: '24px'
-  };
-
-  const cardStyle = {
-    backgroundColor: '#334155',
-    borderRadius: '0.75rem',
-    padding: '20px'
-  };
-
-  const cardLabelStyle = {
-    fontSize: '14px',
-    color: '#94a3b8'
-  };
-
-  const cardValueStyle = {
-    fontSize: '28px',
-    fontWeight: 'bold',
-    marginTop: '8px'
-  };
-
-  const positiveChangeStyle = {
-    fontSize: '12px',
-    color: '#4ade80',
-    marginTop: '8px'
-  };
-
-  const negativeChangeStyle = {
-    fontSize: '12px',
-    color: '#ef4444',
-    marginTop: '8px'
-  };
-"""
+    return SHADCN_STYLES
 
 def generate_regular_styles(is_dark=True):
-    bg_color = "#0f172a" if is_dark else "#f8fafc"        
-    sidebar_color = "#1e293b" if is_dark else "#f1f5f9"   
-    text_color = "#f8fafc" if is_dark else "#0f172a"      
-    accent_color = "#3b82f6"    
-    card_color = "#334155" if is_dark else "#e2e8f0"      
-    icon_color = "#94a3b8" if is_dark else "#64748b"      
-    
-    return f"""
-  // Estilos para el dashboard
-  const containerStyle = {{
-    display: 'flex',
-    width: '100%',
-    height: '100vh',
-    fontFamily: 'Arial, sans-serif',
-    backgroundColor: '{bg_color}',
-    color: '{text_color}'
-  }};
-
-  const sidebarStyle = {{
-    width: '280px',
-    backgroundColor: '{sidebar_color}',
-    padding: '24px 16px',
-    display: 'flex',
-    flexDirection: 'column',
-    borderRight: '1px solid {card_color}'
-  }};
-
-  const titleStyle = {{
-    fontSize: '24px',
-    fontWeight: 'bold',
-    marginBottom: '32px',
-    paddingLeft: '12px'
-  }};
-
-  const navStyle = {{
-    display: 'flex',
-    flexDirection: 'column',
-    gap: '8px',
-    marginBottom: '32px'
-  }};
-
-  const navItemStyle = {{
-    display: 'flex',
-    alignItems: 'center',
-    gap: '12px',
-    padding: '10px 12px',
-    color: '{text_color}',
-    textDecoration: 'none',
-    borderRadius: '0.5rem',
-    transition: 'background-color 0.2s'
-  }};
-
-  const activeNavItemStyle = {{
-    backgroundColor: '{accent_color}',
-    color: 'white'
-  }};
-
-  const iconStyle = {{
-    width: '20px',
-    height: '20px',
-    display: 'inline-flex',
-    alignItems: 'center',
-    justifyContent: 'center'
-  }};
-
-  const recentSectionStyle = {{
-    marginTop: 'auto',
-    paddingTop: '24px',
-    borderTop: '1px solid {card_color}'
-  }};
-
-  const recentHeaderStyle = {{
-    fontSize: '14px',
-    fontWeight: 'bold',
-    marginBottom: '12px',
-    paddingLeft: '12px',
-    color: '{icon_color}'
-  }};
-
-  const recentListStyle = {{
-    display: 'flex',
-    flexDirection: 'column',
-    gap: '8px'
-  }};
-
-  const recentItemStyle = {{
-    display: 'flex',
-    alignItems: 'center',
-    gap: '12px',
-    padding: '8px 12px',
-    color: '{text_color}',
-    textDecoration: 'none',
-    fontSize: '14px'
-  }};
-
-  const mainContentStyle = {{
-    flex: 1,
-    padding: '24px',
-    overflowY: 'auto'
-  }};
-
-  const headerStyle = {{
-    display: 'flex',
-    justifyContent: 'space-between',
-    alignItems: 'center',
-    marginBottom: '24px'
-  }};
-
-  const headerTitleStyle = {{
-    fontSize: '24px',
-    fontWeight: 'bold'
-  }};
-
-  const buttonContainerStyle = {{
-    display: 'flex',
-    gap: '12px'
-  }};
-
-  const primaryButtonStyle = {{
-    backgroundColor: '{accent_color}',
-    color: 'white',
-    border: 'none',
-    padding: '8px 16px',
-    borderRadius: '0.5rem',
-    cursor: 'pointer'
-  }};
-
-  const secondaryButtonStyle = {{
-    backgroundColor: 'transparent',
-    border: '1px solid {card_color}',
-    color: '{text_color}',
-    padding: '8px 16px',
-    borderRadius: '0.5rem',
-    cursor: 'pointer'
-  }};
-
-  const cardsContainerStyle = {{
-    display: 'grid',
-    gridTemplateColumns: 'repeat(auto-fill, minmax(240px, 1fr))',
-    gap: '24px',
-    marginBottom: '24px'
-  }};
-
-  const cardStyle = {{
-    backgroundColor: '{card_color}',
-    borderRadius: '0.5rem',
-    padding: '20px'
-  }};
-
-  const cardLabelStyle = {{
-    fontSize: '14px',
-    color: '{icon_color}'
-  }};
-
-  const cardValueStyle = {{
-    fontSize: '28px',
-    fontWeight: 'bold',
-    marginTop: '8px'
-  }};
-
-  const positiveChangeStyle = {{
-    fontSize: '12px',
-    color: '#4ade80',
-    marginTop: '8px'
-  }};
-
-  const negativeChangeStyle = {{
-    fontSize: '12px',
-    color: '#ef4444',
-    marginTop: '8px'
-  }};
-"""
+    return regular_styles(is_dark)
 
 def handle_component_by_type(prompt_content, component_data):
     """
     Procesa un componente basado en su tipo (dashboard, footer, etc.)
     para asegurarse de que tenga la estructura y visualización correctas
     """
-    prompt_lower = prompt_content.lower()
+    category = confident_category(prompt_content, settings.TEMPLATE_MATCH_THRESHOLD)
     
     # Para componentes tipo dashboard
-    if 'dashboard' in prompt_lower:
+    if category == 'dashboard':
         if 'component_code' not in component_data or 'preview_html' not in component_data:
             dashboard_component = create_dashboard_component(prompt_content)
             return dashboard_component
@@ -1821,7 +1082,7 @@ def handle_component_by_type(prompt_content, component_data):
             component_data['component_code'] = format_dashboard_component(component_data['component_code'], prompt_content)
     
     # Para componentes tipo footer
-    elif 'footer' in prompt_lower:
+    elif category == 'footer':
         if 'component_code' not in component_data or 'preview_html' not in component_data:
             return create_fallback_footer(prompt_content)
             
@@ -0,0 +1,1032 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Marcador de un valor que se rellena al renderizar: [[nombre]]
+_SLOT = re.compile(r"\[\[(\w+)\]\]")
+
+
+class Template:
+    """
+    Plantilla de texto compilada.
+
+    El texto se divide una sola vez en partes literales y nombres de slot, de
+    modo que renderizar solo une cadenas. A diferencia de un f-string, las
+    llaves del código JSX se escriben tal cual; los valores variables se
+    marcan como [[nombre]].
+
+    Example:
+        >>> Template("Hola [[name]]").render(name="mundo")
+        'Hola mundo'
+    """
+
+    __slots__ = ("_parts", "_format", "slots")
+
+    def __init__(self, text: str):
+        # Las posiciones pares son literales y las impares nombres de slot
+        self._parts: List[str] = _SLOT.split(text)
+        self.slots = frozenset(self._parts[1::2])
+        # Cadena de formato equivalente para que render se ejecute en C
+        self._format = "".join(
+            f"%({part})s" if index % 2 else part.replace("%", "%%")
+            for index, part in enumerate(self._parts)
+        )
+
+    def render(self, **values: str) -> str:
+        """
+        Devuelve el texto con todos los slots rellenados.
+
+        Raises:
+            KeyError: Si falta el valor de algún slot
+        """
+        return self._format % values
+
+    def partial(self, **values: str) -> "Template":
+        """Devuelve una nueva plantilla con los slots indicados ya rellenados."""
+        parts = self._parts[:]
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            parts[index] = values[name] if name in values else f"[[{name}]]"
+        return Template("".join(parts))
+
+
+# Componente genérico usado cuando no hay uno del modelo
+DEFAULT_COMPONENT_CODE = Template("""import React from 'react';
+
+const [[component_name]] = () => {
+  // Styles for the component
+  const containerStyle = {
+    border: '1px solid #e0e0e0',
+    borderRadius: '8px',
+    padding: '16px',
+    maxWidth: '100%',
+    boxShadow: '0 2px 4px rgba(0,0,0,0.1)',
+    fontFamily: 'Arial, sans-serif'
+  };
+
+  const headerStyle = {
+    fontSize: '18px',
+    fontWeight: 'bold',
+    marginBottom: '8px',
+    color: '#333'
+  };
+
+  const actionAreaStyle = {
+    backgroundColor: '#f5f5f5',
+    padding: '12px',
+    borderRadius: '4px',
+    marginTop: '12px'
+  };
+
+  const buttonStyle = {
+    backgroundColor: '#4f46e5',
+    color: 'white',
+    border: 'none',
+    padding: '8px 16px',
+    borderRadius: '4px',
+    cursor: 'pointer',
+    transition: 'background-color 0.3s'
+  };
+
+  return (
+    <div style={containerStyle}>
+      <div style={headerStyle}>[[prompt_content]]</div>
+      <p>Generated component based on your description</p>
+      <div style={actionAreaStyle}>
+        <button 
+          style={buttonStyle}
+          onMouseOver={(e) => {
+            e.currentTarget.style.backgroundColor = '#3c35b5';
+          }}
+          onMouseOut={(e) => {
+            e.currentTarget.style.backgroundColor = '#4f46e5';
+          }}
+        >
+          Send
+        </button>
+      </div>
+    </div>
+  );
+};
+
+export default [[component_name]];
+""")
+
+
+# Dashboard con barra lateral: previsualización HTML
+VERTICAL_DASHBOARD_HTML = Template("""
+<div style="display: flex; width: 100%; height: 100vh; font-family: [[font_family]]; background-color: [[bg_color]]; color: [[text_color]];">
+  <!-- Sidebar -->
+  <div style="width: 280px; background-color: [[sidebar_color]]; padding: 24px 16px; display: flex; flex-direction: column; border-right: 1px solid [[card_color]];">
+    <!-- Logo / Title -->
+    <div style="font-size: 24px; font-weight: bold; margin-bottom: 32px; padding-left: 12px;">Dashboard</div>
+    
+    <!-- Navigation -->
+    <nav style="display: flex; flex-direction: column; gap: 8px; margin-bottom: 32px;">
+      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; background-color: [[accent_color]]; border-radius: [[border_radius]]; color: white; text-decoration: none; [[button_style]]">
+        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">📊</span>
+        <span>Overview</span>
+      </a>
+      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: [[text_color]]; text-decoration: none; border-radius: [[border_radius]]; [[button_style]]">
+        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">👥</span>
+        <span>Usuarios</span>
+      </a>
+      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: [[text_color]]; text-decoration: none; border-radius: [[border_radius]]; [[button_style]]">
+        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">💰</span>
+        <span>Ingresos</span>
+      </a>
+      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: [[text_color]]; text-decoration: none; border-radius: [[border_radius]]; [[button_style]]">
+        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">📈</span>
+        <span>Análisis</span>
+      </a>
+      <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 10px 12px; color: [[text_color]]; text-decoration: none; border-radius: [[border_radius]]; [[button_style]]">
+        <span style="width: 20px; height: 20px; display: inline-flex; align-items: center; justify-content: center;">⚙️</span>
+        <span>Configuración</span>
+      </a>
+    </nav>
+    
+    <!-- Recent Items Section -->
+    <div style="margin-top: auto; padding-top: 24px; border-top: 1px solid [[card_color]];">
+      <div style="font-size: 14px; font-weight: bold; margin-bottom: 12px; padding-left: 12px; color: [[icon_color]];">RECIENTES</div>
+      <div style="display: flex; flex-direction: column; gap: 8px;">
+        <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 8px 12px; color: [[text_color]]; text-decoration: none; font-size: 14px;">
+          <span>Botón de Login</span>
+        </a>
+        <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 8px 12px; color: [[text_color]]; text-decoration: none; font-size: 14px;">
+          <span>Formulario de contacto</span>
+        </a>
+        <a href="#" style="display: flex; align-items: center; gap: 12px; padding: 8px 12px; color: [[text_color]]; text-decoration: none; font-size: 14px;">
+          <span>Galería de imágenes</span>
+        </a>
+      </div>
+    </div>
+  </div>
+
+  <!-- Main Content (placeholder) -->
+  <div style="flex: 1; padding: 24px; overflow-y: auto;">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 24px;">
+      <h1 style="font-size: 24px; font-weight: bold;">Overview</h1>
+      <div style="display: flex; gap: 12px;">
+        <button style="background-color: [[accent_color]]; color: white; border: none; padding: 8px 16px; border-radius: [[border_radius]]; cursor: pointer; [[button_style]]">Nuevo</button>
+        <button style="background-color: transparent; border: 1px solid [[card_color]]; color: [[text_color]]; padding: 8px 16px; border-radius: [[border_radius]]; cursor: pointer; [[button_style]]">Filtrar</button>
+      </div>
+    </div>
+    
+    <!-- Stats cards -->
+    <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(240px, 1fr)); gap: 24px; margin-bottom: 24px;">
+      <div style="background-color: [[card_color]]; border-radius: [[border_radius]]; padding: 20px;">
+        <div style="font-size: 14px; color: [[icon_color]];">Usuarios</div>
+        <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">1,248</div>
+        <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 12% este mes</div>
+      </div>
+      
+      <div style="background-color: [[card_color]]; border-radius: [[border_radius]]; padding: 20px;">
+        <div style="font-size: 14px; color: [[icon_color]];">Ingresos</div>
+        <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">$48.5k</div>
+        <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 8% este mes</div>
+      </div>
+      
+      <div style="background-color: [[card_color]]; border-radius: [[border_radius]]; padding: 20px;">
+        <div style="font-size: 14px; color: [[icon_color]];">Tráfico</div>
+        <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">12.4k</div>
+        <div style="font-size: 12px; color: #ef4444; margin-top: 8px;">↓ 3% este mes</div>
+      </div>
+    </div>
+  </div>
+</div>
+""")
+
+
+# Dashboard con barra lateral: código React (imports y estilos según la variante)
+VERTICAL_DASHBOARD_CODE = Template("""import React from 'react';
+[[imports]]
+
+const Dashboard = () => {
+  [[styles]]
+
+  return (
+    <div style={containerStyle}>
+      {/* Sidebar */}
+      <div style={sidebarStyle}>
+        {/* Logo / Title */}
+        <div style={titleStyle}>Dashboard</div>
+        
+        {/* Navigation */}
+        <nav style={navStyle}>
+          <a href="#" style={{...navItemStyle, ...activeNavItemStyle}}>
+            <span style={iconStyle}>📊</span>
+            <span>Overview</span>
+          </a>
+          <a href="#" style={navItemStyle}>
+            <span style={iconStyle}>👥</span>
+            <span>Usuarios</span>
+          </a>
+          <a href="#" style={navItemStyle}>
+            <span style={iconStyle}>💰</span>
+            <span>Ingresos</span>
+          </a>
+          <a href="#" style={navItemStyle}>
+            <span style={iconStyle}>📈</span>
+            <span>Análisis</span>
+          </a>
+          <a href="#" style={navItemStyle}>
+            <span style={iconStyle}>⚙️</span>
+            <span>Configuración</span>
+          </a>
+        </nav>
+        
+        {/* Recent Items Section */}
+        <div style={recentSectionStyle}>
+          <div style={recentHeaderStyle}>RECIENTES</div>
+          <div style={recentListStyle}>
+            <a href="#" style={recentItemStyle}>
+              <span>Botón de Login</span>
+            </a>
+            <a href="#" style={recentItemStyle}>
+              <span>Formulario de contacto</span>
+            </a>
+            <a href="#" style={recentItemStyle}>
+              <span>Galería de imágenes</span>
+            </a>
+          </div>
+        </div>
+      </div>
+
+      {/* Main Content */}
+      <div style={mainContentStyle}>
+        <div style={headerStyle}>
+          <h1 style={headerTitleStyle}>Overview</h1>
+          <div style={buttonContainerStyle}>
+            <button style={primaryButtonStyle}>Nuevo</button>
+            <button style={secondaryButtonStyle}>Filtrar</button>
+          </div>
+        </div>
+        
+        {/* Stats cards */}
+        <div style={cardsContainerStyle}>
+          <div style={cardStyle}>
+            <div style={cardLabelStyle}>Usuarios</div>
+            <div style={cardValueStyle}>1,248</div>
+            <div style={positiveChangeStyle}>↑ 12% este mes</div>
+          </div>
+          
+          <div style={cardStyle}>
+            <div style={cardLabelStyle}>Ingresos</div>
+            <div style={cardValueStyle}>$48.5k</div>
+            <div style={positiveChangeStyle}>↑ 8% este mes</div>
+          </div>
+          
+          <div style={cardStyle}>
+            <div style={cardLabelStyle}>Tráfico</div>
+            <div style={cardValueStyle}>12.4k</div>
+            <div style={negativeChangeStyle}>↓ 3% este mes</div>
+          </div>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default Dashboard;
+""")
+
+
+# Estilos del dashboard sin framework (colores según el tema)
+REGULAR_STYLES = Template("""
+  // Estilos para el dashboard
+  const containerStyle = {
+    display: 'flex',
+    width: '100%',
+    height: '100vh',
+    fontFamily: 'Arial, sans-serif',
+    backgroundColor: '[[bg_color]]',
+    color: '[[text_color]]'
+  };
+
+  const sidebarStyle = {
+    width: '280px',
+    backgroundColor: '[[sidebar_color]]',
+    padding: '24px 16px',
+    display: 'flex',
+    flexDirection: 'column',
+    borderRight: '1px solid [[card_color]]'
+  };
+
+  const titleStyle = {
+    fontSize: '24px',
+    fontWeight: 'bold',
+    marginBottom: '32px',
+    paddingLeft: '12px'
+  };
+
+  const navStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '8px',
+    marginBottom: '32px'
+  };
+
+  const navItemStyle = {
+    display: 'flex',
+    alignItems: 'center',
+    gap: '12px',
+    padding: '10px 12px',
+    color: '[[text_color]]',
+    textDecoration: 'none',
+    borderRadius: '0.5rem',
+    transition: 'background-color 0.2s'
+  };
+
+  const activeNavItemStyle = {
+    backgroundColor: '[[accent_color]]',
+    color: 'white'
+  };
+
+  const iconStyle = {
+    width: '20px',
+    height: '20px',
+    display: 'inline-flex',
+    alignItems: 'center',
+    justifyContent: 'center'
+  };
+
+  const recentSectionStyle = {
+    marginTop: 'auto',
+    paddingTop: '24px',
+    borderTop: '1px solid [[card_color]]'
+  };
+
+  const recentHeaderStyle = {
+    fontSize: '14px',
+    fontWeight: 'bold',
+    marginBottom: '12px',
+    paddingLeft: '12px',
+    color: '[[icon_color]]'
+  };
+
+  const recentListStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '8px'
+  };
+
+  const recentItemStyle = {
+    display: 'flex',
+    alignItems: 'center',
+    gap: '12px',
+    padding: '8px 12px',
+    color: '[[text_color]]',
+    textDecoration: 'none',
+    fontSize: '14px'
+  };
+
+  const mainContentStyle = {
+    flex: 1,
+    padding: '24px',
+    overflowY: 'auto'
+  };
+
+  const headerStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    alignItems: 'center',
+    marginBottom: '24px'
+  };
+
+  const headerTitleStyle = {
+    fontSize: '24px',
+    fontWeight: 'bold'
+  };
+
+  const buttonContainerStyle = {
+    display: 'flex',
+    gap: '12px'
+  };
+
+  const primaryButtonStyle = {
+    backgroundColor: '[[accent_color]]',
+    color: 'white',
+    border: 'none',
+    padding: '8px 16px',
+    borderRadius: '0.5rem',
+    cursor: 'pointer'
+  };
+
+  const secondaryButtonStyle = {
+    backgroundColor: 'transparent',
+    border: '1px solid [[card_color]]',
+    color: '[[text_color]]',
+    padding: '8px 16px',
+    borderRadius: '0.5rem',
+    cursor: 'pointer'
+  };
+
+  const cardsContainerStyle = {
+    display: 'grid',
+    gridTemplateColumns: 'repeat(auto-fill, minmax(240px, 1fr))',
+    gap: '24px',
+    marginBottom: '24px'
+  };
+
+  const cardStyle = {
+    backgroundColor: '[[card_color]]',
+    borderRadius: '0.5rem',
+    padding: '20px'
+  };
+
+  const cardLabelStyle = {
+    fontSize: '14px',
+    color: '[[icon_color]]'
+  };
+
+  const cardValueStyle = {
+    fontSize: '28px',
+    fontWeight: 'bold',
+    marginTop: '8px'
+  };
+
+  const positiveChangeStyle = {
+    fontSize: '12px',
+    color: '#4ade80',
+    marginTop: '8px'
+  };
+
+  const negativeChangeStyle = {
+    fontSize: '12px',
+    color: '#ef4444',
+    marginTop: '8px'
+  };
+""")
+
+
+# Estilos del dashboard con Shadcn UI
+SHADCN_STYLES = """
+  // Estilos para el dashboard con Shadcn UI
+  const containerStyle = {
+    display: 'flex',
+    width: '100%',
+    height: '100vh',
+    fontFamily: "'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif",
+    backgroundColor: '#0f172a',
+    color: '#f8fafc'
+  };
+
+  const sidebarStyle = {
+    width: '280px',
+    backgroundColor: '#1e293b',
+    padding: '24px 16px',
+    display: 'flex',
+    flexDirection: 'column',
+    borderRight: '1px solid #334155'
+  };
+
+  const titleStyle = {
+    fontSize: '24px',
+    fontWeight: 'bold',
+    marginBottom: '32px',
+    paddingLeft: '12px'
+  };
+
+  const navStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '8px',
+    marginBottom: '32px'
+  };
+
+  const navItemStyle = {
+    display: 'flex',
+    alignItems: 'center',
+    gap: '12px',
+    padding: '10px 12px',
+    color: '#f8fafc',
+    textDecoration: 'none',
+    borderRadius: '0.75rem',
+    fontWeight: '500',
+    transition: 'all 0.2s'
+  };
+
+  const activeNavItemStyle = {
+    backgroundColor: '#3b82f6',
+    color: 'white'
+  };
+
+  const iconStyle = {
+    width: '20px',
+    height: '20px',
+    display: 'inline-flex',
+    alignItems: 'center',
+    justifyContent: 'center'
+  };
+
+  const recentSectionStyle = {
+    marginTop: 'auto',
+    paddingTop: '24px',
+    borderTop: '1px solid #334155'
+  };
+
+  const recentHeaderStyle = {
+    fontSize: '14px',
+    fontWeight: 'bold',
+    marginBottom: '12px',
+    paddingLeft: '12px',
+    color: '#94a3b8'
+  };
+
+  const recentListStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '8px'
+  };
+
+  const recentItemStyle = {
+    display: 'flex',
+    alignItems: 'center',
+    gap: '12px',
+    padding: '8px 12px',
+    color: '#f8fafc',
+    textDecoration: 'none',
+    fontSize: '14px'
+  };
+
+  const mainContentStyle = {
+    flex: 1,
+    padding: '24px',
+    overflowY: 'auto'
+  };
+
+  const headerStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    alignItems: 'center',
+    marginBottom: '24px'
+  };
+
+  const headerTitleStyle = {
+    fontSize: '24px',
+    fontWeight: 'bold'
+  };
+
+  const buttonContainerStyle = {
+    display: 'flex',
+    gap: '12px'
+  };
+
+  const primaryButtonStyle = {
+    backgroundColor: '#3b82f6',
+    color: 'white',
+    border: 'none',
+    padding: '8px 16px',
+    borderRadius: '0.75rem',
+    cursor: 'pointer',
+    fontWeight: '500',
+    transition: 'all 0.2s'
+  };
+
+  const secondaryButtonStyle = {
+    backgroundColor: 'transparent',
+    border: '1px solid #334155',
+    color: '#f8fafc',
+    padding: '8px 16px',
+    borderRadius: '0.75rem',
+    cursor: 'pointer',
+    fontWeight: '500',
+    transition: 'all 0.2s'
+  };
+
+  const cardsContainerStyle = {
+    display: 'grid',
+    gridTemplateColumns: 'repeat(auto-fill, minmax(240px, 1fr))',
+    gap: '24px',
+    marginBottom: '24px'
+  };
+
+  const cardStyle = {
+    backgroundColor: '#334155',
+    borderRadius: '0.75rem',
+    padding: '20px'
+  };
+
+  const cardLabelStyle = {
+    fontSize: '14px',
+    color: '#94a3b8'
+  };
+
+  const cardValueStyle = {
+    fontSize: '28px',
+    fontWeight: 'bold',
+    marginTop: '8px'
+  };
+
+  const positiveChangeStyle = {
+    fontSize: '12px',
+    color: '#4ade80',
+    marginTop: '8px'
+  };
+
+  const negativeChangeStyle = {
+    fontSize: '12px',
+    color: '#ef4444',
+    marginTop: '8px'
+  };
+"""
+
+
+# Imports de Shadcn UI para el dashboard
+SHADCN_IMPORTS = """import {
+  Card,
+  CardContent,
+  CardDescription,
+  CardHeader,
+  CardTitle,
+} from "./ui/card";
+import { Button } from "./ui/button";
+import { BarChart, Clock, Home, Settings, Users } from "lucide-react";
+"""
+
+
+# Dashboard horizontal con tarjetas y lista de componentes: previsualización HTML
+HORIZONTAL_DASHBOARD_HTML = """
+<div style="background-color: #1e293b; border-radius: 8px; padding: 20px; color: white; width: 100%; font-family: Arial, sans-serif;">
+  <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
+    <div style="font-size: 24px; font-weight: bold;">Dashboard</div>
+    <div style="display: flex; gap: 10px;">
+      <button style="background-color: #3b82f6; border: none; color: white; padding: 8px 16px; border-radius: 4px; cursor: pointer;">Nuevo</button>
+      <button style="background-color: transparent; border: 1px solid #64748b; color: white; padding: 8px 16px; border-radius: 4px; cursor: pointer;">Filtrar</button>
+    </div>
+  </div>
+  
+  <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); gap: 16px; margin-bottom: 24px;">
+    <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px;">
+      <div style="font-size: 14px; color: #94a3b8;">Usuarios</div>
+      <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">1,248</div>
+      <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 12% este mes</div>
+    </div>
+    
+    <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px;">
+      <div style="font-size: 14px; color: #94a3b8;">Ingresos</div>
+      <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">$48.5k</div>
+      <div style="font-size: 12px; color: #4ade80; margin-top: 8px;">↑ 8% este mes</div>
+    </div>
+    
+    <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px;">
+      <div style="font-size: 14px; color: #94a3b8;">Tráfico</div>
+      <div style="font-size: 28px; font-weight: bold; margin-top: 8px;">12.4k</div>
+      <div style="font-size: 12px; color: #ef4444; margin-top: 8px;">↓ 3% este mes</div>
+    </div>
+  </div>
+  
+  <div style="background-color: #2c3e50; border-radius: 8px; padding: 16px; margin-bottom: 20px;">
+    <div style="font-size: 16px; font-weight: bold; margin-bottom: 16px;">Componentes recientes</div>
+    <div style="display: flex; flex-direction: column; gap: 8px;">
+      <a href="#" style="display: flex; justify-content: space-between; padding: 12px; background-color: #374151; border-radius: 4px; text-decoration: none; color: white;">
+        <span>Botón de Login</span>
+        <span style="color: #94a3b8;">→</span>
+      </a>
+      <a href="#" style="display: flex; justify-content: space-between; padding: 12px; background-color: #374151; border-radius: 4px; text-decoration: none; color: white;">
+        <span>Formulario de contacto</span>
+        <span style="color: #94a3b8;">→</span>
+      </a>
+      <a href="#" style="display: flex; justify-content: space-between; padding: 12px; background-color: #374151; border-radius: 4px; text-decoration: none; color: white;">
+        <span>Galería de imágenes</span>
+        <span style="color: #94a3b8;">→</span>
+      </a>
+    </div>
+  </div>
+</div>
+"""
+
+
+# Dashboard horizontal: código React
+HORIZONTAL_DASHBOARD_CODE = """import React from 'react';
+import { IconUsers, IconCurrencyDollar, IconChartBar, IconArrowUp, IconArrowDown } from './icons';
+
+const Dashboard = () => {
+  // Estilos para el dashboard
+  const dashboardStyle = {
+    backgroundColor: '#1e293b',
+    borderRadius: '8px',
+    padding: '20px',
+    color: 'white',
+    width: '100%',
+    fontFamily: 'Arial, sans-serif'
+  };
+
+  const headerStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    alignItems: 'center',
+    marginBottom: '20px'
+  };
+
+  const titleStyle = {
+    fontSize: '24px',
+    fontWeight: 'bold'
+  };
+
+  const buttonContainerStyle = {
+    display: 'flex',
+    gap: '10px'
+  };
+
+  const primaryButtonStyle = {
+    backgroundColor: '#3b82f6',
+    border: 'none',
+    color: 'white',
+    padding: '8px 16px',
+    borderRadius: '4px',
+    cursor: 'pointer'
+  };
+
+  const secondaryButtonStyle = {
+    backgroundColor: 'transparent',
+    border: '1px solid #64748b',
+    color: 'white',
+    padding: '8px 16px',
+    borderRadius: '4px',
+    cursor: 'pointer'
+  };
+
+  const cardsContainerStyle = {
+    display: 'grid',
+    gridTemplateColumns: 'repeat(auto-fill, minmax(200px, 1fr))',
+    gap: '16px',
+    marginBottom: '24px'
+  };
+
+  const cardStyle = {
+    backgroundColor: '#2c3e50',
+    borderRadius: '8px',
+    padding: '16px'
+  };
+
+  const cardLabelStyle = {
+    fontSize: '14px',
+    color: '#94a3b8'
+  };
+
+  const cardValueStyle = {
+    fontSize: '28px',
+    fontWeight: 'bold',
+    marginTop: '8px'
+  };
+
+  const positiveChangeStyle = {
+    fontSize: '12px',
+    color: '#4ade80',
+    marginTop: '8px',
+    display: 'flex',
+    alignItems: 'center'
+  };
+
+  const negativeChangeStyle = {
+    fontSize: '12px',
+    color: '#ef4444',
+    marginTop: '8px',
+    display: 'flex',
+    alignItems: 'center'
+  };
+
+  const contentBoxStyle = {
+    backgroundColor: '#2c3e50',
+    borderRadius: '8px',
+    padding: '16px',
+    marginBottom: '20px'
+  };
+
+  const contentTitleStyle = {
+    fontSize: '16px',
+    fontWeight: 'bold',
+    marginBottom: '16px'
+  };
+
+  const itemListStyle = {
+    display: 'flex',
+    flexDirection: 'column',
+    gap: '8px'
+  };
+
+  const itemStyle = {
+    display: 'flex',
+    justifyContent: 'space-between',
+    padding: '12px',
+    backgroundColor: '#374151',
+    borderRadius: '4px',
+    textDecoration: 'none',
+    color: 'white'
+  };
+
+  const itemIconStyle = {
+    color: '#94a3b8'
+  };
+
+  // Datos para las tarjetas
+  const cardData = [
+    { label: 'Usuarios', value: '1,248', change: '+12%', positive: true, icon: <IconUsers /> },
+    { label: 'Ingresos', value: '$48.5k', change: '+8%', positive: true, icon: <IconCurrencyDollar /> },
+    { label: 'Tráfico', value: '12.4k', change: '-3%', positive: false, icon: <IconChartBar /> }
+  ];
+
+  // Datos para los componentes recientes
+  const recentComponents = [
+    { name: 'Botón de Login', url: '#' },
+    { name: 'Formulario de contacto', url: '#' },
+    { name: 'Galería de imágenes', url: '#' }
+  ];
+
+  return (
+    <div style={dashboardStyle}>
+      {/* Header */}
+      <div style={headerStyle}>
+        <div style={titleStyle}>Dashboard</div>
+        <div style={buttonContainerStyle}>
+          <button style={primaryButtonStyle}>Nuevo</button>
+          <button style={secondaryButtonStyle}>Filtrar</button>
+        </div>
+      </div>
+      
+      {/* Tarjetas de estadísticas */}
+      <div style={cardsContainerStyle}>
+        {cardData.map((card, index) => (
+          <div key={index} style={cardStyle}>
+            <div style={cardLabelStyle}>{card.label}</div>
+            <div style={cardValueStyle}>{card.value}</div>
+            <div style={card.positive ? positiveChangeStyle : negativeChangeStyle}>
+              {card.positive ? <IconArrowUp /> : <IconArrowDown />} {card.change} este mes
+            </div>
+          </div>
+        ))}
+      </div>
+      
+      {/* Lista de componentes recientes */}
+      <div style={contentBoxStyle}>
+        <div style={contentTitleStyle}>Componentes recientes</div>
+        <div style={itemListStyle}>
+          {recentComponents.map((component, index) => (
+            <a key={index} href={component.url} style={itemStyle}>
+              <span>{component.name}</span>
+              <span style={itemIconStyle}>→</span>
+            </a>
+          ))}
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default Dashboard;
+"""
+
+
+# Previsualización del componente de respaldo
+FALLBACK_PREVIEW_HTML = Template('<span style="display: inline-block; padding: 12px 24px; background-color: [[bg_color]]; color: [[text_color]]; border-radius: 8px; font-family: Arial, sans-serif;">This is a [[prompt_content]]</span>')
+
+DASHBOARD_DESCRIPTIONS = {
+    "vertical": Template("A vertical sidebar dashboard with dark theme: [[prompt_content]]"),
+    "horizontal": Template("A horizontal dashboard with stats cards and components list: [[prompt_content]]"),
+}
+
+# Colores según el tema (clave: is_dark)
+THEMES = {
+    True: {
+        "bg_color": "#0f172a",       # Negro azulado oscuro para el fondo
+        "sidebar_color": "#1e293b",  # Azul oscuro para la barra lateral
+        "text_color": "#f8fafc",     # Blanco para texto
+        "accent_color": "#3b82f6",   # Azul para acentos
+        "card_color": "#334155",     # Gris azulado para tarjetas
+        "icon_color": "#94a3b8",     # Gris claro para iconos
+    },
+    False: {
+        "bg_color": "#f8fafc",       # Blanco para el fondo
+        "sidebar_color": "#f1f5f9",  # Gris muy claro para la barra lateral
+        "text_color": "#0f172a",     # Negro para texto
+        "accent_color": "#3b82f6",   # Azul para acentos
+        "card_color": "#e2e8f0",     # Gris claro para tarjetas
+        "icon_color": "#64748b",     # Gris para iconos
+    },
+}
+
+# Estilo general según el framework (clave: uses_shadcn)
+FRAMEWORKS = {
+    True: {
+        "border_radius": "0.75rem",  # Más redondeado para Shadcn
+        "button_style": "border-radius: 0.5rem; font-weight: 500; transition: all 0.2s;",
+        "font_family": "'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif",
+    },
+    False: {
+        "border_radius": "0.5rem",   # Estándar
+        "button_style": "border-radius: 0.375rem; font-weight: 400;",
+        "font_family": "Arial, sans-serif",
+    },
+}
+
+
+# Categorías de las plantillas de página completas (definidas en page_templates)
+PAGE_CATEGORIES = ("profile", "settings", "checkout")
+
+
+@lru_cache(maxsize=None)
+def page_templates() -> Dict[str, Tuple[Template, Template, Template]]:
+    """
+    Plantillas de página por categoría: (preview_html, component_code, descripción).
+
+    Se importan la primera vez que se usan: son grandes y se piden pocas veces.
+    """
+    from app.api.chat.page_templates import PAGE_TEMPLATES
+
+    return PAGE_TEMPLATES
+
+
+@lru_cache(maxsize=None)
+def regular_styles(is_dark: bool) -> str:
+    """Estilos del dashboard sin framework, renderizados una vez por tema."""
+    return REGULAR_STYLES.render(**THEMES[bool(is_dark)])
+
+
+@lru_cache(maxsize=None)
+def dashboard_variant(orientation: str, is_dark: bool, uses_shadcn: bool) -> Tuple[str, str]:
+    """
+    Partes estáticas de un dashboard, renderizadas una vez por variante.
+
+    Returns:
+        tuple: (preview_html, component_code)
+    """
+    if orientation == "vertical":
+        preview_html = VERTICAL_DASHBOARD_HTML.render(**THEMES[is_dark], **FRAMEWORKS[uses_shadcn])
+        component_code = VERTICAL_DASHBOARD_CODE.render(
+            imports=SHADCN_IMPORTS if uses_shadcn else "",
+            styles=SHADCN_STYLES if uses_shadcn else regular_styles(is_dark),
+        )
+        return preview_html, component_code
+    # El dashboard horizontal no cambia con el tema ni con el framework
+    return HORIZONTAL_DASHBOARD_HTML, HORIZONTAL_DASHBOARD_CODE
+
+
+def render_dashboard(orientation: str, prompt_content: str, is_dark: bool = True, uses_shadcn: bool = False) -> Dict[str, str]:
+    """
+    Devuelve los datos de un dashboard; solo la descripción depende del prompt.
+
+    Args:
+        orientation: "vertical" (con barra lateral) u "horizontal"
+        prompt_content: Descripción original del usuario
+        is_dark: Usar el tema oscuro
+        uses_shadcn: Usar los estilos de Shadcn UI
+
+    Returns:
+        Dict[str, str]: visual_description, preview_html y component_code
+    """
+    preview_html, component_code = dashboard_variant(orientation, bool(is_dark), bool(uses_shadcn))
+    return {
+        "visual_description": DASHBOARD_DESCRIPTIONS[orientation].render(prompt_content=prompt_content),
+        "preview_html": preview_html,
+        "component_code": component_code,
+    }
+
+
+@lru_cache(maxsize=None)
+def page_variant(category: str, is_dark: bool) -> Tuple[str, str]:
+    """
+    Previsualización y código de una plantilla de página, renderizados una vez por tema.
+
+    Returns:
+        tuple: (preview_html, component_code)
+    """
+    preview_html, component_code, _ = page_templates()[category]
+    return preview_html.render(**THEMES[is_dark]), component_code.render(**THEMES[is_dark])
+
+
+def render_page(category: str, prompt_content: str, is_dark: bool = False) -> Dict[str, str]:
+    """
+    Devuelve los datos de una plantilla de página ("profile", "settings" o "checkout").
+
+    Args:
+        category: Categoría de la plantilla
+        prompt_content: Descripción original del usuario
+        is_dark: Usar el tema oscuro
+
+    Returns:
+        Dict[str, str]: visual_description, preview_html y component_code
+    """
+    preview_html, component_code = page_variant(category, bool(is_dark))
+    return {
+        "visual_description": page_templates()[category][2].render(prompt_content=prompt_content),
+        "preview_html": preview_html,
+        "component_code": component_code,
+    }
+
+
+def warm_templates(include_pages: bool = False) -> None:
+    """
+    Renderiza por adelantado las variantes de los dashboards (las del respaldo).
+
+    Args:
+        include_pages: Renderizar también las plantillas de página, que
+            normalmente se cargan la primera vez que se piden
+    """
+    for is_dark in (True, False):
+        for orientation in DASHBOARD_DESCRIPTIONS:
+            for uses_shadcn in (True, False):
+                dashboard_variant(orientation, is_dark, uses_shadcn)
+        if include_pages:
+            for category in PAGE_CATEGORIES:
+                page_variant(category, is_dark)
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import re
+from app.api.convert.service import CodeNotFound, code_hash, convert_component
+from app.api.convert.templates import LANGUAGES
+from app.core.metrics import track_request
+
+_CODE_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+class ConvertRequest(BaseModel):
+    code: Optional[str] = Field(None, description="Código React del componente")
+    code_hash: Optional[str] = Field(None, description="SHA-256 del código; basta con él si el código ya se envió antes")
+    languages: List[str] = Field(..., min_length=1, description="Lenguajes de destino (ver /convert/languages)")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "code": "function LoginButton() {\n  return <button className='login-btn'>Login</button>;\n}\n\nexport default LoginButton;",
+                "languages": ["typescript", "python", "kotlin"]
+            }
+        }
+
+class ConvertedFile(BaseModel):
+    language: str = Field(..., description="Identificador del lenguaje")
+    name: str = Field(..., description="Nombre del lenguaje")
+    extension: str = Field(..., description="Extensión del archivo")
+    file_name: str = Field(..., description="Nombre de archivo sugerido")
+    code: str = Field(..., description="Código convertido")
+    cached: bool = Field(False, description="Indica si la conversión se sirvió desde el caché")
+
+class ConvertResponse(BaseModel):
+    code_hash: str = Field(..., description="SHA-256 del código, para pedir otros lenguajes sin reenviarlo")
+    converter_version: str = Field(..., description="Versión de las conversiones")
+    files: List[ConvertedFile] = Field(..., description="Un archivo por lenguaje, en el orden pedido")
+
+class LanguageInfo(BaseModel):
+    id: str = Field(..., description="Identificador del lenguaje")
+    name: str = Field(..., description="Nombre del lenguaje")
+    extension: str = Field(..., description="Extensión del archivo")
+
+@router.get(
+    "/convert/languages",
+    response_model=List[LanguageInfo],
+    summary="Lenguajes de conversión",
+    description="Lista los lenguajes a los que se puede convertir un componente"
+)
+async def list_languages():
+    return [language._asdict() for language in LANGUAGES.values()]
+
+@router.post(
+    "/convert",
+    response_model=ConvertResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Convertir componente",
+    description="Convierte el código de un componente React a varios lenguajes; las conversiones se guardan en caché por hash del código, lenguaje y versión del conversor"
+)
+async def convert(request: ConvertRequest):
+    """
+    Convierte un componente a los lenguajes pedidos.
+
+    Se puede enviar el código o, si ya se envió antes, solo su hash
+    (code_hash de una respuesta anterior).
+    """
+    unknown = [language for language in request.languages if language not in LANGUAGES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Lenguajes no soportados: {', '.join(unknown)}. Disponibles: {', '.join(LANGUAGES)}"
+        )
+    if request.code is None:
+        if request.code_hash is None:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Envíe code o code_hash")
+        if not _CODE_HASH.match(request.code_hash):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="code_hash debe ser un SHA-256 en hexadecimal")
+    elif request.code_hash is not None and request.code_hash != code_hash(request.code):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="code_hash no coincide con el código enviado")
+
+    with track_request("convert", None) as tracked:
+        try:
+            result = await convert_component(request.languages, code=request.code, digest=request.code_hash)
+        except CodeNotFound as e:
+            tracked.outcome = "not_found"
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        tracked.outcome = "cache" if all(file["cached"] for file in result["files"]) else "converted"
+    return ORJSONResponse(result)
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import re
+from typing import Any, Dict, List, Optional
+
+from app.api.convert.templates import LANGUAGE_TEMPLATES, LANGUAGES
+from app.core.cache import ResultCache, build_cache_key
+from app.core.config import settings
+
+# Versión de las conversiones: cambiarla al modificar cualquiera invalida los resultados en caché
+CONVERTER_VERSION = "1"
+
+_COMPONENT_NAME = re.compile(r"(?:function|const)\s+([A-Za-z0-9_]+)")
+
+# Lenguajes cuyo archivo se nombra en minúsculas
+_LOWERCASE_FILE_NAMES = ("python", "cpp")
+
+
+class CodeNotFound(Exception):
+    """Se pidió una conversión por hash y el código no está en el caché."""
+
+    def __init__(self, digest: str):
+        super().__init__(f"No hay código guardado con el hash {digest}; envíe el código completo")
+        self.digest = digest
+
+
+def code_hash(code: str) -> str:
+    """SHA-256 (hex) del código, el identificador con el que se puede volver a pedir."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def component_name(code: str) -> str:
+    """Nombre del componente: el primer function/const del código, o 'Component'."""
+    match = _COMPONENT_NAME.search(code)
+    return match.group(1) if match else "Component"
+
+
+def convert_code(code: str, language: str) -> str:
+    """
+    Convierte el código de un componente React a otro lenguaje.
+
+    Port de convertComponentCode (src/lib/code-converter.ts): TypeScript
+    añade el tipo de las props; el resto de lenguajes son un esqueleto
+    equivalente con el nombre del componente.
+
+    Raises:
+        KeyError: Si el lenguaje no está en LANGUAGES
+    """
+    if language not in LANGUAGES:
+        raise KeyError(language)
+    name = component_name(code)
+    if language == "javascript":
+        return code
+    if language == "typescript":
+        return code.replace(
+            f"export default {name};",
+            f"interface {name}Props {{}}\n\nexport default {name} as React.FC<{name}Props>;",
+            1,
+        )
+    return LANGUAGE_TEMPLATES[language].render(component_name=name)
+
+
+def file_name(name: str, language: str) -> str:
+    """Nombre de archivo del componente en un lenguaje (port de generateFileName)."""
+    extension = LANGUAGES[language].extension
+    if not name:
+        return f"component.{extension}"
+    if language in _LOWERCASE_FILE_NAMES:
+        return f"{name.lower()}.{extension}"
+    return f"{name}.{extension}"
+
+
+def _result_key(digest: str, language: str) -> str:
+    return build_cache_key("convert", CONVERTER_VERSION, digest, language)
+
+
+def _code_key(digest: str) -> str:
+    return build_cache_key("convert-code", digest)
+
+
+# Caché de conversiones y del código recibido (para poder pedir más lenguajes solo con el hash)
+conversion_cache = ResultCache(
+    max_entries=settings.CONVERT_CACHE_MAX_ENTRIES,
+    ttl=settings.CONVERT_CACHE_TTL,
+    disk_path=settings.CONVERT_CACHE_DISK_PATH or None,
+    enabled=settings.CONVERT_CACHE_ENABLED,
+    disk_max_entries=settings.CONVERT_CACHE_DISK_MAX_ENTRIES,
+)
+
+
+def get_conversion_cache() -> ResultCache:
+    return conversion_cache
+
+
+async def convert_component(
+    languages: List[str],
+    code: Optional[str] = None,
+    digest: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Convierte un componente a varios lenguajes, reutilizando las conversiones en caché.
+
+    Cada conversión se guarda con la clave (hash del código, lenguaje,
+    CONVERTER_VERSION), así que se calcula una sola vez para todos los
+    clientes. El código también se guarda, de modo que después basta con
+    enviar su hash.
+
+    Args:
+        languages: Lenguajes de destino (identificadores de LANGUAGES)
+        code: Código React del componente
+        digest: Hash del código, si no se envía el código
+
+    Returns:
+        Dict: code_hash, converter_version y files (uno por lenguaje, en el orden pedido)
+
+    Raises:
+        CodeNotFound: Si solo se indicó el hash y el código no está en el caché
+    """
+    cache = get_conversion_cache()
+    if code is not None:
+        digest = code_hash(code)
+        await cache.set(_code_key(digest), code)
+    languages = list(dict.fromkeys(languages))
+
+    # Las consultas al caché (que pueden ir a disco) se hacen a la vez
+    cached = await asyncio.gather(*(cache.get(_result_key(digest, language)) for language in languages))
+    missing = [language for language, entry in zip(languages, cached) if entry is None]
+    if missing and code is None:
+        code = await cache.get(_code_key(digest))
+        if code is None:
+            raise CodeNotFound(digest)
+
+    # Cada conversión es una sustitución de texto de microsegundos: se hace aquí mismo
+    name = component_name(code) if missing else None
+    converted = {}
+    for language in missing:
+        converted[language] = {
+            "language": language,
+            "name": LANGUAGES[language].name,
+            "extension": LANGUAGES[language].extension,
+            "file_name": file_name(name, language),
+            "code": convert_code(code, language),
+        }
+    await asyncio.gather(*(cache.set(_result_key(digest, language), entry) for language, entry in converted.items()))
+
+    files = []
+    for language, entry in zip(languages, cached):
+        if entry is None:
+            files.append(dict(converted[language], cached=False))
+        else:
+            files.append(dict(entry, cached=True))
+    return {
+        "code_hash": digest,
+        "converter_version": CONVERTER_VERSION,
+        "files": files,
+    }
+
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+def build_cache_key(*parts: Any) -> str:
+    """
+    Construye una clave determinista a partir de las partes indicadas.
+
+    Las partes se serializan como JSON canónico (claves ordenadas) antes de
+    calcular el hash, de modo que dos diccionarios equivalentes producen la misma clave.
+    """
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """
+    Nivel persistente del caché respaldado por SQLite.
+
+    Cada escritura borra las filas caducadas y, si se supera max_entries,
+    las que caducan antes, así que el archivo no crece sin límite aunque
+    las claves antiguas no se vuelvan a consultar.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, expires_at),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # El índice por expires_at hace que ambas consultas sean baratas aunque no haya nada que borrar
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        excess = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    """
+    Caché de resultados en dos niveles: LRU en memoria con TTL y, opcionalmente,
+    un nivel en disco que sobrevive a los reinicios del proceso.
+
+    Los valores deben ser serializables a JSON. El nivel de disco se consulta
+    fuera del event loop para no bloquearlo.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.RESULT_CACHE_MAX_ENTRIES,
+        ttl: float = settings.RESULT_CACHE_TTL,
+        disk_path: Optional[str] = settings.RESULT_CACHE_DISK_PATH or None,
+        enabled: bool = settings.RESULT_CACHE_ENABLED,
+        disk_max_entries: int = settings.RESULT_CACHE_DISK_MAX_ENTRIES,
+    ):
+        self.max_entries = max_entries
+        self.disk_max_entries = disk_max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._disk_path = disk_path
+        self._disk: Optional[_DiskTier] = None
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def _get_disk(self) -> Optional[_DiskTier]:
+        if self._disk is None and self._disk_path:
+            self._disk = _DiskTier(self._disk_path, self.disk_max_entries)
+        return self._disk
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Devuelve el valor cacheado o None si no existe o ha expirado."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._entries[key]
+
+        disk = self._get_disk()
+        if disk is not None:
+            stored = await asyncio.to_thread(disk.get, key)
+            if stored is not None:
+                value, expires_at = stored
+                self._remember(key, value, expires_at)
+                self._disk_hits += 1
+                return value
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Guarda un valor en memoria y, si está configurado, en disco."""
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl
+        self._remember(key, value, expires_at)
+        disk = self._get_disk()
+        if disk is not None:
+            await asyncio.to_thread(disk.set, key, value, expires_at)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        disk = self._get_disk()
+        if disk is not None:
+            await asyncio.to_thread(disk.clear)
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._disk_hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk_tier": bool(self._disk_path),
+            "disk_max_entries": self.disk_max_entries,
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_ratio": round((self._hits + self._disk_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Caché compartido de componentes generados
+result_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    return result_cache
@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Tuple, Type
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto: no se llama al proveedor."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Circuito abierto hacia el proveedor; siguiente prueba en {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class _Call:
+    """Llamada en curso protegida por el circuito."""
+
+    def __init__(self):
+        self.failed = False
+
+    def mark_failed(self) -> None:
+        """La llamada no lanzó excepción pero su respuesta indica un fallo del proveedor."""
+        self.failed = True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker con estados cerrado, abierto y semiabierto.
+
+    Cerrado: las llamadas pasan y su resultado se guarda en una ventana
+    deslizante de window_seconds. Si en la ventana hay al menos min_calls
+    llamadas y la proporción de fallos alcanza failure_rate (o la de llamadas
+    más lentas que slow_call_seconds alcanza slow_call_rate), el circuito se abre.
+
+    Abierto: las llamadas se rechazan de inmediato con CircuitOpenError
+    durante open_seconds.
+
+    Semiabierto: se dejan pasar hasta half_open_calls llamadas de prueba. Si
+    una termina bien el circuito se cierra con la ventana vacía; si falla,
+    vuelve a abrirse.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = settings.BREAKER_WINDOW_SECONDS,
+        min_calls: int = settings.BREAKER_MIN_CALLS,
+        failure_rate: float = settings.BREAKER_FAILURE_RATE,
+        slow_call_seconds: float = settings.BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = settings.BREAKER_SLOW_CALL_RATE,
+        open_seconds: float = settings.BREAKER_OPEN_SECONDS,
+        half_open_calls: int = settings.BREAKER_HALF_OPEN_CALLS,
+        enabled: bool = settings.BREAKER_ENABLED,
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.enabled = enabled
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # (instante, falló, fue lenta) de cada llamada reciente
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self._rejected = 0
+        self._opened_total = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def is_open(self) -> bool:
+        """True si las llamadas se rechazarían ahora mismo sin llegar al proveedor."""
+        if not self.enabled:
+            return False
+        state = self.state
+        return state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_calls)
+
+    def _trim(self, now: float) -> None:
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probes = 0
+        self._window.clear()
+        self._opened_total += 1
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._probes = 0
+        self._window.clear()
+
+    def _before_call(self) -> bool:
+        """Reserva el paso de una llamada; devuelve si es una llamada de prueba."""
+        state = self.state
+        if state == CLOSED:
+            return False
+        if state == HALF_OPEN and self._probes < self.half_open_calls:
+            self._state = HALF_OPEN
+            self._probes += 1
+            return True
+        self._rejected += 1
+        raise CircuitOpenError(max(0.0, self._opened_at + self.open_seconds - time.monotonic()))
+
+    def _record(self, failed: bool, latency: float, probe: bool) -> None:
+        now = time.monotonic()
+        if probe:
+            self._probes -= 1
+            if failed:
+                self._open(now)
+            else:
+                self._close()
+            return
+        if self._state != CLOSED:
+            return
+
+        self._window.append((now, failed, latency > self.slow_call_seconds))
+        self._trim(now)
+        calls = len(self._window)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for _, call_failed, _ in self._window if call_failed)
+        slow = sum(1 for _, _, call_slow in self._window if call_slow)
+        if failures / calls >= self.failure_rate or slow / calls >= self.slow_call_rate:
+            self._open(now)
+
+    @asynccontextmanager
+    async def guard(self, ignore: Tuple[Type[BaseException], ...] = ()) -> AsyncIterator[_Call]:
+        """
+        Protege una llamada al proveedor.
+
+        Las excepciones dentro del bloque cuentan como fallo, salvo la
+        cancelación, el fin del plazo de la solicitud y las de los tipos
+        indicados en ignore.
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto
+        """
+        if not self.enabled:
+            yield _Call()
+            return
+
+        probe = self._before_call()
+        call = _Call()
+        start = time.monotonic()
+        try:
+            yield call
+        except (asyncio.CancelledError, GeneratorExit, DeadlineExceeded) + tuple(ignore):
+            # Sin resultado: solo se libera el hueco de prueba si lo había
+            if probe:
+                self._probes -= 1
+            raise
+        except BaseException:
+            self._record(True, time.monotonic() - start, probe)
+            raise
+        else:
+            self._record(call.failed, time.monotonic() - start, probe)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._trim(now)
+        calls = len(self._window)
+        failures = sum(1 for _, failed, _ in self._window if failed)
+        return {
+            "enabled": self.enabled,
+            "state": self.state if self.enabled else CLOSED,
+            "window_calls": calls,
+            "window_failure_rate": round(failures / calls, 3) if calls else 0.0,
+            "opened_total": self._opened_total,
+            "rejected_total": self._rejected,
+            "open_seconds": self.open_seconds,
+            "seconds_until_probe": round(max(0.0, self._opened_at + self.open_seconds - now), 1) if self._state == OPEN else 0.0,
+        }
+
+
+# Circuito compartido de las llamadas a QWEN
+upstream_breaker = CircuitBreaker()
+
+
+def get_upstream_breaker() -> CircuitBreaker:
+    return upstream_breaker
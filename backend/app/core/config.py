@@ -16,6 +16,118 @@ class Settings(BaseSettings):
     QWEN_API_KEY: str = os.getenv("QWEN_API_KEY", "")
     QWEN_API_BASE_URL: str = os.getenv("QWEN_API_BASE_URL", "https://api.qwen.ai/v1")
     
+    # Cliente HTTP compartido hacia QWEN (pool de conexiones keep-alive)
+    QWEN_HTTP_POOL_SIZE: int = int(os.getenv("QWEN_HTTP_POOL_SIZE", "100"))
+    QWEN_HTTP_POOL_SIZE_PER_HOST: int = int(os.getenv("QWEN_HTTP_POOL_SIZE_PER_HOST", "50"))
+    QWEN_HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("QWEN_HTTP_KEEPALIVE_TIMEOUT", "60"))
+    QWEN_HTTP_DNS_TTL: int = int(os.getenv("QWEN_HTTP_DNS_TTL", "300"))
+    QWEN_CONNECT_TIMEOUT: float = float(os.getenv("QWEN_CONNECT_TIMEOUT", "10"))
+    QWEN_READ_TIMEOUT: float = float(os.getenv("QWEN_READ_TIMEOUT", "90"))
+    QWEN_TOTAL_TIMEOUT: float = float(os.getenv("QWEN_TOTAL_TIMEOUT", "120"))
+
+    # Servidor de producción (gunicorn con workers de uvicorn, ver gunicorn.conf.py)
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    # 0 = un worker por CPU
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", "10000"))
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000"))
+    # Por defecto, lo que puede durar una llamada a QWEN más un margen
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", str(int(QWEN_TOTAL_TIMEOUT) + 10)))
+    SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "5"))
+
+    # Grabación y reproducción del tráfico con QWEN (passthrough, record o replay)
+    QWEN_TRANSPORT_MODE: str = os.getenv("QWEN_TRANSPORT_MODE", "passthrough").lower()
+    QWEN_TRAFFIC_ARCHIVE: str = os.getenv("QWEN_TRAFFIC_ARCHIVE", "qwen_traffic.jsonl.gz")
+    QWEN_REPLAY_LATENCY: bool = os.getenv("QWEN_REPLAY_LATENCY", "false").lower() == "true"
+    QWEN_REPLAY_ON_MISS: str = os.getenv("QWEN_REPLAY_ON_MISS", "error").lower()
+    
+    # Caché de componentes generados (memoria LRU + nivel opcional en disco)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+    RESULT_CACHE_TTL: float = float(os.getenv("RESULT_CACHE_TTL", "86400"))
+    RESULT_CACHE_DISK_PATH: str = os.getenv("RESULT_CACHE_DISK_PATH", "")
+    RESULT_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_DISK_MAX_ENTRIES", "20000"))
+    
+    # Respuesta directa desde plantillas para prompts clasificados con suficiente confianza
+    TEMPLATE_MATCH_THRESHOLD: float = float(os.getenv("TEMPLATE_MATCH_THRESHOLD", "0.75"))
+    
+    # Índice de prompts casi duplicados (MinHash/LSH): serve, preview u off
+    SIMILARITY_MODE: str = os.getenv("SIMILARITY_MODE", "preview").lower()
+    SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.9"))
+    SIMILARITY_MAX_ENTRIES: int = int(os.getenv("SIMILARITY_MAX_ENTRIES", "5000"))
+    SIMILARITY_NUM_PERM: int = int(os.getenv("SIMILARITY_NUM_PERM", "64"))
+    SIMILARITY_BANDS: int = int(os.getenv("SIMILARITY_BANDS", "16"))
+    
+    # Formateador del código de los componentes: regex (cascada de expresiones regulares, la más
+    # rápida) o tokenizer (app/api/chat/formatter.py, indenta correctamente todo el componente)
+    CODE_FORMATTER: str = os.getenv("CODE_FORMATTER", "regex").lower()
+    
+    # Generación por lotes (/generate-components)
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "20"))
+    
+    # Caché de conversiones de componentes a otros lenguajes (/convert), independiente del de componentes
+    CONVERT_CACHE_ENABLED: bool = os.getenv("CONVERT_CACHE_ENABLED", "true").lower() == "true"
+    CONVERT_CACHE_MAX_ENTRIES: int = int(os.getenv("CONVERT_CACHE_MAX_ENTRIES", "5000"))
+    CONVERT_CACHE_TTL: float = float(os.getenv("CONVERT_CACHE_TTL", "86400"))
+    CONVERT_CACHE_DISK_PATH: str = os.getenv("CONVERT_CACHE_DISK_PATH", "")
+    CONVERT_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("CONVERT_CACHE_DISK_MAX_ENTRIES", "20000"))
+    
+    # Respuestas: api_debug solo si se permite y el cliente lo pide (include_debug) y compresión gzip/brotli
+    API_DEBUG_ENABLED: bool = os.getenv("API_DEBUG_ENABLED", "false").lower() == "true"
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    
+    # Limitador adaptativo (AIMD) de llamadas concurrentes a QWEN
+    LIMITER_ENABLED: bool = os.getenv("LIMITER_ENABLED", "true").lower() == "true"
+    LIMITER_INITIAL_LIMIT: int = int(os.getenv("LIMITER_INITIAL_LIMIT", "20"))
+    LIMITER_MIN_LIMIT: int = int(os.getenv("LIMITER_MIN_LIMIT", "2"))
+    LIMITER_MAX_LIMIT: int = int(os.getenv("LIMITER_MAX_LIMIT", "100"))
+    LIMITER_MAX_QUEUE: int = int(os.getenv("LIMITER_MAX_QUEUE", "50"))
+    LIMITER_QUEUE_TIMEOUT: float = float(os.getenv("LIMITER_QUEUE_TIMEOUT", "30"))
+    LIMITER_LATENCY_TARGET: float = float(os.getenv("LIMITER_LATENCY_TARGET", "40"))
+    LIMITER_BACKOFF: float = float(os.getenv("LIMITER_BACKOFF", "0.75"))
+    
+    # Reintentos con espera exponencial y peticiones duplicadas (hedging) hacia QWEN
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY: float = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+    RETRY_MAX_DELAY: float = float(os.getenv("RETRY_MAX_DELAY", "8"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_RESERVE: float = float(os.getenv("RETRY_BUDGET_RESERVE", "10"))
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    
+    # Circuit breaker de las llamadas a QWEN
+    BREAKER_ENABLED: bool = os.getenv("BREAKER_ENABLED", "true").lower() == "true"
+    BREAKER_WINDOW_SECONDS: float = float(os.getenv("BREAKER_WINDOW_SECONDS", "60"))
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+    BREAKER_FAILURE_RATE: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "60"))
+    BREAKER_SLOW_CALL_RATE: float = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.8"))
+    BREAKER_OPEN_SECONDS: float = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+    BREAKER_HALF_OPEN_CALLS: int = int(os.getenv("BREAKER_HALF_OPEN_CALLS", "1"))
+    
+    # Logs: nivel, formato (text o json), fracción de cuerpos registrados en DEBUG y tamaño de la cola
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+    LOG_PAYLOAD_SAMPLE_RATE: float = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    
+    # Endpoint /metrics en formato Prometheus
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Añadir la etiqueta worker (pid del proceso) a cada métrica, para distinguir los workers de gunicorn
+    METRICS_WORKER_LABEL: bool = os.getenv("METRICS_WORKER_LABEL", "true").lower() == "true"
+    
+    # Perfilado bajo demanda (cabecera X-Profile y endpoints /admin); desactivado no añade coste
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_KEEP: int = int(os.getenv("PROFILING_KEEP", "20"))
+    PROFILING_MAX_SAMPLE_SECONDS: float = float(os.getenv("PROFILING_MAX_SAMPLE_SECONDS", "60"))
+    
     # Configuración de la base de datos (si se usa en el futuro)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     
@@ -24,4 +136,4 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 # Crear instancia de configuración
-settings = Settings() 
\ No newline at end of file
+settings = Settings() 
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Any, Awaitable, Iterator, Optional, Union
+
+from starlette.requests import Request
+
+
+class SharedDeadline:
+    """
+    Plazo ampliable de una tarea compartida entre varias solicitudes.
+
+    El contexto guarda el objeto y no un instante fijo, así que las esperas
+    y timeouts que la tarea (o las subtareas que cree) calcule después de
+    ampliarlo ya usan el nuevo plazo. at es None si no hay plazo.
+    """
+
+    __slots__ = ("at",)
+
+    def __init__(self, at: Optional[float]):
+        self.at = at
+
+
+# Instante (time.monotonic) en que vence la solicitud en curso, el plazo compartido
+# de una tarea común a varias solicitudes, o None si no tiene plazo
+_deadline: ContextVar[Union[None, float, SharedDeadline]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """El plazo de la solicitud venció antes de obtener la respuesta."""
+
+    def __init__(self, message: str = "Plazo de la solicitud agotado"):
+        super().__init__(message)
+
+
+class ClientDisconnected(Exception):
+    """El cliente cerró la conexión antes de recibir la respuesta."""
+
+
+def current_deadline() -> Optional[float]:
+    """Instante (time.monotonic) en que vence la solicitud en curso, o None si no tiene plazo."""
+    deadline = _deadline.get()
+    if isinstance(deadline, SharedDeadline):
+        return deadline.at
+    return deadline
+
+
+def remaining() -> Optional[float]:
+    """Segundos que le quedan a la solicitud en curso (None si no tiene plazo)."""
+    deadline = current_deadline()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """Lanza DeadlineExceeded si el plazo de la solicitud ya venció."""
+    if expired():
+        raise DeadlineExceeded()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Establece un plazo para el código del bloque y las tareas que cree.
+
+    Si ya hay un plazo más cercano, se mantiene: un plazo interno nunca
+    puede alargar el de la solicitud que lo contiene.
+
+    Args:
+        seconds: Segundos disponibles desde ahora (None = sin plazo adicional)
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = current_deadline()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def context_with_deadline(deadline: SharedDeadline) -> Context:
+    """
+    Copia del contexto actual con un plazo compartido en lugar del de la
+    solicitud, para tareas que no pertenecen a una sola solicitud.
+    """
+    context = copy_context()
+    context.run(_deadline.set, deadline)
+    return context
+
+
+async def within_deadline(awaitable: Awaitable[Any]) -> Any:
+    """
+    Espera awaitable como mucho hasta que venza el plazo en curso.
+
+    El plazo se vuelve a leer cuando vence: si mientras tanto se amplió
+    (un SharedDeadline al que se unió una solicitud con más margen), se
+    sigue esperando en lugar de abandonar la llamada.
+
+    Raises:
+        DeadlineExceeded: Si el plazo vence antes de que termine
+    """
+    work = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            left = remaining()
+            done, _ = await asyncio.wait((work,), timeout=None if left is None else max(left, 0))
+            if done:
+                return work.result()
+            if expired():
+                raise DeadlineExceeded()
+    finally:
+        if not work.done():
+            work.cancel()
+
+
+def request_timeout(*candidates: Optional[float]) -> Optional[float]:
+    """El plazo más corto entre los indicados (cabecera, campo del cuerpo...), ignorando los vacíos."""
+    values = [value for value in candidates if value is not None and value > 0]
+    return min(values) if values else None
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[Any]) -> Any:
+    """
+    Ejecuta awaitable y lo cancela si el cliente se desconecta antes de que termine.
+
+    Raises:
+        ClientDisconnected: Si el cliente cerró la conexión
+    """
+    work = asyncio.ensure_future(awaitable)
+
+    async def wait_for_disconnect() -> None:
+        # El cuerpo ya se leyó, así que el siguiente mensaje solo llega al desconectarse
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    watcher = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if not work.done():
+        work.cancel()
+        raise ClientDisconnected()
+    return work.result()
@@ -0,0 +1,238 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, check, remaining, within_deadline
+from app.core.metrics import UPSTREAM_DURATION
+from app.core.transport import HttpTransport, UpstreamStatusError, build_transport
+
+
+class UpstreamClient:
+    """
+    Cliente HTTP de larga vida para las llamadas a QWEN.
+
+    Mantiene un único aiohttp.ClientSession con un pool de conexiones
+    keep-alive y caché de DNS, de modo que las peticiones reutilizan
+    conexiones TCP/TLS ya abiertas en lugar de crear una por cada componente.
+
+    Las peticiones pasan por un transporte (app.core.transport) que, según
+    QWEN_TRANSPORT_MODE, las envía al proveedor, además las graba, o las
+    responde desde un archivo grabado.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = settings.QWEN_HTTP_POOL_SIZE,
+        pool_size_per_host: int = settings.QWEN_HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout: float = settings.QWEN_HTTP_KEEPALIVE_TIMEOUT,
+        dns_ttl: int = settings.QWEN_HTTP_DNS_TTL,
+        connect_timeout: float = settings.QWEN_CONNECT_TIMEOUT,
+        read_timeout: float = settings.QWEN_READ_TIMEOUT,
+        total_timeout: float = settings.QWEN_TOTAL_TIMEOUT,
+        transport: Optional[HttpTransport] = None,
+    ):
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout,
+            connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+        self.transport = transport or build_transport()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._requests_total = 0
+        self._errors_total = 0
+        self._in_flight = 0
+        self._started_at: Optional[float] = None
+
+    async def start(self) -> None:
+        """Crea la sesión y el pool de conexiones si aún no existen."""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_ttl,
+            enable_cleanup_closed=True,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        self._started_at = time.monotonic()
+        await self.transport.open()
+
+    async def close(self) -> None:
+        """Cierra la sesión y libera las conexiones del pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await self.transport.close()
+
+    def _request_timeout(self, timeout: Optional[aiohttp.ClientTimeout]) -> Tuple[aiohttp.ClientTimeout, bool]:
+        """
+        Timeout efectivo de una petición: el indicado (o el del cliente),
+        recortado al tiempo que le queda a la solicitud en curso.
+
+        Returns:
+            tuple: (timeout, si lo limita el plazo de la solicitud)
+        """
+        timeout = timeout or self.timeout
+        left = remaining()
+        if left is None or (timeout.total is not None and left >= timeout.total):
+            return timeout, False
+        if left <= 0:
+            raise DeadlineExceeded()
+        return aiohttp.ClientTimeout(
+            total=left,
+            connect=min(timeout.connect, left) if timeout.connect else left,
+            sock_read=min(timeout.sock_read, left) if timeout.sock_read else left,
+        ), True
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("UpstreamClient no iniciado; llame a start() primero")
+        return self._session
+
+    async def post_json(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> Dict[str, Any]:
+        """
+        Envía un POST con cuerpo JSON y devuelve el estado y el texto de la respuesta.
+
+        Args:
+            url: URL de destino
+            headers: Cabeceras de la petición
+            payload: Cuerpo JSON
+            timeout: Timeout específico para esta petición (opcional)
+
+        Returns:
+            Dict: {"status": int, "text": str, "elapsed": float}
+
+        Raises:
+            DeadlineExceeded: Si vence el plazo de la solicitud en curso
+        """
+        await self.start()
+        check()
+        self._requests_total += 1
+        self._in_flight += 1
+        start = time.perf_counter()
+        status = "error"
+        try:
+            # El plazo no recorta el timeout de aiohttp: si la llamada es compartida,
+            # within_deadline sigue esperando cuando se une una solicitud con más margen
+            code, text = await within_deadline(
+                self.transport.post_json(self.session, url, headers, payload, timeout or self.timeout)
+            )
+            status = str(code)
+            return {
+                "status": code,
+                "text": text,
+                "elapsed": time.perf_counter() - start,
+            }
+        except DeadlineExceeded:
+            status = "deadline"
+            raise
+        except asyncio.TimeoutError:
+            status = "timeout"
+            self._errors_total += 1
+            raise
+        except aiohttp.ClientError:
+            self._errors_total += 1
+            raise
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            self._in_flight -= 1
+            UPSTREAM_DURATION.observe(time.perf_counter() - start, call="generate", status=status)
+
+    async def stream_lines(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Envía un POST con cuerpo JSON y produce la respuesta línea a línea
+        a medida que llega (por ejemplo, un flujo de Server-Sent Events).
+
+        Raises:
+            UpstreamStatusError: Si la respuesta no tiene estado 200
+            DeadlineExceeded: Si vence el plazo de la solicitud en curso
+        """
+        await self.start()
+        timeout, by_deadline = self._request_timeout(timeout)
+        self._requests_total += 1
+        self._in_flight += 1
+        start = time.perf_counter()
+        status = "error"
+        lines = self.transport.stream_lines(self.session, url, headers, payload, timeout)
+        try:
+            async for line in lines:
+                yield line
+            status = "200"
+        except asyncio.TimeoutError as e:
+            if by_deadline:
+                status = "deadline"
+                raise DeadlineExceeded() from e
+            status = "timeout"
+            self._errors_total += 1
+            raise
+        except aiohttp.ClientError:
+            status = "error"
+            self._errors_total += 1
+            raise
+        except UpstreamStatusError as e:
+            status = str(e.status)
+            self._errors_total += 1
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            status = "cancelled"
+            raise
+        finally:
+            # Cerrar el flujo del transporte (y la respuesta) aunque el consumidor lo abandone
+            await lines.aclose()
+            self._in_flight -= 1
+            # En streaming la duración cubre hasta el último fragmento
+            UPSTREAM_DURATION.observe(time.perf_counter() - start, call="stream", status=status)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas del pool de conexiones y de uso del cliente."""
+        connector = self._session.connector if self._session is not None else None
+        idle = 0
+        acquired = 0
+        if connector is not None:
+            # aiohttp no expone estos contadores públicamente
+            idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            acquired = len(getattr(connector, "_acquired", ()))
+        return {
+            "started": connector is not None and not self._session.closed,
+            "pool_size": self.pool_size,
+            "pool_size_per_host": self.pool_size_per_host,
+            "connections_idle": idle,
+            "connections_in_use": acquired,
+            "requests_in_flight": self._in_flight,
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "uptime_seconds": round(time.monotonic() - self._started_at, 1) if self._started_at else 0.0,
+            "transport": self.transport.stats(),
+        }
+
+
+# Instancia compartida por toda la aplicación (su ciclo de vida lo gestiona app.main)
+upstream_client = UpstreamClient()
+
+
+def get_upstream_client() -> UpstreamClient:
+    return upstream_client
@@ -0,0 +1,208 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Tuple, Type
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, expired, remaining
+
+
+class LimiterRejected(Exception):
+    """La cola de espera del limitador está llena o la espera superó su timeout."""
+
+    def __init__(self, retry_after: int, reason: str = "queue_full"):
+        super().__init__(f"Demasiadas solicitudes al modelo ({reason}); reintentar en {retry_after}s")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Slot:
+    """Permiso de una llamada en curso; permite marcarla como sobrecarga."""
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.overloaded = False
+
+    def mark_overloaded(self) -> None:
+        """La respuesta indica saturación del proveedor (429, 5xx)."""
+        self.overloaded = True
+
+
+class AdaptiveLimiter:
+    """
+    Limitador de concurrencia adaptativo (AIMD) con cola de espera acotada.
+
+    El límite crece en 1/límite por cada llamada que termina bien por debajo
+    de latency_target (aproximadamente +1 por cada ronda completa de llamadas)
+    y se multiplica por backoff cuando una llamada falla, es marcada como
+    sobrecarga o supera latency_target. Solo las llamadas iniciadas después de
+    la última reducción pueden volver a reducirlo, así que una ráfaga de
+    errores simultáneos cuenta como una sola señal.
+
+    Las llamadas que no caben en el límite esperan en una cola de max_queue
+    posiciones; si está llena, o la espera supera queue_timeout, se rechazan
+    de inmediato con LimiterRejected en lugar de acumularse.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = settings.LIMITER_INITIAL_LIMIT,
+        min_limit: int = settings.LIMITER_MIN_LIMIT,
+        max_limit: int = settings.LIMITER_MAX_LIMIT,
+        max_queue: int = settings.LIMITER_MAX_QUEUE,
+        queue_timeout: float = settings.LIMITER_QUEUE_TIMEOUT,
+        latency_target: float = settings.LIMITER_LATENCY_TARGET,
+        backoff: float = settings.LIMITER_BACKOFF,
+        enabled: bool = settings.LIMITER_ENABLED,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.enabled = enabled
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self._avg_latency = 0.0
+        self._accepted = 0
+        self._queued_total = 0
+        self._rejected = 0
+        self._drops = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _retry_after(self) -> int:
+        # Tiempo aproximado hasta que se vacíe la cola actual
+        latency = self._avg_latency or self.latency_target
+        rounds = (len(self._waiters) + 1) / max(self.limit, 1)
+        return max(1, math.ceil(latency * rounds))
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # El permiso se entrega directamente al siguiente en la cola
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise LimiterRejected(self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued_total += 1
+        queue_until = time.monotonic() + self.queue_timeout
+        try:
+            while True:
+                # No esperar en la cola más allá del plazo de la solicitud. El plazo se
+                # vuelve a leer en cada vuelta por si se amplió mientras esperaba
+                timeout = queue_until - time.monotonic()
+                left = remaining()
+                by_deadline = left is not None and left < timeout
+                if by_deadline:
+                    timeout = left
+                done, _ = await asyncio.wait((waiter,), timeout=max(timeout, 0))
+                if done:
+                    return
+                if not by_deadline or expired():
+                    raise asyncio.TimeoutError()
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # El permiso llegó justo cuando se interrumpía la espera: devolverlo
+                self._in_flight -= 1
+                self._wake_waiters()
+            else:
+                waiter.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                if by_deadline:
+                    raise DeadlineExceeded() from None
+                self._rejected += 1
+                raise LimiterRejected(self._retry_after(), reason="queue_timeout") from None
+            raise
+
+    def _record(self, slot: _Slot, failed: bool) -> None:
+        now = time.monotonic()
+        latency = now - slot.started_at
+        self._avg_latency = latency if not self._avg_latency else 0.8 * self._avg_latency + 0.2 * latency
+
+        if failed or slot.overloaded or latency > self.latency_target:
+            self._drops += 1
+            if slot.started_at >= self._last_decrease:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                self._last_decrease = now
+        else:
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+    @asynccontextmanager
+    async def slot(self, ignore: Tuple[Type[BaseException], ...] = ()) -> AsyncIterator[_Slot]:
+        """
+        Reserva un permiso para una llamada al modelo.
+
+        Las excepciones dentro del bloque cuentan como fallo de la llamada,
+        salvo la cancelación, el fin del plazo de la solicitud y las de los
+        tipos indicados en ignore.
+
+        Raises:
+            LimiterRejected: Si la cola está llena o la espera supera queue_timeout
+            DeadlineExceeded: Si el plazo de la solicitud vence mientras espera en la cola
+        """
+        if not self.enabled:
+            yield _Slot(time.monotonic())
+            return
+
+        await self._acquire()
+        self._accepted += 1
+        slot = _Slot(time.monotonic())
+        failed = True
+        abandoned = False
+        try:
+            yield slot
+            failed = False
+        except (asyncio.CancelledError, GeneratorExit, DeadlineExceeded) + tuple(ignore):
+            # El cliente abandonó la llamada, se agotó su plazo o no llegó a enviarse:
+            # no dice nada sobre la salud del proveedor
+            abandoned = True
+            raise
+        finally:
+            self._in_flight -= 1
+            if not abandoned:
+                self._record(slot, failed)
+            self._wake_waiters()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "avg_latency_seconds": round(self._avg_latency, 3),
+            "accepted_total": self._accepted,
+            "queued_total": self._queued_total,
+            "rejected_total": self._rejected,
+            "drops_total": self._drops,
+        }
+
+
+# Limitador compartido de las llamadas a QWEN
+upstream_limiter = AdaptiveLimiter()
+
+
+def get_upstream_limiter() -> AdaptiveLimiter:
+    return upstream_limiter
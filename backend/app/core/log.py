@@ -0,0 +1,179 @@
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+# Identificador de la solicitud en curso, añadido a cada registro de log
+_request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Logger raíz de la aplicación: los módulos usan logging.getLogger(__name__)
+APP_LOGGER = "app"
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+def get_request_id() -> str:
+    return _request_id.get()
+
+
+class Lazy:
+    """
+    Valor de log que solo se calcula si el registro llega a formatearse.
+
+    Los argumentos de logger.debug(...) se evalúan siempre, pero su
+    conversión a texto no: con Lazy(json.dumps, payload) la serialización
+    solo ocurre si el nivel DEBUG está activo.
+    """
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        self._fn = fn
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._fn(*self._args))
+
+
+def lazy_json(value: Any, limit: int = 200) -> Lazy:
+    """JSON de value truncado a limit caracteres, calculado solo si se registra."""
+    return Lazy(lambda: json.dumps(value, ensure_ascii=False, default=str)[:limit])
+
+
+def payload_sampled(logger: logging.Logger) -> bool:
+    """
+    Indica si registrar el contenido de esta petición o respuesta.
+
+    Los cuerpos completos solo se registran en DEBUG y para una fracción
+    LOG_PAYLOAD_SAMPLE_RATE de las solicitudes.
+    """
+    return logger.isEnabledFor(logging.DEBUG) and random.random() < settings.LOG_PAYLOAD_SAMPLE_RATE
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler que descarta registros si la cola está llena en lugar de bloquear."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[_DroppingQueueHandler] = None
+
+
+def setup_logging() -> None:
+    """
+    Configura el logger de la aplicación y arranca el hilo de escritura.
+
+    Los registros se formatean en el hilo que los emite y se pasan por una
+    cola acotada a un QueueListener, que es el único que escribe en stdout.
+    Así el event loop nunca espera a la E/S de los logs. Es idempotente.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    _queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(_RequestIdFilter())
+
+    logger = logging.getLogger(APP_LOGGER)
+    logger.setLevel(settings.LOG_LEVEL)
+    logger.handlers = [_queue_handler]
+    logger.propagate = False
+
+    _listener = QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Escribe los registros pendientes y detiene el hilo de escritura."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que asigna un identificador a cada solicitud.
+
+    Usa la cabecera X-Request-ID del cliente si la envía (para correlacionar
+    con sus propios logs) o genera uno nuevo, lo guarda en el contexto para
+    que aparezca en todos los logs de la solicitud y lo devuelve en la
+    respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next((value for name, value in scope["headers"] if name == REQUEST_ID_HEADER), None)
+        request_id = incoming.decode("latin-1")[:64] if incoming else uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
@@ -0,0 +1,287 @@
+import asyncio
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Límites (en segundos) de los histogramas de latencia de solicitudes y llamadas al modelo
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+# Límites para el post-procesado, que suele tardar microsegundos o pocos milisegundos
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+# Plataformas con etiqueta propia; el resto se agrupa en "other" para acotar las series
+KNOWN_PLATFORMS = ("web", "mobile")
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], *extra: str) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    pairs.extend(label for label in extra if label)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def platform_label(platform: Optional[str]) -> str:
+    platform = (platform or "").lower()
+    return platform if platform in KNOWN_PLATFORMS else "other"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} requiere las etiquetas {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self, const: str = "") -> List[str]:
+        """Líneas de la métrica; const son etiquetas ya formateadas que se añaden a cada muestra."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador monótono, opcionalmente con etiquetas."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self, const: str = "") -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key, const)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Valor que sube y baja (por ejemplo, solicitudes en curso)."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Histograma con límites fijos, en el formato acumulado de Prometheus."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = REQUEST_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por cada combinación de etiquetas: [observaciones por intervalo..., suma]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self, const: str = "") -> List[str]:
+        with self._lock:
+            values = [(key, list(counts)) for key, counts in self._values.items()]
+        lines = self._header()
+        for key, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, const, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key, const)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    Métrica cuyo valor se lee al exponerla, a partir de estado que ya
+    mantiene otro componente (estadísticas del caché, del limitador...).
+
+    callback devuelve un número o, si hay etiquetas, un diccionario de
+    tuplas de valores de etiqueta a número.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        callback: Callable[[], Union[float, Dict[LabelValues, float]]],
+        labelnames: Sequence[str] = (),
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def render(self, const: str = "") -> List[str]:
+        value = self.callback()
+        samples = value.items() if isinstance(value, dict) else [((), value)]
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key, const)} {_format_value(float(sample))}"
+            for key, sample in samples
+        ]
+
+
+class Registry:
+    """Conjunto de métricas expuestas en /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self, const_labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Todas las métricas en el formato de texto de Prometheus (versión 0.0.4).
+
+        Args:
+            const_labels: Etiquetas añadidas a todas las muestras (por ejemplo, el worker)
+        """
+        const = ",".join(f'{name}="{_escape(value)}"' for name, value in (const_labels or {}).items())
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render(const))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def get_registry() -> Registry:
+    return registry
+
+
+REQUEST_DURATION = registry.register(Histogram(
+    "creai_request_duration_seconds",
+    "Duración de las solicitudes de componentes por endpoint, plataforma y resultado.",
+    ("endpoint", "platform", "outcome"),
+))
+
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "creai_requests_in_flight",
+    "Solicitudes de componentes en curso por endpoint.",
+    ("endpoint",),
+))
+
+UPSTREAM_DURATION = registry.register(Histogram(
+    "creai_upstream_request_duration_seconds",
+    "Duración de las llamadas a QWEN por tipo de llamada y estado HTTP (o timeout, error, deadline, cancelled).",
+    ("call", "status"),
+))
+
+STAGE_DURATION = registry.register(Histogram(
+    "creai_pipeline_stage_duration_seconds",
+    "Duración de cada etapa de post-procesado, incluida su comprobación needs_work.",
+    ("pipeline", "stage"),
+    buckets=STAGE_BUCKETS,
+))
+
+FUNCTION_DURATION = registry.register(Histogram(
+    "creai_postprocess_function_duration_seconds",
+    "Duración de las funciones de post-procesado y de construcción de plantillas.",
+    ("function",),
+    buckets=STAGE_BUCKETS,
+))
+
+
+def timed(function_name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorador que registra la duración de cada llamada en FUNCTION_DURATION."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                FUNCTION_DURATION.observe(time.perf_counter() - start, function=function_name)
+        return wrapper
+
+    return decorator
+
+
+class TrackedRequest:
+    """Resultado de una solicitud en seguimiento; el endpoint asigna outcome antes de responder."""
+
+    __slots__ = ("outcome",)
+
+    def __init__(self):
+        self.outcome = "error"
+
+
+@contextmanager
+def track_request(endpoint: str, platform: Optional[str]) -> Iterator[TrackedRequest]:
+    """
+    Mide la duración de una solicitud y la cuenta como en curso mientras dura.
+
+    El resultado es el outcome asignado dentro del bloque: model, cache,
+    similar, template, fallback, converted, not_found, rejected, disconnected
+    o error (por defecto).
+    Si el bloque se cancela, cuenta como disconnected.
+    """
+    tracked = TrackedRequest()
+    REQUESTS_IN_FLIGHT.inc(endpoint=endpoint)
+    start = time.perf_counter()
+    try:
+        yield tracked
+    except (asyncio.CancelledError, GeneratorExit):
+        tracked.outcome = "disconnected"
+        raise
+    finally:
+        REQUESTS_IN_FLIGHT.dec(endpoint=endpoint)
+        REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            endpoint=endpoint,
+            platform=platform_label(platform),
+            outcome=tracked.outcome,
+        )
@@ -0,0 +1,219 @@
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.log import get_request_id
+
+PROFILE_HEADER = b"x-profile"
+TOKEN_HEADER = b"x-profile-token"
+
+# Funciones que se listan en el resumen de cada perfil
+SUMMARY_LINES = 40
+
+
+class ProfileRecord(NamedTuple):
+    """Perfil de una solicitud: resumen legible y estadísticas en formato pstats."""
+    request_id: str
+    method: str
+    path: str
+    created_at: float
+    wall_seconds: float
+    summary: str
+    stats: bytes
+
+
+def token_matches(token: Optional[str]) -> bool:
+    """Comprueba el token de perfilado; sin PROFILING_TOKEN configurado no acepta ninguno."""
+    if not settings.PROFILING_TOKEN:
+        return False
+    return token is not None and hmac.compare_digest(token, settings.PROFILING_TOKEN)
+
+
+def _summarize(profiler: cProfile.Profile) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(SUMMARY_LINES)
+    return stream.getvalue()
+
+
+class ProfileStore:
+    """Últimos perfiles de solicitudes, en memoria y con un máximo de entradas."""
+
+    def __init__(self, keep: int = settings.PROFILING_KEEP):
+        self.keep = keep
+        self._records: "OrderedDict[str, ProfileRecord]" = OrderedDict()
+
+    def add(self, record: ProfileRecord) -> None:
+        self._records[record.request_id] = record
+        self._records.move_to_end(record.request_id)
+        while len(self._records) > self.keep:
+            self._records.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[ProfileRecord]:
+        return self._records.get(request_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "request_id": record.request_id,
+                "method": record.method,
+                "path": record.path,
+                "created_at": record.created_at,
+                "wall_seconds": round(record.wall_seconds, 4),
+            }
+            for record in reversed(self._records.values())
+        ]
+
+
+profile_store = ProfileStore()
+
+
+def get_profile_store() -> ProfileStore:
+    return profile_store
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila con cProfile las solicitudes con la cabecera X-Profile.
+
+    El perfil se guarda en ProfileStore con el identificador de la solicitud,
+    que se devuelve en la cabecera X-Profile-Id. cProfile mide el hilo
+    completo: si mientras tanto el event loop ejecuta otras solicitudes,
+    también aparecen en el perfil, así que conviene usarlo con poca carga.
+    Solo se perfila una solicitud a la vez; si ya hay otra en curso, la
+    respuesta lleva X-Profile: busy.
+
+    Solo se instala con PROFILING_ENABLED=true, de modo que desactivado no
+    añade ningún coste por solicitud.
+    """
+
+    def __init__(self, app, store: Optional[ProfileStore] = None):
+        self.app = app
+        self.store = store or profile_store
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if PROFILE_HEADER not in headers:
+            await self.app(scope, receive, send)
+            return
+        token = headers.get(TOKEN_HEADER)
+        if not token_matches(token.decode("latin-1") if token is not None else None):
+            await self.app(scope, receive, send)
+            return
+
+        if self._active:
+            await self.app(scope, receive, self._with_header(send, b"x-profile", b"busy"))
+            return
+
+        request_id = get_request_id()
+        profiler = cProfile.Profile()
+        self._active = True
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, self._with_header(send, b"x-profile-id", request_id.encode("latin-1")))
+        finally:
+            profiler.disable()
+            wall_seconds = time.perf_counter() - start
+            self._active = False
+            profiler.create_stats()
+            # Serializar antes del resumen: pstats.Stats vacía profiler.stats al cargarlo
+            raw_stats = marshal.dumps(profiler.stats)
+            self.store.add(ProfileRecord(
+                request_id=request_id,
+                method=scope.get("method", ""),
+                path=scope.get("path", ""),
+                created_at=time.time(),
+                wall_seconds=wall_seconds,
+                summary=_summarize(profiler),
+                stats=raw_stats,
+            ))
+
+    @staticmethod
+    def _with_header(send, name: bytes, value: bytes):
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=list(message.get("headers", [])) + [(name, value)])
+            await send(message)
+        return send_with_header
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+
+class StackSampler:
+    """
+    Muestreo de las pilas de todos los hilos del proceso.
+
+    Un hilo aparte lee sys._current_frames() cada interval segundos y
+    acumula cada pila en formato "collapsed" (hilo;marco;marco... N), el que
+    usan flamegraph.pl y speedscope. Solo se ve el código que se está
+    ejecutando: las corrutinas suspendidas en un await no aparecen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def sample(self, seconds: float, interval: float) -> Dict[str, int]:
+        """
+        Muestrea durante seconds segundos (bloquea el hilo que lo llama).
+
+        Returns:
+            Dict: Número de muestras de cada pila colapsada
+
+        Raises:
+            RuntimeError: Si ya hay otro muestreo en curso
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Ya hay un muestreo en curso")
+        try:
+            own_id = threading.get_ident()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks: Counter = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    labels.append(names.get(thread_id, str(thread_id)))
+                    stacks[";".join(reversed(labels))] += 1
+                time.sleep(interval)
+            return dict(stacks)
+        finally:
+            self._lock.release()
+
+
+stack_sampler = StackSampler()
+
+
+def get_stack_sampler() -> StackSampler:
+    return stack_sampler
+
+
+def collapsed_text(stacks: Dict[str, int]) -> str:
+    """Pilas colapsadas, una por línea y ordenadas de más a menos muestras."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
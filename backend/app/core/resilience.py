@@ -0,0 +1,235 @@
+import asyncio
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.deadline import remaining
+from app.core.http_client import UpstreamStatusError
+
+# Estados HTTP que indican un fallo transitorio del proveedor
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Errores de red que merece la pena reintentar
+RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ServerTimeoutError, asyncio.TimeoutError)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Indica si una excepción de la llamada al proveedor es transitoria."""
+    if isinstance(error, UpstreamStatusError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class RetryBudget:
+    """
+    Presupuesto global de reintentos.
+
+    Cada llamada original deposita ratio fichas y cada reintento o petición
+    duplicada gasta una, con un máximo de reserve fichas acumuladas. Así los
+    reintentos nunca superan aproximadamente ratio veces el tráfico normal
+    y no pueden multiplicar la carga durante una caída del proveedor.
+    """
+
+    def __init__(self, ratio: float, reserve: float):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = reserve
+        self._exhausted = 0
+
+    def deposit(self) -> None:
+        self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Gasta una ficha si hay saldo; devuelve False si el presupuesto está agotado."""
+        if self._balance >= 1:
+            self._balance -= 1
+            return True
+        self._exhausted += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "balance": round(self._balance, 2),
+            "ratio": self.ratio,
+            "reserve": self.reserve,
+            "exhausted_total": self._exhausted,
+        }
+
+
+class LatencyTracker:
+    """Ventana deslizante de latencias de las últimas llamadas correctas."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int = 1) -> Optional[float]:
+        """Percentil de la ventana, o None si aún no hay min_samples muestras."""
+        if len(self._samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ResilientCaller:
+    """
+    Llamadas al proveedor con reintentos y peticiones duplicadas (hedging).
+
+    Los fallos transitorios (estados en RETRYABLE_STATUSES y errores de red)
+    se reintentan hasta max_attempts veces con espera exponencial con jitter
+    completo: un valor aleatorio entre 0 y min(max_delay, base_delay * 2^intento).
+
+    Con hedging activo, si una llamada tarda más que el percentil observado
+    (p95 por defecto), se lanza una segunda petición idéntica y se usa la
+    primera que termine bien; la otra se cancela. Reintentos y duplicados
+    gastan del mismo RetryBudget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = settings.RETRY_MAX_ATTEMPTS,
+        base_delay: float = settings.RETRY_BASE_DELAY,
+        max_delay: float = settings.RETRY_MAX_DELAY,
+        budget_ratio: float = settings.RETRY_BUDGET_RATIO,
+        budget_reserve: float = settings.RETRY_BUDGET_RESERVE,
+        hedge_enabled: bool = settings.HEDGE_ENABLED,
+        hedge_percentile: float = settings.HEDGE_PERCENTILE,
+        hedge_min_samples: int = settings.HEDGE_MIN_SAMPLES,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.budget = RetryBudget(budget_ratio, budget_reserve)
+        self.latencies = LatencyTracker()
+        self._calls = 0
+        self._retries = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Espera antes del reintento número attempt (empezando en 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def allow_retry(self) -> bool:
+        """Consume presupuesto para un reintento; False si no queda."""
+        if self.budget.withdraw():
+            self._retries += 1
+            return True
+        return False
+
+    def start_call(self) -> None:
+        """Registra una llamada original (repone el presupuesto de reintentos)."""
+        self._calls += 1
+        self.budget.deposit()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Segundos tras los que duplicar la petición, o None si no procede."""
+        if not self.hedge_enabled:
+            return None
+        return self.latencies.percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    async def call(self, send: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Ejecuta send() con reintentos y, si procede, con una petición duplicada.
+
+        Args:
+            send: Función sin argumentos que hace la petición y devuelve
+                {"status": int, "text": str, "elapsed": float}
+
+        Returns:
+            Dict: Última respuesta obtenida (puede tener un estado de error si
+                se agotaron los intentos o el presupuesto)
+
+        No se reintenta si la espera consumiría el plazo de la solicitud en curso.
+
+        Raises:
+            Exception: El último error de red si ningún intento obtuvo respuesta
+        """
+        self.start_call()
+        attempt = 1
+        while True:
+            delay = self.backoff(attempt)
+            try:
+                response = await self._hedged(send)
+            except Exception as e:
+                if not is_retryable_error(e) or attempt >= self.max_attempts or not self.fits_deadline(delay) or not self.allow_retry():
+                    raise
+            else:
+                if response["status"] == 200:
+                    self.latencies.record(response.get("elapsed", 0.0))
+                    return response
+                if response["status"] not in RETRYABLE_STATUSES or attempt >= self.max_attempts or not self.fits_deadline(delay) or not self.allow_retry():
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def fits_deadline(delay: float) -> bool:
+        """Indica si tras esperar delay segundos aún quedaría plazo para otro intento."""
+        left = remaining()
+        return left is None or left > delay
+
+    async def _hedged(self, send: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await send()
+
+        primary = asyncio.ensure_future(send())
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self.budget.withdraw():
+                return await primary
+
+            self._hedges += 1
+            hedge = asyncio.ensure_future(send())
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            failed_response: Optional[Dict[str, Any]] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif task.result()["status"] != 200:
+                        # Una respuesta de error solo se usa si la otra petición tampoco responde bien
+                        failed_response = task.result()
+                    else:
+                        if task is hedge:
+                            self._hedge_wins += 1
+                        return task.result()
+            if failed_response is not None:
+                return failed_response
+            raise error
+        finally:
+            # La petición más lenta (o ambas, si se cancela la llamada) no debe quedar huérfana
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.latencies.percentile(0.95)
+        return {
+            "calls_total": self._calls,
+            "retries_total": self._retries,
+            "hedges_total": self._hedges,
+            "hedge_wins_total": self._hedge_wins,
+            "hedge_enabled": self.hedge_enabled,
+            "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+            "retry_budget": self.budget.stats(),
+        }
+
+
+# Política compartida de reintentos hacia QWEN
+upstream_resilience = ResilientCaller()
+
+
+def get_upstream_resilience() -> ResilientCaller:
+    return upstream_resilience
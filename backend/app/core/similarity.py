@@ -0,0 +1,244 @@
+import re
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple
+
+from app.api.chat.classifier import normalize_text, prompt_features
+from app.core.config import settings
+
+# Palabras sin contenido que no distinguen un prompt de otro ("a", "in", "de", "con"...)
+STOPWORDS: FrozenSet[str] = frozenset("""
+a an and the of in on with for to by at or as is it this that be please make create
+generate build give me some using use style styled component
+un una unos unas el la los las de del en con para por y o que al se su sus
+genera generar crea crear haz hacer dame componente estilo
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Primo de Mersenne 2^61 - 1 para las permutaciones (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def prompt_shingles(prompt: str) -> Set[str]:
+    """
+    Convierte un prompt en su conjunto de shingles.
+
+    Cada palabra con contenido, sin la "s" final del plural, aporta la
+    palabra completa y sus trigramas de caracteres, de modo que el orden de
+    las palabras y el plural ("button"/"buttons") no importan y una errata
+    sigue compartiendo la mayoría de shingles.
+
+    Args:
+        prompt: Descripción del componente escrita por el usuario
+
+    Returns:
+        set: Shingles del prompt (vacío si no tiene palabras con contenido)
+    """
+    shingles = set()
+    for word in _WORD.findall(normalize_text(prompt)):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word[-1] == "s" and word[-2] != "s":
+            word = word[:-1]
+        shingles.add(word)
+        padded = f"_{word}_"
+        for start in range(len(padded) - 2):
+            shingles.add(padded[start:start + 3])
+    return shingles
+
+
+class SimilarMatch(NamedTuple):
+    """Entrada del índice parecida al prompt consultado."""
+    key: str
+    prompt: str
+    score: float   # Similitud de Jaccard entre los shingles de ambos prompts (0.0 - 1.0)
+    value: Any
+
+
+class _Entry(NamedTuple):
+    platform: str
+    prompt: str
+    shingles: FrozenSet[str]
+    features: FrozenSet[str]
+    signature: Tuple[int, ...]
+    buckets: Tuple[Tuple[str, int, Tuple[int, ...]], ...]
+    value: Any
+
+
+class SimilarityIndex:
+    """
+    Índice local de prompts ya generados para encontrar casi duplicados.
+
+    Cada prompt se resume en una firma MinHash de num_perm valores, cuya
+    fracción de coincidencias con otra firma estima la similitud de Jaccard
+    entre sus shingles. La firma se divide en bandas (LSH): dos prompts son
+    candidatos si coinciden en todas las filas de alguna banda, así que una
+    consulta solo compara con unas pocas entradas en lugar de con todas.
+
+    Los candidatos se puntúan con la similitud de Jaccard exacta de sus
+    shingles, no con la estimada por la firma: con 64 permutaciones la
+    estimación se desvía más de 0.1, suficiente para que dos prompts que
+    solo difieren en una palabra superen el umbral. Además, ambos prompts
+    deben pedir los mismos rasgos visuales (tema oscuro, barra lateral,
+    shadcn), porque una sola palabra como "dark" cambia el componente.
+
+    Las entradas se guardan por plataforma en un LRU de max_entries; al
+    desalojar una entrada también se retira de sus buckets. Todo se calcula
+    en local, sin servicios externos.
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.SIMILARITY_THRESHOLD,
+        max_entries: int = settings.SIMILARITY_MAX_ENTRIES,
+        num_perm: int = settings.SIMILARITY_NUM_PERM,
+        bands: int = settings.SIMILARITY_BANDS,
+        enabled: bool = settings.SIMILARITY_MODE != "off",
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser múltiplo de bands")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.enabled = enabled
+
+        # Coeficientes fijos para que las firmas sean reproducibles entre reinicios
+        self._permutations = [
+            (zlib.crc32(b"a%d" % index) | 1, zlib.crc32(b"b%d" % index))
+            for index in range(num_perm)
+        ]
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def signature(self, shingles: Set[str]) -> Tuple[int, ...]:
+        """Firma MinHash de un conjunto de shingles no vacío."""
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        return tuple(
+            min((a * value + b) % _PRIME for value in hashes) & _MAX_HASH
+            for a, b in self._permutations
+        )
+
+    def _bucket_keys(self, platform: str, signature: Tuple[int, ...]) -> Tuple[Tuple[str, int, Tuple[int, ...]], ...]:
+        rows = self.rows
+        return tuple(
+            (platform, band, signature[band * rows:(band + 1) * rows])
+            for band in range(self.bands)
+        )
+
+    @staticmethod
+    def _jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+        return len(first & second) / len(first | second)
+
+    def query(self, prompt: str, platform: str) -> Optional[SimilarMatch]:
+        """
+        Busca la entrada más parecida al prompt en la misma plataforma.
+
+        Args:
+            prompt: Descripción del componente
+            platform: Plataforma objetivo (web o mobile)
+
+        Returns:
+            SimilarMatch: Mejor coincidencia con similitud >= threshold, o None
+        """
+        if not self.enabled or not self._entries:
+            return None
+        shingles = frozenset(prompt_shingles(prompt))
+        if not shingles:
+            return None
+
+        features = frozenset(prompt_features(prompt))
+        signature = self.signature(shingles)
+        candidates: Set[str] = set()
+        for bucket in self._bucket_keys(platform.strip().lower(), signature):
+            candidates.update(self._buckets.get(bucket, ()))
+
+        best: Optional[SimilarMatch] = None
+        for key in candidates:
+            entry = self._entries[key]
+            if entry.features != features:
+                continue
+            score = self._jaccard(shingles, entry.shingles)
+            if score >= self.threshold and (best is None or score > best.score):
+                best = SimilarMatch(key, entry.prompt, round(score, 3), entry.value)
+
+        if best is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(best.key)
+        self._hits += 1
+        return best
+
+    def add(self, key: str, prompt: str, platform: str, value: Any) -> None:
+        """
+        Indexa un resultado generado.
+
+        Args:
+            key: Identificador de la entrada (la clave del caché exacto)
+            prompt: Descripción del componente
+            platform: Plataforma objetivo
+            value: Resultado que se servirá a los prompts parecidos
+        """
+        if not self.enabled:
+            return
+        shingles = frozenset(prompt_shingles(prompt))
+        if not shingles:
+            return
+
+        self._discard(key)
+        platform = platform.strip().lower()
+        signature = self.signature(shingles)
+        buckets = self._bucket_keys(platform, signature)
+        self._entries[key] = _Entry(platform, prompt, shingles, frozenset(prompt_features(prompt)), signature, buckets, value)
+        for bucket in buckets:
+            self._buckets.setdefault(bucket, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._evictions += 1
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket in entry.buckets:
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._buckets[bucket]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "mode": settings.SIMILARITY_MODE if self.enabled else "off",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "buckets": len(self._buckets),
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Índice compartido de prompts ya generados
+similarity_index = SimilarityIndex()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    return similarity_index
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.deadline import DeadlineExceeded, SharedDeadline, context_with_deadline, current_deadline, remaining
+
+
+class SingleFlight:
+    """
+    Deduplicación de llamadas en curso.
+
+    La primera solicitud para una clave ejecuta la función y las solicitudes
+    concurrentes con la misma clave esperan ese mismo resultado. La tarea
+    compartida está protegida con asyncio.shield, así que la cancelación de
+    un cliente (por ejemplo, al desconectarse) no la interrumpe para el resto;
+    solo se cancela cuando ya no queda nadie esperándola.
+
+    La tarea tiene como plazo el más lejano entre las solicitudes que la
+    esperan (sin plazo si alguna no lo tiene): se amplía cuando se une una
+    solicitud con más margen y se recorta cuando esa solicitud deja de
+    esperar. Así ninguna hereda el plazo corto de la primera y la llamada al
+    proveedor sigue limitada por el plazo de quien necesita el resultado.
+    Cada solicitud deja de esperar cuando vence su propio plazo.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        # Plazo de cada solicitud que espera la llamada (None = sin plazo)
+        self._waiters: Dict[str, List[Optional[float]]] = {}
+        self._deadlines: Dict[str, SharedDeadline] = {}
+        self._coalesced = 0
+        self._abandoned = 0
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            self._waiters.pop(key, None)
+            self._deadlines.pop(key, None)
+        # Recuperar la excepción evita avisos si nadie llegó a esperar el resultado
+        if not task.cancelled():
+            task.exception()
+
+    def _update_deadline(self, key: str) -> None:
+        deadlines = self._waiters[key]
+        self._deadlines[key].at = None if None in deadlines else max(deadlines)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Ejecuta fn() una sola vez por clave mientras haya una llamada en curso.
+
+        Args:
+            key: Identificador de la llamada
+            fn: Función sin argumentos que devuelve el awaitable a ejecutar
+
+        Returns:
+            tuple: (resultado, si el resultado se compartió con una llamada ya en curso)
+
+        Raises:
+            DeadlineExceeded: Si vence el plazo de esta solicitud antes que la llamada
+        """
+        own_deadline = current_deadline()
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            deadline = SharedDeadline(own_deadline)
+            # La tarea copia el contexto en el que se crea, así que se crea en uno con el plazo compartido
+            task = context_with_deadline(deadline).run(asyncio.ensure_future, fn())
+            self._calls[key] = task
+            self._waiters[key] = []
+            self._deadlines[key] = deadline
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self._coalesced += 1
+
+        self._waiters[key].append(own_deadline)
+        self._update_deadline(key)
+        try:
+            left = remaining()
+            if left is None:
+                return await asyncio.shield(task), shared
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), max(left, 0)), shared
+            except asyncio.TimeoutError:
+                if task.done():
+                    raise
+                raise DeadlineExceeded() from None
+        finally:
+            self._release(key, task, own_deadline)
+
+    def _release(self, key: str, task: asyncio.Task, own_deadline: Optional[float]) -> None:
+        if self._calls.get(key) is not task:
+            return
+        waiters = self._waiters[key]
+        waiters.remove(own_deadline)
+        if task.done():
+            return
+        if not waiters:
+            # Nadie espera ya el resultado: liberar la llamada al proveedor
+            self._abandoned += 1
+            task.cancel()
+        else:
+            self._update_deadline(key)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "coalesced_total": self._coalesced,
+            "abandoned_total": self._abandoned,
+        }
+
+
+# Instancia compartida para las generaciones de componentes
+component_flights = SingleFlight()
+
+
+def get_component_flights() -> SingleFlight:
+    return component_flights
@@ -0,0 +1,301 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from app.core.cache import build_cache_key
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PASSTHROUGH = "passthrough"
+RECORD = "record"
+REPLAY = "replay"
+
+
+class UpstreamStatusError(Exception):
+    """La API respondió con un código HTTP distinto de 200."""
+
+    def __init__(self, status: int, body: str = ""):
+        super().__init__(f"Upstream respondió con estado {status}")
+        self.status = status
+        self.body = body
+
+
+def request_key(url: str, payload: Dict[str, Any]) -> str:
+    """
+    Clave de una petición para el archivo de tráfico: ruta y cuerpo.
+
+    No incluye el host ni las cabeceras (la API key), de modo que el tráfico
+    grabado contra el proveedor se puede reproducir con cualquier URL base.
+    """
+    return build_cache_key(urlsplit(url).path, payload)
+
+
+class HttpTransport:
+    """Envía las peticiones al proveedor (modo passthrough)."""
+
+    mode = PASSTHROUGH
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def post_json(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Tuple[int, str]:
+        """Devuelve (estado, texto de la respuesta)."""
+        async with session.post(url, headers=headers, json=payload, timeout=timeout) as response:
+            return response.status, await response.text()
+
+    async def stream_lines(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> AsyncIterator[str]:
+        """
+        Produce la respuesta línea a línea.
+
+        Raises:
+            UpstreamStatusError: Si la respuesta no tiene estado 200
+        """
+        async with session.post(url, headers=headers, json=payload, timeout=timeout) as response:
+            if response.status != 200:
+                raise UpstreamStatusError(response.status, await response.text())
+            async for raw_line in response.content:
+                yield raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode}
+
+
+class RecordingTransport(HttpTransport):
+    """
+    Envía las peticiones al proveedor y guarda cada par petición/respuesta.
+
+    El archivo es JSONL comprimido con gzip: una línea por petición con su
+    clave, el cuerpo enviado, el estado, el texto de la respuesta o, en
+    streaming, cada línea con el instante en que llegó. Los errores de red y
+    los flujos que el cliente abandona a medias no se guardan.
+
+    Las entradas se serializan, comprimen y escriben en un hilo aparte para
+    no bloquear el event loop; close() espera a que se escriban todas.
+    """
+
+    mode = RECORD
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._recorded = 0
+
+    async def open(self) -> None:
+        if self._writer is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # En modo "ab" cada ejecución añade un miembro gzip nuevo; gzip los lee seguidos
+        archive = gzip.open(self.path, "ab")
+        self._writer = threading.Thread(target=self._write_entries, args=(archive,), name="traffic-recorder", daemon=True)
+        self._writer.start()
+
+    async def close(self) -> None:
+        if self._writer is None:
+            return
+        # El hilo escribe las entradas pendientes, vacía el archivo y lo cierra
+        self._queue.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._writer.join)
+        self._writer = None
+
+    def _write_entries(self, archive: gzip.GzipFile) -> None:
+        """Hilo de escritura: serializa y comprime las entradas fuera del event loop."""
+        try:
+            while True:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+                try:
+                    archive.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+                except (TypeError, ValueError, OSError) as e:
+                    logger.warning("No se pudo grabar la petición %s: %s", entry.get("key"), e)
+        finally:
+            archive.close()
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        if self._writer is None:
+            return
+        self._queue.put(entry)
+        self._recorded += 1
+
+    async def post_json(self, session, url, headers, payload, timeout) -> Tuple[int, str]:
+        start = time.perf_counter()
+        status, text = await super().post_json(session, url, headers, payload, timeout)
+        self._write({
+            "key": request_key(url, payload),
+            "kind": "json",
+            "path": urlsplit(url).path,
+            "payload": payload,
+            "status": status,
+            "text": text,
+            "elapsed": round(time.perf_counter() - start, 4),
+            "recorded_at": time.time(),
+        })
+        return status, text
+
+    async def stream_lines(self, session, url, headers, payload, timeout) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        entry = {
+            "key": request_key(url, payload),
+            "kind": "stream",
+            "path": urlsplit(url).path,
+            "payload": payload,
+            "status": 200,
+            "recorded_at": time.time(),
+        }
+        chunks: List[Tuple[float, str]] = []
+        try:
+            async for line in super().stream_lines(session, url, headers, payload, timeout):
+                chunks.append((round(time.perf_counter() - start, 4), line))
+                yield line
+        except UpstreamStatusError as e:
+            self._write(dict(entry, status=e.status, text=e.body, elapsed=round(time.perf_counter() - start, 4)))
+            raise
+        self._write(dict(entry, chunks=chunks, elapsed=round(time.perf_counter() - start, 4)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "archive": self.path, "recorded": self._recorded, "pending": self._queue.qsize()}
+
+
+class ReplayTransport(HttpTransport):
+    """
+    Responde con el tráfico grabado por RecordingTransport, sin llamar al proveedor.
+
+    Las respuestas se buscan por la clave de la petición. Si la misma
+    petición se grabó varias veces, se sirven en el orden en que se grabaron
+    (y se vuelve a empezar al agotarlas), así que dos ejecuciones con la
+    misma secuencia de peticiones reciben exactamente las mismas respuestas.
+
+    Con emulate_latency se espera lo que tardó la respuesta original (en
+    streaming, cada línea en su instante). Una petición que no está en el
+    archivo recibe un 404, o se envía al proveedor si on_miss es "passthrough".
+    """
+
+    mode = REPLAY
+
+    def __init__(self, path: str, emulate_latency: bool = False, on_miss: str = "error"):
+        self.path = path
+        self.emulate_latency = emulate_latency
+        self.on_miss = on_miss
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._loaded = False
+        self._replayed = 0
+        self._misses = 0
+
+    async def open(self) -> None:
+        if self._loaded:
+            return
+        entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        if os.path.exists(self.path):
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry["key"]].append(entry)
+        else:
+            logger.warning("Archivo de tráfico %s no encontrado: todas las peticiones serán fallos de reproducción", self.path)
+        self._entries = dict(entries)
+        self._loaded = True
+        logger.info("Reproduciendo %d peticiones grabadas de %s", sum(map(len, self._entries.values())), self.path)
+
+    def _next(self, url: str, payload: Dict[str, Any], kind: str) -> Optional[Dict[str, Any]]:
+        key = request_key(url, payload)
+        candidates = [entry for entry in self._entries.get(key, ()) if entry["kind"] == kind]
+        if not candidates:
+            self._misses += 1
+            logger.warning("Petición no grabada (%s): %s", kind, key[:12])
+            return None
+        index = self._cursor[key + kind] % len(candidates)
+        self._cursor[key + kind] += 1
+        self._replayed += 1
+        return candidates[index]
+
+    @staticmethod
+    async def _sleep(seconds: float, timeout: aiohttp.ClientTimeout, start: float) -> None:
+        # Respetar el timeout de la petición como lo haría aiohttp
+        if timeout.total is not None and time.perf_counter() - start + seconds > timeout.total:
+            await asyncio.sleep(max(0.0, timeout.total - (time.perf_counter() - start)))
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(seconds)
+
+    async def post_json(self, session, url, headers, payload, timeout) -> Tuple[int, str]:
+        start = time.perf_counter()
+        entry = self._next(url, payload, "json")
+        if entry is None:
+            if self.on_miss == PASSTHROUGH:
+                return await super().post_json(session, url, headers, payload, timeout)
+            return 404, "Petición no encontrada en el archivo de tráfico"
+        if self.emulate_latency:
+            await self._sleep(entry.get("elapsed", 0.0), timeout, start)
+        return entry["status"], entry.get("text", "")
+
+    async def stream_lines(self, session, url, headers, payload, timeout) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        entry = self._next(url, payload, "stream")
+        if entry is None:
+            if self.on_miss == PASSTHROUGH:
+                async for line in super().stream_lines(session, url, headers, payload, timeout):
+                    yield line
+                return
+            raise UpstreamStatusError(404, "Petición no encontrada en el archivo de tráfico")
+        if entry["status"] != 200:
+            if self.emulate_latency:
+                await self._sleep(entry.get("elapsed", 0.0), timeout, start)
+            raise UpstreamStatusError(entry["status"], entry.get("text", ""))
+        for offset, line in entry.get("chunks", ()):
+            if self.emulate_latency:
+                await self._sleep(max(0.0, offset - (time.perf_counter() - start)), timeout, start)
+            yield line
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "archive": self.path,
+            "recorded_requests": len(self._entries),
+            "replayed": self._replayed,
+            "misses": self._misses,
+            "emulate_latency": self.emulate_latency,
+        }
+
+
+def build_transport(
+    mode: str = settings.QWEN_TRANSPORT_MODE,
+    path: str = settings.QWEN_TRAFFIC_ARCHIVE,
+) -> HttpTransport:
+    """Transporte del cliente de QWEN según QWEN_TRANSPORT_MODE."""
+    if mode == RECORD:
+        return RecordingTransport(path)
+    if mode == REPLAY:
+        return ReplayTransport(path, settings.QWEN_REPLAY_LATENCY, settings.QWEN_REPLAY_ON_MISS)
+    return HttpTransport()
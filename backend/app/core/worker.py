@@ -0,0 +1,21 @@
+from uvicorn.workers import UvicornWorker as _UvicornWorker
+
+# Margen para el cierre de la aplicación (pool de QWEN, caché, logs) antes de que gunicorn mate el worker
+SHUTDOWN_MARGIN_SECONDS = 5
+
+
+class UvicornWorker(_UvicornWorker):
+    """
+    Worker de gunicorn con uvicorn, uvloop y httptools (si están instalados).
+
+    Al recibir SIGTERM, uvicorn deja de aceptar conexiones y espera a que
+    terminen las solicitudes en curso. El UvicornWorker original no limita
+    esa espera, así que una solicitud larga haría que gunicorn matara el
+    worker al vencer graceful_timeout sin ejecutar el cierre de la
+    aplicación. Aquí la espera termina un poco antes, cancelando las
+    solicitudes que queden, para que el lifespan siempre se cierre.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(self.cfg.graceful_timeout - SHUTDOWN_MARGIN_SECONDS, 1)
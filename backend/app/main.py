@@ -1,13 +1,50 @@
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-import os
-from dotenv import load_dotenv
 
 # Import routers
 from app.api.chat.router import router as chat_router
+from app.api.convert.router import router as convert_router
+from app.api.convert.service import get_conversion_cache
+from app.core.http_client import get_upstream_client
+from app.core.cache import get_result_cache
+from app.core.compression import CompressionMiddleware
+from app.core.limiter import LimiterRejected, get_upstream_limiter
+from app.core.log import RequestIdMiddleware, dropped_records, setup_logging, shutdown_logging
+from app.core.metrics import CallbackMetric, get_registry
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, get_upstream_breaker
+from app.core.resilience import get_upstream_resilience
+from app.core.singleflight import get_component_flights
+from app.core.config import settings
+from app.api.chat.templates import warm_templates
+
+logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Profiling exposes stacks and request timings, so it is only installed when a token protects it
+PROFILING_ACTIVE = settings.PROFILING_ENABLED and bool(settings.PROFILING_TOKEN)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log records are written by a background thread so the event loop never blocks on I/O
+    setup_logging()
+    if settings.PROFILING_ENABLED and not PROFILING_ACTIVE:
+        logger.warning("PROFILING_ENABLED=true sin PROFILING_TOKEN: el perfilado queda desactivado")
+    # Render the static dashboard variants before the first fallback needs them
+    # (page templates are loaded on first use)
+    warm_templates()
+    # Open the shared upstream connection pool once per process
+    upstream_client = get_upstream_client()
+    await upstream_client.start()
+    try:
+        yield
+    finally:
+        await upstream_client.close()
+        get_result_cache().close()
+        get_conversion_cache().close()
+        shutdown_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -29,7 +66,8 @@ app = FastAPI(
     """,
     version="0.1.0",
     openapi_url="/api/v1/openapi.json",
-    swagger_ui_parameters={"defaultModelsExpandDepth": -1}
+    swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -39,13 +77,84 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# Compress large JSON bodies with brotli or gzip; SSE and NDJSON streams are sent as they are
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Profile requests sent with X-Profile; only imported and installed when enabled so it costs nothing otherwise
+if PROFILING_ACTIVE:
+    from app.core.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
+# Tag every request (and its log records) with a correlation ID
+app.add_middleware(RequestIdMiddleware)
+
+# Shed load quickly when the upstream limiter queue is full
+@app.exception_handler(LimiterRejected)
+async def limiter_rejected_handler(request: Request, exc: LimiterRejected):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # Add API version prefix
 prefix = "/api/v1"
 
 # Include routers
 app.include_router(chat_router, prefix=prefix)
+app.include_router(convert_router, prefix=prefix)
+if PROFILING_ACTIVE:
+    from app.api.admin.router import router as admin_router
+    app.include_router(admin_router, prefix=prefix)
+
+def register_state_metrics(registry):
+    """Expose the counters the shared components already keep, read at scrape time."""
+    metrics = [
+        CallbackMetric("creai_cache_lookups_total", "Consultas al caché de componentes por resultado.", "counter",
+                       lambda: {(result,): get_result_cache().stats()[key] for result, key in (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses"))},
+                       ("result",)),
+        CallbackMetric("creai_cache_entries", "Componentes en el nivel en memoria del caché.", "gauge",
+                       lambda: get_result_cache().stats()["entries"]),
+        CallbackMetric("creai_singleflight_coalesced_total", "Solicitudes que esperaron una generación idéntica en curso.", "counter",
+                       lambda: get_component_flights().stats()["coalesced_total"]),
+        CallbackMetric("creai_upstream_in_flight", "Llamadas a QWEN en curso.", "gauge",
+                       lambda: get_upstream_client().stats()["requests_in_flight"]),
+        CallbackMetric("creai_upstream_connections", "Conexiones del pool hacia QWEN por estado.", "gauge",
+                       lambda: {("idle",): get_upstream_client().stats()["connections_idle"],
+                                ("in_use",): get_upstream_client().stats()["connections_in_use"]},
+                       ("state",)),
+        CallbackMetric("creai_upstream_concurrency_limit", "Límite actual del limitador adaptativo.", "gauge",
+                       lambda: get_upstream_limiter().limit),
+        CallbackMetric("creai_upstream_queue_depth", "Llamadas esperando en la cola del limitador.", "gauge",
+                       lambda: get_upstream_limiter().stats()["queued"]),
+        CallbackMetric("creai_upstream_rejected_total", "Llamadas rechazadas por el limitador.", "counter",
+                       lambda: get_upstream_limiter().stats()["rejected_total"]),
+        CallbackMetric("creai_upstream_retries_total", "Reintentos de llamadas a QWEN.", "counter",
+                       lambda: get_upstream_resilience().stats()["retries_total"]),
+        CallbackMetric("creai_upstream_hedges_total", "Peticiones duplicadas (hedging) a QWEN.", "counter",
+                       lambda: get_upstream_resilience().stats()["hedges_total"]),
+        CallbackMetric("creai_circuit_breaker_state", "Estado del circuito hacia QWEN (1 en el estado actual).", "gauge",
+                       lambda: {(state,): int(get_upstream_breaker().stats()["state"] == state) for state in (CLOSED, OPEN, HALF_OPEN)},
+                       ("state",)),
+        CallbackMetric("creai_log_records_dropped_total", "Registros de log descartados por la cola llena.", "counter",
+                       dropped_records),
+    ]
+    for metric in metrics:
+        registry.register(metric)
+
+if settings.METRICS_ENABLED:
+    register_state_metrics(get_registry())
+
+    # Prometheus scrape endpoint (text exposition format, no external collector needed)
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # Each gunicorn worker keeps its own registry; the worker label keeps their series apart
+        const_labels = {"worker": str(os.getpid())} if settings.METRICS_WORKER_LABEL else None
+        return Response(get_registry().render(const_labels), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # Define root endpoint
 @app.get("/")
@@ -0,0 +1,101 @@
+"""
+Benchmark del formateador de código JSX.
+
+Mide el rendimiento de format_code sobre componentes grandes escritos en una
+sola línea, que es como suele devolverlos el modelo, con sus dos
+implementaciones (CODE_FORMATTER): la cascada de expresiones regulares y el
+tokenizador de app/api/chat/formatter.py.
+
+Uso (desde el directorio backend):
+    python benchmarks/bench_formatter.py
+    python benchmarks/bench_formatter.py --size 50000 --seconds 3 --rounds 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.api.chat.service import (  # noqa: E402
+    create_fallback_footer,
+    create_horizontal_dashboard,
+    create_vertical_dashboard,
+    format_code,
+    format_code_with_tokenizer,
+)
+from app.core.config import settings  # noqa: E402
+
+
+def one_line(code: str) -> str:
+    """Convierte el código en una sola línea, como lo devuelve el modelo."""
+    # Los comentarios de línea se eliminan: en una sola línea ocultarían el resto del código
+    code = re.sub(r"^\s*//[^\n]*$", "", code, flags=re.MULTILINE)
+    return re.sub(r"\s+", " ", code).strip()
+
+
+def build_corpus(target_size: int) -> dict:
+    """Genera componentes de una sola línea de al menos target_size caracteres."""
+    samples = {
+        "vertical_dashboard": create_vertical_dashboard("Dashboard de ventas")["component_code"],
+        "horizontal_dashboard": create_horizontal_dashboard("Dashboard de métricas")["component_code"],
+        "footer": create_fallback_footer("Footer para una tienda online")["component_code"],
+    }
+    corpus = {}
+    for name, code in samples.items():
+        compact = one_line(code)
+        corpus[f"{name}_{len(compact) // 1000}kb"] = compact
+        # Repetir el cuerpo hasta alcanzar el tamaño objetivo
+        repeated = compact
+        while len(repeated) < target_size:
+            repeated += " " + compact
+        corpus[f"{name}_{len(repeated) // 1000}kb"] = repeated
+    return corpus
+
+
+def bench(formatter: Callable[[str], str], code: str, seconds: float) -> float:
+    """Ejecuta el formateador durante al menos `seconds` segundos y devuelve ops/s."""
+    formatter(code)  # Calentamiento
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        formatter(code)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+def compare(code: str, seconds: float, rounds: int) -> tuple:
+    """
+    Mide la cascada y el tokenizador alternándolos `rounds` veces y devuelve
+    el mejor resultado de cada uno (ops/s cascada, ops/s tokenizador).
+    """
+    regex = tokenizer = 0.0
+    for _ in range(rounds):
+        regex = max(regex, bench(format_code, code, seconds))
+        tokenizer = max(tokenizer, bench(format_code_with_tokenizer, code, seconds))
+    return regex, tokenizer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del formateador JSX")
+    parser.add_argument("--size", type=int, default=10000, help="Tamaño mínimo de los componentes grandes (caracteres)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duración de cada medición")
+    parser.add_argument("--rounds", type=int, default=3, help="Mediciones alternas de cada formateador por caso")
+    args = parser.parse_args()
+
+    # format_code debe medir la cascada aunque el entorno elija el tokenizador
+    settings.CODE_FORMATTER = "regex"
+    corpus = build_corpus(args.size)
+    print(f"{'caso':<32}{'tamaño':>10}{'regex ops/s':>13}{'tokenizer ops/s':>17}{'MB/s':>10}{'tokenizer/regex':>17}")
+    for name, code in corpus.items():
+        regex, tokenizer = compare(code, args.seconds / args.rounds, args.rounds)
+        mbps = tokenizer * len(code.encode("utf-8")) / 1e6
+        print(f"{name:<32}{len(code):>10}{regex:>13.1f}{tokenizer:>17.1f}{mbps:>10.2f}{tokenizer / regex:>16.2f}x")
+
+
+if __name__ == "__main__":
+    main()
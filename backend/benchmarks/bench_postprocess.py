@@ -0,0 +1,284 @@
+"""
+Benchmarks del post-procesado de service.py sobre un corpus de respuestas del modelo.
+
+Mide ops/s y memoria pico por llamada de las funciones que se ejecutan sobre
+cada respuesta (extracción del JSON, pipeline completo, formateadores,
+correcciones de JSX y de imágenes) y de los constructores de dashboard y
+footer, y los compara con una referencia guardada en baseline.json.
+
+El corpus está en benchmarks/corpus: un .txt por respuesta del modelo (tal
+cual la devuelve, con o sin bloque ```json) e index.json con el prompt y la
+plataforma de cada una.
+
+Uso (desde el directorio backend):
+    python benchmarks/bench_postprocess.py                   # compara con baseline.json
+    python benchmarks/bench_postprocess.py --save-baseline   # guarda las mediciones como referencia
+    python benchmarks/bench_postprocess.py --filter format_code --seconds 2
+
+Termina con código 1 si algún caso es más de --threshold más lento que la
+referencia o necesita más de --threshold de memoria adicional. La velocidad
+se compara en relación con una pequeña carga de calibración medida junto a
+cada caso, que compensa en parte las variaciones de velocidad de la máquina;
+aun así, conviene crear la referencia en la misma máquina en la que se compara.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.api.chat.json_extractor import extract_json_object  # noqa: E402
+from app.api.chat.service import (  # noqa: E402
+    create_dashboard_component,
+    create_fallback_footer,
+    extract_json_content,
+    extract_jsx_content,
+    fix_jsx_code,
+    fix_preview_images,
+    format_code,
+    format_jsx,
+    general_format_code,
+    process_component_data,
+)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# Diferencias de memoria por debajo de este valor se consideran ruido
+MIN_MEMORY_DELTA_KB = 1.0
+
+# Carga de referencia (JSON y regex, como el post-procesado) medida junto a cada caso
+CALIBRATION_SECONDS = 0.3
+_CALIBRATION_SAMPLE = json.dumps({"items": list(range(50)), "text": "texto de ejemplo " * 20})
+_CALIBRATION_WORD = re.compile(r"\w+")
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[], Any]
+
+
+class Result(NamedTuple):
+    ops_per_sec: float
+    # ops/s relativas a la carga de calibración; es lo que se compara con la referencia
+    score: float
+    peak_kb: float
+
+
+def _calibration_workload() -> int:
+    data = json.loads(_CALIBRATION_SAMPLE)
+    return len(_CALIBRATION_WORD.findall(json.dumps(data)))
+
+
+def load_corpus() -> List[Dict[str, Any]]:
+    """Entradas del corpus con su texto, prompt, plataforma y el componente extraído (o None)."""
+    with open(os.path.join(CORPUS_DIR, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+    corpus = []
+    for name, meta in index.items():
+        with open(os.path.join(CORPUS_DIR, f"{name}.txt"), encoding="utf-8") as f:
+            text = f.read()
+        corpus.append(dict(meta, name=name, text=text, component=extract_json_object(text)))
+    return corpus
+
+
+def _jsx_of(code: str) -> str:
+    start = code.find("return")
+    return extract_jsx_content(code[start:].strip()) if start >= 0 else code
+
+
+def build_cases(corpus: List[Dict[str, Any]]) -> List[Case]:
+    cases = []
+    for entry in corpus:
+        name, text, prompt, target = entry["name"], entry["text"], entry["prompt"], entry["platform"]
+        cases.append(Case(f"extract_json_content/{name}", lambda text=text: extract_json_content(text)))
+
+        component = entry["component"]
+        if component is None:
+            # Respuesta cortada: solo se mide el intento de extracción
+            continue
+        code = component.get("component_code", "")
+        preview = component.get("preview_html", "")
+        jsx = _jsx_of(code)
+        cases.extend([
+            # process_component_data modifica el diccionario: cada llamada recibe una copia
+            Case(f"process_component_data/{name}",
+                 lambda c=component, p=prompt, t=target: process_component_data(dict(c), p, t)),
+            Case(f"format_code/{name}", lambda code=code: format_code(code)),
+            Case(f"general_format_code/{name}", lambda code=code: general_format_code(code)),
+            Case(f"format_jsx/{name}", lambda jsx=jsx: format_jsx(jsx)),
+            Case(f"fix_jsx_code/{name}", lambda code=code: fix_jsx_code(code)),
+            Case(f"fix_preview_images/{name}", lambda html=preview, p=prompt: fix_preview_images(html, p)),
+        ])
+
+    cases.extend([
+        Case("create_dashboard_component/vertical_dark", lambda: create_dashboard_component("Dashboard vertical oscuro con sidebar")),
+        Case("create_dashboard_component/horizontal_shadcn", lambda: create_dashboard_component("Dashboard horizontal claro con shadcn")),
+        Case("create_fallback_footer/social", lambda: create_fallback_footer("Footer con redes sociales")),
+    ])
+    return cases
+
+
+def _iterations_for(run: Callable[[], Any], seconds: float) -> int:
+    """Número de llamadas a run que caben aproximadamente en seconds segundos."""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.01:
+            return max(1, int(iterations * seconds / elapsed))
+        iterations *= 2
+
+
+def _ops_per_sec(run: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    return iterations / (time.perf_counter() - start)
+
+
+def measure_speed(run: Callable[[], Any], seconds: float, rounds: int = 9) -> Tuple[float, float]:
+    """
+    Mide run durante unos seconds segundos repartidos en rondas.
+
+    Antes de cada ronda se mide la carga de calibración, y cada ronda se
+    compara con la calibración inmediatamente anterior. Así, si la máquina
+    se ralentiza durante la ejecución, afecta a ambas por igual.
+
+    Returns:
+        tuple: (mejor ops/s, mediana de las ops/s relativas a la calibración)
+    """
+    run()  # Calentamiento (cachés, regex compiladas)
+    iterations = _iterations_for(run, seconds / rounds)
+    calibration_iterations = _iterations_for(_calibration_workload, CALIBRATION_SECONDS / rounds)
+
+    best = 0.0
+    ratios = []
+    # Como timeit: sin recolector durante las rondas para que sus pausas no se sumen al caso medido
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            calibration = _ops_per_sec(_calibration_workload, calibration_iterations)
+            ops = _ops_per_sec(run, iterations)
+            best = max(best, ops)
+            ratios.append(ops / calibration)
+    finally:
+        gc.enable()
+    return best, statistics.median(ratios)
+
+
+def measure_memory(run: Callable[[], Any]) -> float:
+    """Memoria pico (KB) que necesita una llamada, medida con tracemalloc."""
+    run()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - before) / 1024
+
+
+def load_baseline() -> Optional[Dict[str, Any]]:
+    if not os.path.exists(BASELINE_PATH):
+        return None
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Result]) -> None:
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": {name: result._asdict() for name, result in results.items()},
+    }
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(result: Result, reference: Optional[Dict[str, float]], threshold: float) -> str:
+    """Estado del caso frente a la referencia: ok, LENTO, MEMORIA o nuevo."""
+    if reference is None:
+        return "nuevo"
+    if result.score < reference["score"] * (1 - threshold):
+        return "LENTO"
+    extra_kb = result.peak_kb - reference["peak_kb"]
+    if extra_kb > MIN_MEMORY_DELTA_KB and result.peak_kb > reference["peak_kb"] * (1 + threshold):
+        return "MEMORIA"
+    return "ok"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks del post-procesado de componentes")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duración de la medición de cada caso")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Empeoramiento tolerado frente a la referencia (0.25 = 25%%)")
+    parser.add_argument("--filter", default="", help="Medir solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar las mediciones en baseline.json en lugar de comparar")
+    args = parser.parse_args()
+
+    # Los avisos de los formateadores ante entradas rotas no forman parte de la medición
+    logging.disable(logging.WARNING)
+
+    cases = [case for case in build_cases(load_corpus()) if args.filter in case.name]
+    baseline = None if args.save_baseline else load_baseline()
+    reference_cases = (baseline or {}).get("cases", {})
+    if baseline and baseline.get("python") != platform.python_version():
+        print(f"Aviso: la referencia se midió con Python {baseline.get('python')}", file=sys.stderr)
+
+    results: Dict[str, Result] = {}
+    regressions = []
+    print(f"{'caso':<52}{'ops/s':>12}{'ref ops/s':>12}{'Δ':>8}{'KB pico':>10}  estado")
+    for case in cases:
+        ops_per_sec, score = measure_speed(case.run, args.seconds)
+        result = Result(
+            ops_per_sec=round(ops_per_sec, 1),
+            score=round(score, 5),
+            peak_kb=round(measure_memory(case.run), 2),
+        )
+        results[case.name] = result
+        reference = reference_cases.get(case.name)
+        state = compare(result, reference, args.threshold)
+        if state in ("LENTO", "MEMORIA"):
+            regressions.append(case.name)
+        ref_ops = f"{reference['ops_per_sec']:>12.1f}" if reference else f"{'-':>12}"
+        delta = f"{(result.score / reference['score'] - 1) * 100:>+7.1f}%" if reference else f"{'-':>8}"
+        print(f"{case.name:<52}{result.ops_per_sec:>12.1f}{ref_ops}{delta}{result.peak_kb:>10.2f}  {state}")
+
+    if args.save_baseline:
+        if args.filter:
+            # Conservar las referencias de los casos que no se han medido
+            previous = load_baseline() or {}
+            merged = {name: Result(**values) for name, values in previous.get("cases", {}).items()}
+            merged.update(results)
+            results = merged
+        save_baseline(results)
+        print(f"\nReferencia guardada en {os.path.relpath(BASELINE_PATH)}")
+        return 0
+    if baseline is None:
+        print("\nNo hay referencia: ejecute con --save-baseline para crearla")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} caso(s) empeoran más de un {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\nSin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Configuración de gunicorn para producción.
+
+Uso (desde el directorio backend):
+    gunicorn -c gunicorn.conf.py app.main:app
+o bien:
+    python run.py --prod
+
+Los valores se leen de app.core.config (variables SERVER_* y WEB_CONCURRENCY).
+"""
+import gc
+import multiprocessing
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.config import settings  # noqa: E402
+
+chdir = BACKEND_DIR
+
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+worker_class = "app.core.worker.UvicornWorker"
+
+# Los workers son asíncronos: con uno por CPU basta para ocuparlas todas.
+# Cada worker tiene su propio caché, limitador y circuit breaker: la concurrencia
+# total hacia QWEN puede llegar a workers × LIMITER_MAX_LIMIT
+workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count()
+if settings.QWEN_TRANSPORT_MODE == "record" and workers > 1:
+    # Varios procesos escribiendo en el mismo archivo gzip lo corromperían
+    workers = 1
+
+# Importar la aplicación una vez en el proceso principal: los workers la heredan al hacer fork
+preload_app = True
+
+# Reciclar cada worker tras unas solicitudes (con variación para que no lo hagan todos a la vez)
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+
+# SIGTERM: dejar de aceptar conexiones y esperar a las solicitudes en curso
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+# Segundos sin señal de vida de un worker (event loop bloqueado) antes de reiniciarlo
+timeout = 60
+keepalive = settings.SERVER_KEEPALIVE
+
+loglevel = settings.LOG_LEVEL.lower()
+
+
+def when_ready(server):
+    """Se ejecuta en el proceso principal tras cargar la aplicación, antes de crear los workers."""
+    from app.api.chat.templates import warm_templates
+
+    # Las plantillas renderizadas (incluidas las de página, que si no se cargan al usarse)
+    # se comparten con los workers en lugar de generarlas en cada uno
+    warm_templates(include_pages=True)
+    # Sacar los objetos ya creados del recolector para que no toque sus páginas y sigan compartidas tras el fork
+    gc.freeze()
+    if settings.QWEN_TRANSPORT_MODE == "record" and workers == 1:
+        server.log.info("QWEN_TRANSPORT_MODE=record: se usa un único worker")
@@ -1,10 +1,34 @@
+import argparse
 import os
 import sys
-import uvicorn
+
+BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
+
+
+def run_development() -> None:
+    import uvicorn
+
+    # Un solo proceso que se reinicia al cambiar el código
+    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
+
+
+def run_production() -> None:
+    # gunicorn con workers de uvicorn; la configuración está en gunicorn.conf.py
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = ["gunicorn", "-c", os.path.join(BACKEND_DIR, "gunicorn.conf.py"), "app.main:app"]
+    run()
+
 
 if __name__ == "__main__":
     # Asegurar que el directorio raíz esté en el path
-    sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
-    
-    # Ejecutar el servidor uvicorn
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True) 
\ No newline at end of file
+    sys.path.insert(0, BACKEND_DIR)
+
+    parser = argparse.ArgumentParser(description="Servidor de la API de componentes")
+    parser.add_argument("--prod", action="store_true", help="Modo producción: gunicorn con varios workers y sin reload")
+    args = parser.parse_args()
+
+    if args.prod:
+        run_production()
+    else:
+        run_development()
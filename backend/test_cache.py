@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+from app.core.cache import ResultCache
+
+
+def test_disk_tier_keeps_at_most_max_entries(tmp_path):
+    cache = ResultCache(max_entries=2, ttl=100, disk_path=str(tmp_path / "cache.db"), disk_max_entries=5)
+
+    async def main():
+        for index in range(12):
+            await cache.set(f"key{index}", index)
+        # Las primeras ya no están en memoria ni en disco; las últimas siguen en disco
+        return await cache.get("key0"), await cache.get("key9")
+
+    assert asyncio.run(main()) == (None, 9)
+    assert len(cache._get_disk()) == 5
+    cache.close()
+
+
+def test_disk_tier_deletes_expired_rows_on_write(tmp_path):
+    path = str(tmp_path / "cache.db")
+    short_lived = ResultCache(ttl=0.01, disk_path=path)
+    long_lived = ResultCache(ttl=100, disk_path=path)
+
+    async def main():
+        for index in range(3):
+            await short_lived.set(f"old{index}", index)
+        time.sleep(0.02)
+        # Una escritura cualquiera borra las filas caducadas aunque nadie las vuelva a leer
+        await long_lived.set("new", 1)
+
+    asyncio.run(main())
+    assert len(long_lived._get_disk()) == 1
+    short_lived.close()
+    long_lived.close()
+
+
+def test_memory_entries_expire_after_ttl():
+    cache = ResultCache(ttl=0.01)
+
+    async def main():
+        await cache.set("key", "value")
+        fresh = await cache.get("key")
+        time.sleep(0.02)
+        return fresh, await cache.get("key")
+
+    assert asyncio.run(main()) == ("value", None)
+    # La entrada caducada se elimina al leerla
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl=100)
+
+    async def main():
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        # Leer "a" la marca como reciente: la siguiente escritura desaloja "b"
+        await cache.get("a")
+        await cache.set("c", 3)
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(main()) == [1, None, 3]
+
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = ResultCache(ttl=100, disk_path=path)
+    reader = ResultCache(ttl=100, disk_path=path)
+
+    async def main():
+        await writer.set("key", {"code": "x"})
+        # Otro proceso (otra instancia) no lo tiene en memoria y lo lee del disco
+        first = await reader.get("key")
+        second = await reader.get("key")
+        return first, second
+
+    assert asyncio.run(main()) == ({"code": "x"}, {"code": "x"})
+    stats = reader.stats()
+    assert (stats["disk_hits"], stats["hits"], stats["misses"]) == (1, 1, 0)
+    writer.close()
+    reader.close()
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(enabled=False)
+
+    async def main():
+        await cache.set("key", "value")
+        return await cache.get("key")
+
+    assert asyncio.run(main()) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.core.deadline import DeadlineExceeded
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    options = dict(window_seconds=60, min_calls=4, failure_rate=0.5, slow_call_seconds=60,
+                   slow_call_rate=0.8, open_seconds=0.05, half_open_calls=1, enabled=True)
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+async def _succeed(breaker):
+    async with breaker.guard():
+        pass
+
+
+async def _fail(breaker):
+    with pytest.raises(RuntimeError):
+        async with breaker.guard():
+            raise RuntimeError()
+
+
+async def _calls(breaker, *outcomes):
+    for ok in outcomes:
+        await (_succeed(breaker) if ok else _fail(breaker))
+
+
+def _open(breaker) -> None:
+    asyncio.run(_calls(breaker, *[False] * breaker.min_calls))
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_min_calls():
+    breaker = _breaker()
+    asyncio.run(_calls(breaker, False, False, False))
+    assert breaker.state == CLOSED
+
+
+def test_stays_closed_below_failure_rate():
+    breaker = _breaker()
+    asyncio.run(_calls(breaker, True, True, True, False, True, False))
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_failure_rate"] == 0.333
+
+
+def test_opens_when_failure_rate_is_reached():
+    breaker = _breaker()
+    asyncio.run(_calls(breaker, True, False, True, False))
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened_total"] == 1
+
+
+def test_marked_failures_count_like_exceptions():
+    breaker = _breaker(min_calls=2)
+
+    async def main():
+        for _ in range(2):
+            async with breaker.guard() as call:
+                call.mark_failed()
+
+    asyncio.run(main())
+    assert breaker.state == OPEN
+
+
+def test_opens_when_slow_call_rate_is_reached():
+    breaker = _breaker(min_calls=2, slow_call_seconds=0.01, slow_call_rate=1.0)
+
+    async def main():
+        for _ in range(2):
+            async with breaker.guard():
+                await asyncio.sleep(0.02)
+
+    asyncio.run(main())
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_rejects_without_calling():
+    breaker = _breaker()
+    _open(breaker)
+    called = []
+
+    async def main():
+        async with breaker.guard():
+            called.append(1)
+
+    with pytest.raises(CircuitOpenError) as rejected:
+        asyncio.run(main())
+    assert called == []
+    assert 0 < rejected.value.retry_in <= breaker.open_seconds
+    assert breaker.is_open()
+    assert breaker.stats()["rejected_total"] == 1
+
+
+def test_successful_probe_closes_the_circuit():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.is_open()
+
+    asyncio.run(_succeed(breaker))
+    assert breaker.state == CLOSED
+    # La ventana empieza vacía: los fallos anteriores ya no cuentan
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+
+    asyncio.run(_fail(breaker))
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened_total"] == 2
+
+
+def test_half_open_lets_through_only_half_open_calls():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def probe():
+            async with breaker.guard():
+                await release.wait()
+
+        running = asyncio.ensure_future(probe())
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await _succeed(breaker)
+        release.set()
+        await running
+
+    asyncio.run(main())
+    assert breaker.state == CLOSED
+
+
+def test_cancellation_deadline_and_ignored_errors_are_not_recorded():
+    breaker = _breaker(min_calls=1)
+
+    async def main():
+        for error in (asyncio.CancelledError, DeadlineExceeded):
+            with pytest.raises(error):
+                async with breaker.guard():
+                    raise error()
+        with pytest.raises(KeyError):
+            async with breaker.guard(ignore=(KeyError,)):
+                raise KeyError()
+
+    asyncio.run(main())
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_abandoned_probe_frees_its_slot():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+
+    async def main():
+        with pytest.raises(DeadlineExceeded):
+            async with breaker.guard():
+                raise DeadlineExceeded()
+        # Sin resultado de la prueba el circuito sigue semiabierto y admite otra
+        assert breaker.state == HALF_OPEN
+        await _succeed(breaker)
+
+    asyncio.run(main())
+    assert breaker.state == CLOSED
+
+
+def test_failures_outside_the_window_are_forgotten():
+    breaker = _breaker(window_seconds=0.05, min_calls=3)
+    asyncio.run(_calls(breaker, False, False))
+    time.sleep(0.06)
+    # Con los dos fallos antiguos serían 3 de 5; en la ventana solo queda 1 de 3
+    asyncio.run(_calls(breaker, True, True, False))
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 3
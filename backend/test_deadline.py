@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.deadline import (
+    DeadlineExceeded,
+    SharedDeadline,
+    check,
+    context_with_deadline,
+    deadline_scope,
+    remaining,
+    request_timeout,
+    within_deadline,
+)
+from app.core.limiter import AdaptiveLimiter
+
+
+def test_inner_scope_cannot_extend_the_outer_deadline():
+    assert remaining() is None
+    with deadline_scope(0.5):
+        with deadline_scope(10):
+            assert remaining() <= 0.5
+        with deadline_scope(0.1):
+            assert remaining() <= 0.1
+        with deadline_scope(None):
+            assert remaining() <= 0.5
+    assert remaining() is None
+
+
+def test_check_raises_once_the_deadline_passed():
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            check()
+    check()
+
+
+def test_request_timeout_takes_the_shortest_value():
+    assert request_timeout(None, 30, 0, 12.5) == 12.5
+    assert request_timeout(None, 0) is None
+
+
+def test_within_deadline_returns_the_result_or_cancels_the_work():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        with deadline_scope(1):
+            result = await within_deadline(asyncio.sleep(0, "ok"))
+        with deadline_scope(0.02):
+            with pytest.raises(DeadlineExceeded):
+                await within_deadline(slow())
+        return result
+
+    assert asyncio.run(main()) == "ok"
+    assert cancelled == [True]
+
+
+def _run_with_shared_deadline(fn, initial: float, extended: float, extend_after: float):
+    """Ejecuta fn() con un SharedDeadline que se amplía tras extend_after segundos."""
+    async def main():
+        deadline = SharedDeadline(time.monotonic() + initial)
+        task = context_with_deadline(deadline).run(asyncio.ensure_future, fn())
+        await asyncio.sleep(extend_after)
+        deadline.at = time.monotonic() + extended
+        return await task
+
+    return asyncio.run(main())
+
+
+def test_within_deadline_follows_an_extended_shared_deadline():
+    async def fn():
+        return await within_deadline(asyncio.sleep(0.1, "ok"))
+
+    # Sin la ampliación vencería a los 0.05 s
+    assert _run_with_shared_deadline(fn, initial=0.05, extended=2, extend_after=0.02) == "ok"
+
+
+def test_limiter_queue_follows_an_extended_shared_deadline():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_queue=10, queue_timeout=5, enabled=True)
+
+    async def fn():
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        asyncio.get_running_loop().call_later(0.1, release.set)
+        async with limiter.slot():
+            pass
+        await holder
+        return "ok"
+
+    assert _run_with_shared_deadline(fn, initial=0.05, extended=2, extend_after=0.02) == "ok"
@@ -1,24 +1,102 @@
+import os
+import subprocess
+import sys
+
+# Tiempo máximo para importar app.main en un proceso nuevo (arranque de cada worker)
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.5"))
+# Tiempo máximo de los módulos propios (app.*), sin contar sus dependencias
+APP_IMPORT_BUDGET_SECONDS = float(os.getenv("APP_IMPORT_BUDGET_SECONDS", "0.25"))
+# Se toma la mejor de varias mediciones para reducir el ruido de la máquina
+IMPORT_RUNS = int(os.getenv("IMPORT_RUNS", "3"))
+# Módulos que no deben importarse al arrancar
+FORBIDDEN_MODULES = ("requests", "app.api.chat.page_templates")
+
+BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
+
+
+def measure_import(module):
+    """
+    Importa el módulo en un proceso nuevo con -X importtime.
+
+    Returns:
+        tuple: (segundos totales, {módulo: segundos propios})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    total = 0.0
+    self_times = {}
+    for line in result.stderr.splitlines():
+        # Formato: "import time: propio | acumulado | módulo" (microsegundos, con sangría según la profundidad)
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue
+        self_times[name.strip()] = int(own) / 1e6
+        if name.strip() == module:
+            total = int(cumulative) / 1e6
+    return total, self_times
+
+
+def check_import_budget():
+    """Comprueba el tiempo de importación de app.main; devuelve False si se pasa del presupuesto."""
+    runs = [measure_import("app.main") for _ in range(IMPORT_RUNS)]
+    total, self_times = min(runs, key=lambda run: run[0])
+    app_total = sum(seconds for name, seconds in self_times.items() if name == "app" or name.startswith("app."))
+
+    print(f"\nImportar app.main: {total:.3f} s (presupuesto {IMPORT_BUDGET_SECONDS:.2f} s), "
+          f"módulos propios: {app_total:.3f} s (presupuesto {APP_IMPORT_BUDGET_SECONDS:.2f} s)")
+    print("Módulos más lentos (tiempo propio):")
+    for name, seconds in sorted(self_times.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    ok = True
+    for name in FORBIDDEN_MODULES:
+        if name in self_times:
+            print(f"❌ {name} se importa al arrancar")
+            ok = False
+    if total > IMPORT_BUDGET_SECONDS:
+        print(f"❌ La importación supera el presupuesto ({total:.3f} s > {IMPORT_BUDGET_SECONDS:.2f} s)")
+        ok = False
+    if app_total > APP_IMPORT_BUDGET_SECONDS:
+        print(f"❌ Los módulos propios superan su presupuesto ({app_total:.3f} s > {APP_IMPORT_BUDGET_SECONDS:.2f} s)")
+        ok = False
+    return ok
+
+
 print("Probando importaciones...")
 
 try:
     print("Importando app...")
     import app
     print("✅ app importado correctamente")
-    
+
     print("Importando app.main...")
     from app import main
     print("✅ app.main importado correctamente")
-    
+
     print("Importando app.api.chat.router...")
     from app.api.chat import router
     print("✅ app.api.chat.router importado correctamente")
-    
+
     print("Importando app.api.chat.service...")
     from app.api.chat import service
     print("✅ app.api.chat.service importado correctamente")
-    
+
     print("Todas las importaciones funcionaron correctamente")
 except ImportError as e:
     print(f"❌ Error de importación: {e}")
+    sys.exit(1)
 except Exception as e:
-    print(f"❌ Error inesperado: {e}") 
\ No newline at end of file
+    print(f"❌ Error inesperado: {e}")
+    sys.exit(1)
+
+if not check_import_budget():
+    sys.exit(1)
+print("✅ Tiempo de importación dentro del presupuesto")
@@ -0,0 +1,202 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import DeadlineExceeded, deadline_scope
+from app.core.limiter import AdaptiveLimiter, LimiterRejected
+
+
+def _limiter(**kwargs) -> AdaptiveLimiter:
+    options = dict(initial_limit=10, min_limit=1, max_limit=100, max_queue=10,
+                   queue_timeout=5, latency_target=5, backoff=0.5, enabled=True)
+    options.update(kwargs)
+    return AdaptiveLimiter(**options)
+
+
+async def _fail(limiter, error=RuntimeError):
+    try:
+        async with limiter.slot():
+            raise error()
+    except error:
+        pass
+
+
+async def _hold(limiter, release: asyncio.Event):
+    async with limiter.slot():
+        await release.wait()
+
+
+def test_successful_calls_raise_the_limit_additively():
+    limiter = _limiter(initial_limit=2)
+
+    async def main():
+        for _ in range(3):
+            async with limiter.slot():
+                pass
+
+    asyncio.run(main())
+    # +1/límite por llamada: 2 -> 2.5 -> 2.9 -> 3.24
+    assert limiter.limit == 3
+
+
+def test_limit_never_exceeds_max_limit():
+    limiter = _limiter(initial_limit=3, max_limit=3)
+
+    async def main():
+        for _ in range(10):
+            async with limiter.slot():
+                pass
+
+    asyncio.run(main())
+    assert limiter.limit == 3
+
+
+def test_failed_call_multiplies_the_limit_by_backoff():
+    limiter = _limiter()
+    asyncio.run(_fail(limiter))
+    assert limiter.limit == 5
+    assert limiter.stats()["drops_total"] == 1
+
+
+def test_overloaded_and_slow_calls_also_decrease_the_limit():
+    limiter = _limiter(initial_limit=16, latency_target=0.01)
+
+    async def main():
+        async with limiter.slot() as slot:
+            slot.mark_overloaded()
+        async with limiter.slot():
+            await asyncio.sleep(0.02)
+
+    asyncio.run(main())
+    assert limiter.limit == 4
+
+
+def test_burst_of_concurrent_failures_decreases_once():
+    limiter = _limiter()
+
+    async def fail_after(release):
+        async with limiter.slot():
+            await release.wait()
+            raise RuntimeError()
+
+    async def main():
+        release = asyncio.Event()
+        calls = [asyncio.ensure_future(fail_after(release)) for _ in range(4)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*calls, return_exceptions=True)
+
+    asyncio.run(main())
+    # Las cuatro empezaron antes de la primera reducción: cuentan como una sola señal
+    assert limiter.limit == 5
+    assert limiter.stats()["drops_total"] == 4
+
+
+def test_limit_never_drops_below_min_limit():
+    limiter = _limiter(initial_limit=4, min_limit=3)
+
+    async def main():
+        for _ in range(3):
+            await _fail(limiter)
+
+    asyncio.run(main())
+    assert limiter.limit == 3
+
+
+def test_cancellation_deadline_and_ignored_errors_are_not_recorded():
+    limiter = _limiter()
+
+    async def main():
+        for error in (asyncio.CancelledError, DeadlineExceeded):
+            with pytest.raises(error):
+                async with limiter.slot():
+                    raise error()
+        with pytest.raises(KeyError):
+            async with limiter.slot(ignore=(KeyError,)):
+                raise KeyError()
+
+    asyncio.run(main())
+    assert limiter.limit == 10
+    assert limiter.stats()["drops_total"] == 0
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_queued_call_gets_the_released_permit():
+    limiter = _limiter(initial_limit=1)
+
+    async def main():
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold(limiter, release))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(_hold(limiter, asyncio.Event()))
+        await asyncio.sleep(0)
+        stats = limiter.stats()
+        release.set()
+        await holder
+        await asyncio.sleep(0)
+        in_flight = limiter.stats()["in_flight"]
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        return stats, in_flight
+
+    stats, in_flight = asyncio.run(main())
+    assert (stats["in_flight"], stats["queued"]) == (1, 1)
+    assert in_flight == 1
+
+
+def test_full_queue_rejects_immediately():
+    limiter = _limiter(initial_limit=1, max_queue=1)
+
+    async def main():
+        release = asyncio.Event()
+        calls = [asyncio.ensure_future(_hold(limiter, release)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(LimiterRejected) as rejected:
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(*calls)
+        return rejected.value
+
+    rejected = asyncio.run(main())
+    assert rejected.reason == "queue_full"
+    assert rejected.retry_after >= 1
+    assert limiter.stats()["rejected_total"] == 1
+
+
+def test_queue_wait_is_bounded_by_queue_timeout():
+    limiter = _limiter(initial_limit=1, queue_timeout=0.02)
+
+    async def main():
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold(limiter, release))
+        await asyncio.sleep(0)
+        with pytest.raises(LimiterRejected) as rejected:
+            async with limiter.slot():
+                pass
+        release.set()
+        await holder
+        return rejected.value
+
+    assert asyncio.run(main()).reason == "queue_timeout"
+    assert limiter.stats()["queued"] == 0
+
+
+def test_request_deadline_while_queued_raises_deadline_exceeded():
+    limiter = _limiter(initial_limit=1)
+
+    async def main():
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold(limiter, release))
+        await asyncio.sleep(0)
+        with deadline_scope(0.02):
+            with pytest.raises(DeadlineExceeded):
+                async with limiter.slot():
+                    pass
+        release.set()
+        await holder
+
+    asyncio.run(main())
+    # No es un rechazo del limitador: el plazo era de la solicitud
+    assert limiter.stats()["rejected_total"] == 0
+    assert limiter.stats()["queued"] == 0
@@ -0,0 +1,158 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from app.core.deadline import deadline_scope
+from app.core.http_client import UpstreamStatusError
+from app.core.resilience import ResilientCaller, RetryBudget, is_retryable_error
+
+
+def _caller(**kwargs) -> ResilientCaller:
+    # Sin espera entre intentos para que las pruebas no dependan del jitter
+    options = dict(max_attempts=3, base_delay=0, max_delay=0, budget_ratio=0.2,
+                   budget_reserve=10, hedge_enabled=False)
+    options.update(kwargs)
+    return ResilientCaller(**options)
+
+
+def _responses(*results):
+    """send() que devuelve (o lanza) cada resultado en orden y cuenta las llamadas."""
+    pending = list(results)
+    calls = []
+
+    async def send():
+        calls.append(1)
+        result = pending.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return {"status": result, "text": str(result), "elapsed": 0.01}
+
+    return send, calls
+
+
+def test_retryable_errors_and_statuses():
+    assert is_retryable_error(UpstreamStatusError(503, ""))
+    assert not is_retryable_error(UpstreamStatusError(400, ""))
+    assert is_retryable_error(aiohttp.ClientConnectionError())
+    assert not is_retryable_error(ValueError())
+
+
+def test_retryable_status_is_retried_until_success():
+    caller = _caller()
+    send, calls = _responses(503, 429, 200)
+
+    response = asyncio.run(caller.call(send))
+    assert response["status"] == 200
+    assert len(calls) == 3
+    assert caller.stats()["retries_total"] == 2
+
+
+def test_non_retryable_status_is_returned_at_once():
+    caller = _caller()
+    send, calls = _responses(400, 200)
+
+    assert asyncio.run(caller.call(send))["status"] == 400
+    assert len(calls) == 1
+
+
+def test_network_error_is_retried_and_the_last_one_raised():
+    caller = _caller(max_attempts=2)
+    send, calls = _responses(aiohttp.ClientConnectionError(), aiohttp.ClientConnectionError())
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(caller.call(send))
+    assert len(calls) == 2
+
+
+def test_non_retryable_error_is_not_retried():
+    caller = _caller()
+    send, calls = _responses(ValueError(), 200)
+
+    with pytest.raises(ValueError):
+        asyncio.run(caller.call(send))
+    assert len(calls) == 1
+
+
+def test_attempts_stop_at_max_attempts():
+    caller = _caller(max_attempts=2)
+    send, calls = _responses(503, 503, 200)
+
+    assert asyncio.run(caller.call(send))["status"] == 503
+    assert len(calls) == 2
+
+
+def test_budget_deposits_ratio_per_call_up_to_reserve():
+    budget = RetryBudget(ratio=0.5, reserve=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    assert budget.stats()["exhausted_total"] == 2
+
+
+def test_exhausted_budget_stops_retries():
+    # Reserva para un solo reintento y sin depósito por llamada
+    caller = _caller(budget_ratio=0, budget_reserve=1)
+    first, first_calls = _responses(503, 503, 200)
+    second, second_calls = _responses(503, 200)
+
+    async def main():
+        return await caller.call(first), await caller.call(second)
+
+    first_response, second_response = asyncio.run(main())
+    # La primera llamada gasta la única ficha y la segunda ya no puede reintentar
+    assert (first_response["status"], len(first_calls)) == (503, 2)
+    assert (second_response["status"], len(second_calls)) == (503, 1)
+    assert caller.stats()["retry_budget"]["exhausted_total"] == 2
+
+
+def test_no_retry_when_the_backoff_would_consume_the_deadline():
+    caller = _caller()
+    caller.backoff = lambda attempt: 1.0
+    send, calls = _responses(503, 200)
+
+    async def main():
+        with deadline_scope(0.5):
+            return await caller.call(send)
+
+    assert asyncio.run(main())["status"] == 503
+    assert len(calls) == 1
+
+
+def test_fits_deadline():
+    assert ResilientCaller.fits_deadline(100)
+    with deadline_scope(1):
+        assert ResilientCaller.fits_deadline(0.5)
+        assert not ResilientCaller.fits_deadline(2)
+
+
+def test_slow_call_is_hedged_and_the_fastest_response_wins():
+    caller = _caller(hedge_enabled=True, hedge_percentile=0.95, hedge_min_samples=1)
+    caller.latencies.record(0.01)
+    cancelled = []
+    calls = []
+
+    async def send():
+        calls.append(1)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return {"status": 200, "text": "slow", "elapsed": 1}
+        return {"status": 200, "text": "fast", "elapsed": 0.01}
+
+    assert asyncio.run(caller.call(send))["text"] == "fast"
+    assert cancelled == [True]
+    stats = caller.stats()
+    assert (stats["hedges_total"], stats["hedge_wins_total"]) == (1, 1)
+
+
+def test_no_hedge_without_enough_latency_samples():
+    caller = _caller(hedge_enabled=True, hedge_min_samples=5)
+    caller.latencies.record(0.01)
+    assert caller.hedge_delay() is None
@@ -0,0 +1,80 @@
+import pytest
+
+from app.core.similarity import SimilarityIndex
+
+
+@pytest.fixture
+def index():
+    index = SimilarityIndex(enabled=True)
+    for key, prompt in enumerate((
+        "modern dark login form with email and password fields",
+        "pricing table with three plans",
+        "responsive admin dashboard with sidebar navigation, revenue charts, user table and notifications bell",
+        "modern blue login button",
+    )):
+        index.add(str(key), prompt, "web", prompt)
+    return index
+
+
+@pytest.mark.parametrize("prompt", [
+    "modern light login form with email and password fields",
+    "pricing table with four plans",
+    "responsive admin dashboard with sidebar navigation, revenue charts, order table and notifications bell",
+    "modern red login button",
+])
+def test_prompts_differing_in_one_meaningful_word_are_not_served(index, prompt):
+    assert index.query(prompt, "web") is None
+
+
+@pytest.mark.parametrize("prompt, matched", [
+    ("a modern login button in blue", "modern blue login button"),
+    ("Modern login buttons, blue", "modern blue login button"),
+    ("pricing tables with three plans", "pricing table with three plans"),
+    ("modern dark login form with email and password field", "modern dark login form with email and password fields"),
+])
+def test_paraphrases_are_served(index, prompt, matched):
+    match = index.query(prompt, "web")
+    assert match is not None
+    assert match.prompt == matched
+    assert match.score >= index.threshold
+
+
+def test_other_platforms_are_not_matched(index):
+    assert index.query("modern blue login button", "mobile") is None
+
+
+def test_evicted_entries_leave_their_buckets():
+    index = SimilarityIndex(enabled=True, max_entries=2)
+    index.add("first", "modern blue login button", "web", 1)
+    index.add("second", "pricing table with three plans", "web", 2)
+    index.add("third", "navbar with logo and search", "web", 3)
+    assert index.query("modern blue login button", "web") is None
+    assert index.query("navbar with logo and search", "web").value == 3
+    assert all("first" not in members for members in index._buckets.values())
+
+
+def test_matched_entries_are_kept_as_recently_used():
+    index = SimilarityIndex(enabled=True, max_entries=2)
+    index.add("first", "modern blue login button", "web", 1)
+    index.add("second", "pricing table with three plans", "web", 2)
+    # La coincidencia marca "first" como reciente: se desaloja "second"
+    assert index.query("a modern login button in blue", "web").key == "first"
+    index.add("third", "navbar with logo and search", "web", 3)
+    assert index.query("modern blue login button", "web").value == 1
+    assert index.query("pricing table with three plans", "web") is None
+
+
+def test_adding_an_existing_key_replaces_its_prompt():
+    index = SimilarityIndex(enabled=True)
+    index.add("key", "modern blue login button", "web", 1)
+    index.add("key", "pricing table with three plans", "web", 2)
+    assert index.query("modern blue login button", "web") is None
+    assert index.query("pricing table with three plans", "web").value == 2
+    assert index.stats()["entries"] == 1
+
+
+def test_disabled_index_neither_stores_nor_matches():
+    index = SimilarityIndex(enabled=False)
+    index.add("key", "modern blue login button", "web", 1)
+    assert index.query("modern blue login button", "web") is None
+    assert index.stats()["entries"] == 0
@@ -0,0 +1,200 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import DeadlineExceeded, deadline_scope, remaining, within_deadline
+from app.core.singleflight import SingleFlight
+
+
+async def _call(flights, fn, timeout=None, delay=0.0):
+    """Se une a la llamada compartida tras delay segundos, con su propio plazo."""
+    await asyncio.sleep(delay)
+    with deadline_scope(timeout):
+        try:
+            return await flights.do("key", fn)
+        except DeadlineExceeded:
+            return "deadline"
+
+
+def test_shared_call_gets_the_longest_waiter_deadline():
+    flights = SingleFlight()
+    seen = []
+
+    async def fn():
+        # Simula la llamada al proveedor, limitada por el plazo de la tarea compartida
+        seen.append(remaining())
+        await within_deadline(asyncio.sleep(0.3))
+        seen.append(remaining())
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(
+            _call(flights, fn, timeout=0.1),
+            _call(flights, fn, timeout=2.0, delay=0.02),
+        )
+
+    short, long = asyncio.run(main())
+    assert short == "deadline"
+    assert long == ("ok", True)
+    # La llamada empezó con el plazo de la primera solicitud y se amplió al unirse la segunda
+    assert seen[0] <= 0.1
+    assert seen[1] > 1.0
+
+
+def test_shared_call_keeps_its_deadline_when_a_shorter_waiter_joins():
+    flights = SingleFlight()
+    seen = []
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        seen.append(remaining())
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(
+            _call(flights, fn, timeout=2.0),
+            _call(flights, fn, timeout=0.01, delay=0.01),
+        )
+
+    long, short = asyncio.run(main())
+    assert long == ("ok", False)
+    assert short == "deadline"
+    assert seen[0] > 1.0
+
+
+def test_shared_call_has_no_deadline_if_a_waiter_has_none():
+    flights = SingleFlight()
+    seen = []
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        seen.append(remaining())
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(
+            _call(flights, fn, timeout=1.0),
+            _call(flights, fn, delay=0.01),
+        )
+
+    assert asyncio.run(main()) == [("ok", False), ("ok", True)]
+    assert seen == [None]
+
+
+def test_deadline_shrinks_when_the_longest_waiter_leaves():
+    flights = SingleFlight()
+    seen = []
+
+    async def fn():
+        await asyncio.sleep(0.1)
+        seen.append(remaining())
+        return "ok"
+
+    async def main():
+        short = asyncio.ensure_future(_call(flights, fn, timeout=1.0))
+        long = asyncio.ensure_future(_call(flights, fn, timeout=5.0, delay=0.01))
+        await asyncio.sleep(0.05)
+        long.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await long
+        return await short
+
+    assert asyncio.run(main()) == ("ok", False)
+    assert seen[0] < 1.0
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def main():
+        results = await asyncio.gather(*(_call(flights, fn) for _ in range(5)))
+        return results, flights.in_flight()
+
+    results, in_flight = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [("ok", False)] + [("ok", True)] * 4
+    assert in_flight == 0
+    assert flights.stats()["coalesced_total"] == 4
+
+
+def test_new_call_runs_again_after_the_previous_one_finished():
+    flights = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        return await _call(flights, fn), await _call(flights, fn)
+
+    # Solo se comparten las llamadas en curso, no los resultados anteriores
+    assert asyncio.run(main()) == ((1, False), (2, False))
+
+
+def test_exception_reaches_every_waiter():
+    flights = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.02)
+        raise ValueError("upstream")
+
+    async def main():
+        return await asyncio.gather(
+            _call(flights, fn), _call(flights, fn, delay=0.01), return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+
+
+def test_cancelling_one_waiter_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        first = asyncio.ensure_future(_call(flights, fn))
+        second = asyncio.ensure_future(_call(flights, fn, delay=0.01))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == ("ok", True)
+    assert flights.stats()["abandoned_total"] == 0
+
+
+def test_shared_call_is_cancelled_when_every_waiter_leaves():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def fn():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        waiters = [asyncio.ensure_future(_call(flights, fn)) for _ in range(2)]
+        await asyncio.sleep(0.02)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        # Dejar que la tarea compartida procese su cancelación
+        await asyncio.sleep(0)
+        return flights.in_flight()
+
+    assert asyncio.run(main()) == 0
+    assert cancelled == [True]
+    assert flights.stats()["abandoned_total"] == 1
@@ -0,0 +1,191 @@
+"""
+Prueba de carga de /api/v1/generate-component.
+
+Lanza solicitudes con varios niveles de concurrencia y, para cada uno,
+informa del rendimiento (solicitudes por segundo), los percentiles de
+latencia, la tasa de errores y la proporción de respuestas de respaldo y
+desde caché. Pensado para usarse junto con tools/mock_qwen.py, sin red ni
+coste del proveedor.
+
+Uso (desde el directorio backend, con la API y el mock en marcha):
+    python tools/load_test.py --concurrency 1,10,50 --duration 30
+    python tools/load_test.py --concurrency 20 --requests 500 --repeat-ratio 0.3 --json resultados.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import aiohttp
+
+PROMPTS = (
+    "Botón de login moderno con estilo neumórfico",
+    "Tarjeta de producto con imagen, precio y botón de compra",
+    "Barra de navegación inferior para móvil con cuatro pestañas",
+    "Formulario de registro con validación de email y contraseña",
+    "Footer con enlaces y redes sociales",
+    "Tabla de pedidos con paginación y filtros",
+    "Modal de confirmación con dos botones",
+    "Lista de notificaciones con avatar y fecha",
+)
+
+
+class Sample(NamedTuple):
+    latency: float
+    status: int
+    source: str
+    cached: bool
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PromptSource:
+    """
+    Prompts de la prueba. Por defecto cada solicitud lleva un prompt distinto
+    (para que llegue al modelo); con repeat_ratio, esa fracción repite un
+    prompt ya enviado y mide el camino del caché. Con seed, los prompts son
+    los mismos en cada ejecución (para reproducir tráfico grabado).
+    """
+
+    def __init__(self, repeat_ratio: float, seed: Optional[int]):
+        self.repeat_ratio = repeat_ratio
+        self.random = random.Random(seed)
+        self.sent: List[str] = []
+        self.counter = itertools.count(1)
+        self.run_id = f"s{seed}" if seed is not None else f"{time.time():.0f}"
+
+    def next(self) -> str:
+        if self.sent and self.random.random() < self.repeat_ratio:
+            return self.random.choice(self.sent)
+        prompt = f"{self.random.choice(PROMPTS)} (variante {self.run_id}-{next(self.counter)})"
+        self.sent.append(prompt)
+        return prompt
+
+
+async def run_level(
+    session: aiohttp.ClientSession,
+    url: str,
+    concurrency: int,
+    duration: Optional[float],
+    total_requests: Optional[int],
+    prompts: PromptSource,
+    platform: str,
+    timeout: Optional[float],
+) -> Dict[str, Any]:
+    samples: List[Sample] = []
+    errors: Counter = Counter()
+    issued = itertools.count()
+    deadline = time.monotonic() + duration if duration else None
+
+    def more() -> bool:
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        return total_requests is None or next(issued) < total_requests
+
+    async def worker() -> None:
+        while more():
+            body = {"prompt": prompts.next(), "platform": platform}
+            if timeout:
+                body["timeout_seconds"] = timeout
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=body) as response:
+                    data = await response.json(content_type=None) if response.status == 200 else {}
+                    samples.append(Sample(
+                        time.perf_counter() - start,
+                        response.status,
+                        data.get("source", "model"),
+                        bool(data.get("cached")),
+                    ))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                errors[type(e).__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ok = [sample for sample in samples if sample.status == 200]
+    latencies = [sample.latency for sample in ok]
+    statuses = Counter(sample.status for sample in samples)
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples) + sum(errors.values()),
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "latency_p50": round(percentile(latencies, 0.50), 3),
+        "latency_p90": round(percentile(latencies, 0.90), 3),
+        "latency_p99": round(percentile(latencies, 0.99), 3),
+        "latency_max": round(max(latencies, default=0.0), 3),
+        "error_rate": round(1 - len(ok) / max(len(samples) + sum(errors.values()), 1), 4),
+        "fallback_rate": round(sum(1 for sample in ok if sample.source == "fallback") / max(len(ok), 1), 4),
+        "cache_rate": round(sum(1 for sample in ok if sample.cached) / max(len(ok), 1), 4),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "client_errors": dict(errors),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    header = f"{'conc':>5}{'req':>7}{'req/s':>9}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}{'error':>8}{'fallback':>10}{'caché':>8}"
+    print(header)
+    for r in results:
+        print(
+            f"{r['concurrency']:>5}{r['requests']:>7}{r['throughput_rps']:>9.2f}"
+            f"{r['latency_p50']:>8.2f}{r['latency_p90']:>8.2f}{r['latency_p99']:>8.2f}{r['latency_max']:>8.2f}"
+            f"{r['error_rate']:>8.1%}{r['fallback_rate']:>10.1%}{r['cache_rate']:>8.1%}"
+        )
+    for r in results:
+        if r["client_errors"] or set(r["statuses"]) - {"200"}:
+            print(f"  concurrencia {r['concurrency']}: estados {r['statuses']} errores de cliente {r['client_errors']}")
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    url = args.url.rstrip("/") + args.endpoint
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+    prompts = PromptSource(args.repeat_ratio, args.seed)
+    connector = aiohttp.TCPConnector(limit=max(levels))
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=args.client_timeout)) as session:
+        results = []
+        for concurrency in levels:
+            print(f"Concurrencia {concurrency}...", file=sys.stderr)
+            results.append(await run_level(
+                session, url, concurrency, args.duration, args.requests, prompts, args.platform, args.timeout
+            ))
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de componentes")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL base de la API")
+    parser.add_argument("--endpoint", default="/api/v1/generate-component")
+    parser.add_argument("--concurrency", default="1,5,10,25", help="Niveles de concurrencia, separados por comas")
+    parser.add_argument("--duration", type=float, default=None, help="Segundos por nivel (por defecto, 20 si no se indica --requests)")
+    parser.add_argument("--requests", type=int, default=None, help="Solicitudes por nivel")
+    parser.add_argument("--platform", default="web")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0, help="Fracción de solicitudes que repiten un prompt ya enviado")
+    parser.add_argument("--timeout", type=float, default=None, help="timeout_seconds enviado en cada solicitud")
+    parser.add_argument("--client-timeout", type=float, default=300, help="Timeout del cliente por solicitud")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="Guardar los resultados en este fichero JSON")
+    args = parser.parse_args()
+    if args.duration is None and args.requests is None:
+        args.duration = 20.0
+
+    results = asyncio.run(main_async(args))
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Servidor local que imita el endpoint de generación de texto de DashScope (QWEN).
+
+Permite probar la API y hacer pruebas de carga sin llamar al proveedor. Responde
+con respuestas reales del corpus de benchmarks/corpus, con latencia, errores,
+respuestas cortadas y streaming configurables.
+
+Uso (desde el directorio backend):
+    python tools/mock_qwen.py --port 8001 --latency-median 2 --error-rate 0.05
+
+Y en otra terminal, la API apuntando al mock:
+    QWEN_API_BASE_URL=http://127.0.0.1:8001/api/v1 QWEN_API_KEY=mock python run.py
+
+GET /stats devuelve cuántas peticiones se han respondido de cada tipo.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import uuid
+from collections import Counter
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "corpus")
+
+GENERATION_PATH = "/api/v1/services/aigc/text-generation/generation"
+
+
+def load_outputs() -> List[str]:
+    """Respuestas completas del corpus (las cortadas se generan con --truncate-rate)."""
+    with open(os.path.join(CORPUS_DIR, "index.json"), encoding="utf-8") as f:
+        names = [name for name in json.load(f) if not name.startswith("truncated")]
+    outputs = []
+    for name in names:
+        with open(os.path.join(CORPUS_DIR, f"{name}.txt"), encoding="utf-8") as f:
+            outputs.append(f.read())
+    return outputs
+
+
+class MockQwen:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.outputs = load_outputs()
+        self.random = random.Random(args.seed)
+        self.error_statuses = [int(status) for status in args.error_statuses.split(",") if status]
+        self.counts: Counter = Counter()
+        self.in_flight = 0
+
+    def latency(self) -> float:
+        """Latencia total de una respuesta según la distribución elegida."""
+        args = self.args
+        if args.latency_dist == "fixed":
+            value = args.latency_median
+        elif args.latency_dist == "uniform":
+            value = self.random.uniform(args.latency_min, args.latency_max)
+        else:
+            # Lognormal: la mayoría cerca de la mediana y una cola de respuestas lentas
+            value = self.random.lognormvariate(math.log(max(args.latency_median, 1e-3)), args.latency_sigma)
+        return min(max(value, args.latency_min), args.latency_max)
+
+    def content_for(self, payload: Dict[str, Any]) -> str:
+        messages = payload.get("input", {}).get("messages", [])
+        prompt = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+        # La misma petición recibe siempre la misma respuesta
+        content = self.outputs[sum(map(ord, prompt)) % len(self.outputs)]
+        if self.random.random() < self.args.truncate_rate:
+            self.counts["truncated"] += 1
+            content = content[: int(len(content) * self.random.uniform(0.3, 0.9))]
+        return content
+
+    @staticmethod
+    def _body(content: str, request_id: str, finish_reason: str) -> Dict[str, Any]:
+        return {
+            "output": {
+                "choices": [{"finish_reason": finish_reason, "message": {"role": "assistant", "content": content}}]
+            },
+            "usage": {"input_tokens": 180, "output_tokens": len(content) // 4},
+            "request_id": request_id,
+        }
+
+    async def generation(self, request: web.Request) -> web.StreamResponse:
+        self.in_flight += 1
+        try:
+            return await self._generation(request)
+        finally:
+            self.in_flight -= 1
+
+    async def _generation(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        request_id = str(uuid.uuid4())
+        latency = self.latency()
+
+        if self.error_statuses and self.random.random() < self.args.error_rate:
+            status = self.random.choice(self.error_statuses)
+            self.counts[f"error_{status}"] += 1
+            # Los errores suelen llegar antes que una respuesta completa
+            await asyncio.sleep(latency * self.random.uniform(0.05, 0.5))
+            return web.json_response(
+                {"code": "Throttling" if status == 429 else "InternalError", "message": "mock error", "request_id": request_id},
+                status=status,
+            )
+
+        content = self.content_for(payload)
+        streaming = request.headers.get("X-DashScope-SSE") == "enable" or "text/event-stream" in request.headers.get("Accept", "")
+        if not streaming:
+            self.counts["ok"] += 1
+            await asyncio.sleep(latency)
+            return web.json_response(self._body(content, request_id, "stop"))
+
+        self.counts["stream"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        # El primer fragmento tarda first_token_ratio de la latencia y el resto se reparte entre los demás
+        chunk = max(1, self.args.stream_chunk_chars)
+        pieces = [content[i:i + chunk] for i in range(0, len(content), chunk)] or [""]
+        first_delay = latency * self.args.first_token_ratio
+        gap = (latency - first_delay) / max(len(pieces) - 1, 1)
+        await asyncio.sleep(first_delay)
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(gap)
+            finish_reason = "stop" if index == len(pieces) - 1 else "null"
+            event = json.dumps(self._body(piece, request_id, finish_reason), ensure_ascii=False)
+            await response.write(f"id:{index + 1}\nevent:result\n:HTTP_STATUS/200\ndata:{event}\n\n".encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.counts, in_flight=self.in_flight))
+
+
+def build_app(args: argparse.Namespace) -> web.Application:
+    mock = MockQwen(args)
+    app = web.Application()
+    app.router.add_post(GENERATION_PATH, mock.generation)
+    app.router.add_get("/stats", mock.stats)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock local de la API de QWEN (DashScope)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-dist", choices=("lognormal", "uniform", "fixed"), default="lognormal",
+                        help="Distribución de la latencia de cada respuesta")
+    parser.add_argument("--latency-median", type=float, default=2.0, help="Mediana (lognormal) o valor (fixed) en segundos")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Dispersión de la lognormal (0.5 ≈ p99 de 3.2 veces la mediana)")
+    parser.add_argument("--latency-min", type=float, default=0.0, help="Latencia mínima en segundos")
+    parser.add_argument("--latency-max", type=float, default=60.0, help="Latencia máxima en segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fracción de peticiones que responden con error")
+    parser.add_argument("--error-statuses", default="429,500,503", help="Estados HTTP de error, separados por comas")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Fracción de respuestas cortadas a mitad del JSON")
+    parser.add_argument("--stream-chunk-chars", type=int, default=40, help="Caracteres por evento en streaming")
+    parser.add_argument("--first-token-ratio", type=float, default=0.3,
+                        help="Fracción de la latencia hasta el primer fragmento en streaming")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla para repetir la misma secuencia de latencias y errores")
+    args = parser.parse_args()
+
+    print(f"Mock de QWEN en http://{args.host}:{args.port}/api/v1 ({len(load_outputs())} respuestas del corpus)")
+    web.run_app(build_app(args), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()